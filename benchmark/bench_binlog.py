@@ -0,0 +1,118 @@
+# benchmark/bench_binlog.py
+"""
+Bandingkan log CSV (Logger) dengan log biner kolumnar (BinaryLogger).
+
+Mengukur, untuk dua pola tulis CPU:
+- writeRows : CPU_MODE 'batch', 512 baris per panggilan
+- writeData : CPU_MODE 'polling' (bawaan), satu baris per panggilan; baris
+              ALERT/HIPOTERMIA ikut memicu commit
+Waktu baris adalah tenggat tiap sensor (JEDA 2 detik, sensor berselang
+~20 ms, jitter sub-ms), jadi tiap baris punya ns berbeda.
+- ukuran file untuk jumlah baris yang sama
+- waktu scan untuk analisis: CSV dibaca dengan csv.reader + float(),
+  log biner dibaca lewat BinLogReader.scan() (mmap + NumPy bila ada)
+
+Jalankan dari root proyek:  python benchmark/bench_binlog.py [jumlah_baris] [jumlah_sensor]
+"""
+
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from src.logger import Logger
+from src.binlog import BinaryLogger, BinLogReader
+from src.klasifikasi import status
+
+
+DETIK = 1_000_000_000
+
+
+def baris_sensor(n, jumlah_sensor):
+    acak = random.Random(1)
+    awal = time.time_ns()
+    jarak = 2 * DETIK // jumlah_sensor
+    for i in range(n):
+        ronde, sensor = divmod(i, jumlah_sensor)
+        suhu = round(acak.uniform(34.5, 39.5), 1)
+        waktu_ns = awal + ronde * 2 * DETIK + sensor * jarak + acak.randrange(DETIK // 1000)
+        yield f'Kamar-{101 + sensor}', suhu, status(suhu), waktu_ns
+
+
+def tulis(logger, pola, n, jumlah_sensor, ukuran_batch=512):
+    logger.setup()
+    if pola == 'writeData':
+        for row in baris_sensor(n, jumlah_sensor):
+            logger.writeData(*row)
+    else:
+        rows = []
+        for row in baris_sensor(n, jumlah_sensor):
+            rows.append(row)
+            if len(rows) == ukuran_batch:
+                logger.writeRows(rows)
+                rows = []
+        if rows:
+            logger.writeRows(rows)
+    logger.close()
+
+
+def scan_csv(path):
+    mulai = time.perf_counter()
+    total, jumlah = 0.0, 0
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader)
+        for row in reader:
+            total += float(row[2])
+            jumlah += 1
+    return time.perf_counter() - mulai, total / jumlah
+
+
+def scan_biner(path):
+    mulai = time.perf_counter()
+    with BinLogReader(path) as reader:
+        _, _, suhu, _ = reader.scan()
+        rata = float(sum(suhu) / len(suhu)) if not hasattr(suhu, 'mean') else float(suhu.mean())
+    return time.perf_counter() - mulai, rata
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    jumlah_sensor = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    for pola in ('writeRows', 'writeData'):
+        # writeData mengikuti LOG_MODE bawaan; BinaryLogger selalu group-commit
+        mode_csv = 'batch' if pola == 'writeRows' else config.LOG_MODE
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            hasil = []
+            varian = [
+                ('csv', Logger(os.path.join(tmp, 'log.csv'), mode=mode_csv, durability='none')),
+                ('biner', BinaryLogger(os.path.join(tmp, 'log.bin'), durability='none',
+                                       kompresi=False)),
+                ('biner+zlib', BinaryLogger(os.path.join(tmp, 'log_z.bin'), durability='none',
+                                            kompresi=True)),
+            ]
+            for nama, logger in varian:
+                tulis(logger, pola, n, jumlah_sensor)
+                ukuran = os.path.getsize(logger.location)
+                scan = scan_csv if nama == 'csv' else scan_biner
+                detik = min(scan(logger.location)[0] for _ in range(3))
+                hasil.append((nama, ukuran, logger.batchesWritten, detik))
+
+        ukuran_csv, detik_csv = hasil[0][1], hasil[0][3]
+        print(f"\n{pola}: {n:,} baris, {jumlah_sensor} sensor")
+        print(f"{'Format':<12}{'byte':>14}{'byte/baris':>12}{'blok':>8}{'scan (ms)':>12}"
+              f"{'lebih kecil':>13}{'scan lebih cepat':>18}")
+        for nama, ukuran, blok, detik in hasil:
+            print(f"{nama:<12}{ukuran:>14,}{ukuran / n:>12.1f}{blok:>8,}{detik * 1000:>12.1f}"
+                  f"{ukuran_csv / ukuran:>12.1f}x{detik_csv / detik:>17.1f}x")
+
+if __name__ == "__main__":
+    main()
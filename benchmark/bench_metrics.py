@@ -0,0 +1,80 @@
+# benchmark/bench_metrics.py
+"""
+Biaya instrumentasi pipeline (src/metrics.py): metrics mati vs aktif.
+
+Pipeline DataBus -> CPU (mode batch) -> Logger dijalankan di satu thread
+tanpa sensor maupun sleep: semua pembacaan dimasukkan lewat
+handler_sensor_data, lalu bus dikuras per batch oleh CPU._proses_batch.
+Keluaran konsol lewat OutputSink level 'silent', log ke direktori
+sementara (durability 'none'), jadi yang diukur hanya jalur data.
+
+Jalankan dari root proyek:  python benchmark/bench_metrics.py [jumlah]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bus import DataBus
+from src.clock import get_clock
+from src.cpu import CPU
+from src.logger import Logger
+from src.metrics import Metrics
+from src.output import OutputSink
+from src.reading import Reading, indeks_sensor
+
+
+def jalankan(n, pakai_metrics):
+    daftar_id = [f'Kamar-{101 + i}' for i in range(16)]
+    daftar_idx = [indeks_sensor(id_sensor) for id_sensor in daftar_id]
+    waktu_ns = get_clock().waktu_ns()
+    data = [Reading(waktu_ns + i, daftar_id[i % 16], 36.0 + (i % 30) / 10, i, daftar_idx[i % 16])
+            for i in range(n)]
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        logger = Logger(os.path.join(tmp, 'log.csv'), mode='batch', batchSize=512,
+                        maxLatency=60.0, durability='none')
+        logger.setup()
+        cpu = CPU()
+        bus = DataBus(cpu_target=cpu)
+        cpu.attach_bus(bus)
+        cpu.attach_logger(logger)
+        cpu.attach_output(OutputSink(level='silent', interval_ringkasan=0))
+        metrics = None
+        if pakai_metrics:
+            metrics = Metrics(interval=0, path_file=None, port=0)
+            bus.attach_metrics(metrics)
+            cpu.attach_metrics(metrics)
+
+        mulai = time.perf_counter()
+        for awal in range(0, n, 512):
+            for reading in data[awal:awal + 512]:
+                bus.handler_sensor_data(reading)
+            cpu._proses_batch(bus.get_many(512, timeout=0))
+        detik = time.perf_counter() - mulai
+        logger.close()
+    return detik / n, metrics
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    mati = min(jalankan(n, False)[0] for _ in range(3))
+    hasil = [jalankan(n, True) for _ in range(3)]
+    aktif, metrics = min(hasil, key=lambda h: h[0])
+
+    print(f"Pipeline bus -> CPU batch -> logger ({n:,} pembacaan, satu thread)")
+    print(f"  metrics mati  : {mati * 1e9:7.0f} ns/pembacaan  ({1 / mati:,.0f} pembacaan/s)")
+    print(f"  metrics aktif : {aktif * 1e9:7.0f} ns/pembacaan  "
+          f"({1 / aktif:,.0f} pembacaan/s, +{(aktif / mati - 1) * 100:.1f}%)")
+    print()
+    print(metrics.baris_statistik())
+
+
+if __name__ == "__main__":
+    main()
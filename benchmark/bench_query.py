@@ -0,0 +1,75 @@
+# benchmark/bench_query.py
+"""
+Latensi kueri src/query.py terhadap ukuran log, dengan dan tanpa indeks.
+
+Untuk beberapa ukuran log (jam virtual, 20 sensor, satu batch per 2 detik)
+diukur waktu kueri satu sensor selama satu jam. Dengan indeks
+(LOG_INDEKS_BUCKET) latensinya seharusnya tetap, tanpa indeks tumbuh
+linear karena scan penuh.
+
+Jalankan dari root proyek:  python benchmark/bench_query.py [csv|biner]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clock import VirtualClock, get_clock, set_clock
+from src.logger import Logger
+from src.binlog import BinaryLogger
+from src.klasifikasi import status
+from src import query
+
+JUMLAH_SENSOR = 20
+
+
+def tulis_log(kelas, path, n, indeks_bucket):
+    set_clock(VirtualClock(datetime(2025, 1, 1)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = kelas(path, mode='batch', durability='none', indeksBucket=indeks_bucket)
+        logger.setup()
+        acak = random.Random(1)
+        rows = []
+        for i in range(n):
+            suhu = round(acak.uniform(34.5, 39.5), 1)
+            rows.append((f'Kamar-{101 + i % JUMLAH_SENSOR}', suhu, status(suhu)))
+            if len(rows) == JUMLAH_SENSOR:
+                logger.writeRows(rows)
+                rows = []
+                get_clock().maju(2)
+        logger.close()
+
+
+def ukur(path):
+    mulai = time.perf_counter()
+    jumlah = sum(1 for _ in query.cari(path, 'Kamar-105',
+                                       '2025-01-01 02:00:00', '2025-01-01 03:00:00'))
+    return time.perf_counter() - mulai, jumlah
+
+
+def main():
+    format_log = sys.argv[1] if len(sys.argv) > 1 else 'csv'
+    kelas, ext = (BinaryLogger, 'bin') if format_log == 'biner' else (Logger, 'csv')
+
+    print(f"Kueri 1 sensor x 1 jam, log {format_log}")
+    print(f"{'baris log':>12}{'tanpa indeks (ms)':>20}{'dengan indeks (ms)':>20}{'hasil':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (200_000, 800_000, 3_200_000):
+            hasil = []
+            for bucket in (0, 60):
+                path = os.path.join(tmp, f'log_{n}_{bucket}.{ext}')
+                tulis_log(kelas, path, n, bucket)
+                detik, jumlah = min(ukur(path) for _ in range(3))
+                hasil.append((detik, jumlah))
+            print(f"{n:>12,}{hasil[0][0] * 1000:>20.1f}{hasil[1][0] * 1000:>20.1f}{hasil[1][1]:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmark/bench_reading.py
+"""
+Bandingkan dict per pembacaan (format lama) dengan Reading ber-__slots__.
+
+Mengukur:
+- byte per pembacaan (tracemalloc, termasuk objek waktu/float)
+- pembacaan/detik untuk pola sensor -> antrean -> CPU: buat, antre, lalu
+  baca field sebanyak yang dilakukan DataBus, BusBuffer dan CPU
+
+Kedua format menerima waktu yang sama (epoch ns dari jam, seperti sensor
+sekarang), jadi yang dibandingkan hanya wadahnya. Ronde dict dan Reading
+diselang-seling dan diambil yang terbaik agar derau mesin tidak berat sebelah.
+
+Hasil CPython 3.11: Reading 1.8x lebih kecil, laju 0.75-0.85x dict (lihat
+catatan di src/reading.py).
+
+Jalankan dari root proyek:  python benchmark/bench_reading.py [jumlah]
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.reading import Reading, indeks_sensor
+
+
+def buat_dict(n, waktu, id_sensor):
+    return [{
+        'waktu_ns': waktu,
+        'id': id_sensor,
+        'suhu': 36.5 + (i % 10) / 10,
+        'reading_number': i
+    } for i in range(n)]
+
+
+def buat_reading(n, waktu, id_sensor, idx):
+    return [Reading(waktu, id_sensor, 36.5 + (i % 10) / 10, i, idx) for i in range(n)]
+
+
+def ukur_memori(fungsi, *args):
+    tracemalloc.start()
+    awal = tracemalloc.get_traced_memory()[0]
+    data = fungsi(*args)
+    akhir = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (akhir - awal) / len(data)
+
+
+def ukur_throughput_dict(n, waktu, id_sensor):
+    antrean = deque()
+    mulai = time.perf_counter()
+    for i in range(n):
+        data = {
+            'waktu_ns': waktu,
+            'id': id_sensor,
+            'suhu': 36.5 + (i % 10) / 10,
+            'reading_number': i
+        }
+        # DataBus.handler_sensor_data + BusBuffer.put
+        _ = data['id'], data.get('suhu'), data['id']
+        antrean.append(data)
+    total = 0.0
+    while antrean:
+        data = antrean.popleft()
+        # BusBuffer._ambil + CPU
+        _ = data['id']
+        total += data['suhu']
+        _ = data['id']
+    return n / (time.perf_counter() - mulai)
+
+
+def ukur_throughput_reading(n, waktu, id_sensor, idx):
+    antrean = deque()
+    mulai = time.perf_counter()
+    for i in range(n):
+        data = Reading(waktu, id_sensor, 36.5 + (i % 10) / 10, i, idx)
+        _ = data.id, data.suhu, data.id
+        antrean.append(data)
+    total = 0.0
+    while antrean:
+        data = antrean.popleft()
+        _ = data.id
+        total += data.suhu
+        _ = data.id
+    return n / (time.perf_counter() - mulai)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    waktu = time.time_ns()
+    id_sensor = 'Kamar-101'
+    idx = indeks_sensor(id_sensor)
+
+    byte_dict = ukur_memori(buat_dict, n, waktu, id_sensor)
+    byte_reading = ukur_memori(buat_reading, n, waktu, id_sensor, idx)
+
+    rps_dict = rps_reading = 0.0
+    for _ in range(7):
+        rps_dict = max(rps_dict, ukur_throughput_dict(n, waktu, id_sensor))
+        rps_reading = max(rps_reading, ukur_throughput_reading(n, waktu, id_sensor, idx))
+
+    print(f"{'Format':<10}{'byte/pembacaan':>16}{'pembacaan/detik':>18}")
+    print(f"{'dict':<10}{byte_dict:>16.1f}{rps_dict:>18,.0f}")
+    print(f"{'Reading':<10}{byte_reading:>16.1f}{rps_reading:>18,.0f}")
+    print(f"\nMemori {byte_dict / byte_reading:.2f}x lebih kecil, "
+          f"throughput {rps_reading / rps_dict:.2f}x.")
+
+
+if __name__ == "__main__":
+    main()
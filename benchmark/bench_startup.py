@@ -0,0 +1,103 @@
+# benchmark/bench_startup.py
+"""
+Latensi cold-start main.py, diukur di proses Python baru setiap kali.
+
+- import main          : waktu `python -c "import main"` (modul inti; ingest,
+                         ring shared memory dan metrics di-import saat dipakai)
+- sampai SIMULASI      : dari start proses sampai main() mencetak banner
+                         "SIMULASI BERJALAN" (headless, jam virtual, log
+                         ke direktori sementara)
+- import visualizer    : biaya tambahan import Matplotlib (backend Agg)
+                         yang dibayar mode grafik, jika Matplotlib terpasang
+
+Juga dicetak modul dengan waktu import kumulatif terbesar (-X importtime).
+
+Jalankan dari root proyek:  python benchmark/bench_startup.py [ulangan]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SKRIP_MAIN = """
+import config
+config.HEADLESS = True
+config.CLOCK_MODE = 'virtual'
+config.DATA_SOURCE = 'random'
+config.OUTPUT_FILE = {csv!r}
+config.LOG_BINER_FILE = {biner!r}
+import main
+main.main()
+"""
+
+SKRIP_VISUALIZER = """
+import matplotlib
+matplotlib.use('Agg')
+from src.visualizer import TemperatureVisualizer
+TemperatureVisualizer().setup_plot()
+"""
+
+
+def ukur_import(perintah):
+    mulai = time.perf_counter()
+    subprocess.run([sys.executable, '-c', perintah], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - mulai
+
+
+def ukur_sampai_banner(tmp):
+    skrip = SKRIP_MAIN.format(csv=os.path.join(tmp, 'log.csv'),
+                              biner=os.path.join(tmp, 'log.bin'))
+    mulai = time.perf_counter()
+    proses = subprocess.Popen([sys.executable, '-u', '-c', skrip], cwd=ROOT,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        for baris in proses.stdout:
+            if 'SIMULASI BERJALAN' in baris:
+                return time.perf_counter() - mulai
+        raise RuntimeError("main.py berhenti sebelum banner SIMULASI BERJALAN")
+    finally:
+        proses.kill()
+        proses.wait()
+
+
+def import_terbesar(jumlah=8):
+    hasil = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                           cwd=ROOT, capture_output=True, text=True, check=True)
+    modul = []
+    for baris in hasil.stderr.splitlines():
+        if not baris.startswith('import time:') or 'cumulative' in baris:
+            continue
+        _, kumulatif, nama = (bagian.strip() for bagian in baris[len('import time:'):].split('|'))
+        modul.append((int(kumulatif), nama))
+    return sorted(modul, reverse=True)[:jumlah]
+
+
+def main():
+    ulangan = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    dasar = min(ukur_import('pass') for _ in range(ulangan))
+    impor = min(ukur_import('import main') for _ in range(ulangan))
+    with tempfile.TemporaryDirectory() as tmp:
+        banner = min(ukur_sampai_banner(tmp) for _ in range(ulangan))
+
+    print(f"Cold start (terbaik dari {ulangan}, termasuk start interpreter {dasar * 1000:.0f} ms)")
+    print(f"  import main         : {impor * 1000:7.0f} ms")
+    print(f"  sampai SIMULASI     : {banner * 1000:7.0f} ms  (headless)")
+    try:
+        viz = min(ukur_import(SKRIP_VISUALIZER) for _ in range(ulangan))
+        print(f"  import visualizer   : {(viz - dasar) * 1000:7.0f} ms  (tambahan mode grafik)")
+    except subprocess.CalledProcessError:
+        print("  import visualizer   :       -  (Matplotlib tidak terpasang)")
+
+    print("\nImport kumulatif terbesar saat 'import main' (us):")
+    for kumulatif, nama in import_terbesar():
+        print(f"  {kumulatif:>9,}  {nama}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmark/bench_timestamp.py
+"""
+Biaya timestamp per baris log: sebelum dan sesudah timestamp ns end-to-end.
+
+- sebelum : sensor membuat datetime.now(), logger memanggil lagi
+            datetime.now().strftime(...) per baris, visualizer membaca
+            jam sekali lagi (3 baca jam + 1 strftime per pembacaan)
+- sesudah : sensor membaca waktu_ns() sekali; logger memformat lewat
+            FormatWaktu (awalan per detik di-cache)
+
+Diukur dua tingkat:
+1. tahap timestamp saja (ns per pembacaan)
+2. Logger.writeData per baris (mode sinkron, durability 'none', file di
+   direktori sementara) untuk resolusi 's' dan 'ms'
+
+Jalankan dari root proyek:  python benchmark/bench_timestamp.py [jumlah]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clock import FORMAT_WAKTU, FormatWaktu, WallClock
+from src.logger import Logger
+
+
+class LoggerLama(Logger):
+    """Perilaku sebelum perubahan: waktu tulis di-strftime ulang per baris."""
+
+    def _tambahBaris(self, waktu_ns, id_sensor, suhu, status, analitik=None):
+        row = [datetime.now().strftime(FORMAT_WAKTU), id_sensor, suhu, status]
+        self._bufferWriter.writerow(row)
+        self._pending += 1
+
+
+def tahap_lama(n):
+    mulai = time.perf_counter()
+    for _ in range(n):
+        waktu = datetime.now()                          # sensor
+        teks = datetime.now().strftime(FORMAT_WAKTU)    # logger
+        t = time.time()                                 # visualizer
+    return (time.perf_counter() - mulai) / n
+
+
+def tahap_baru(n):
+    clock = WallClock()
+    format_ = FormatWaktu('s')
+    mulai = time.perf_counter()
+    for _ in range(n):
+        ns = clock.waktu_ns()                           # sensor
+        teks = format_(ns)                              # logger
+        t = ns / 1_000_000_000                          # visualizer
+    return (time.perf_counter() - mulai) / n
+
+
+def per_baris(kelas, n, resolusi='s'):
+    clock = WallClock()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        logger = kelas(os.path.join(tmp, 'log.csv'), mode='sinkron', durability='none',
+                       resolusiWaktu=resolusi)
+        logger.setup()
+        mulai = time.perf_counter()
+        for i in range(n):
+            logger.writeData('Kamar-101', 36.5, 'NORMAL', clock.waktu_ns())
+        detik = time.perf_counter() - mulai
+        logger.close()
+    return detik / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    lama = min(tahap_lama(n) for _ in range(3))
+    baru = min(tahap_baru(n) for _ in range(3))
+    print(f"Tahap timestamp ({n:,} pembacaan)")
+    print(f"  sebelum : {lama * 1e9:8.0f} ns/pembacaan")
+    print(f"  sesudah : {baru * 1e9:8.0f} ns/pembacaan  ({lama / baru:.1f}x)")
+
+    print(f"\nLogger.writeData per baris ({n:,} baris, sinkron, durability 'none')")
+    lama = min(per_baris(LoggerLama, n) for _ in range(3))
+    print(f"  {'sebelum':<14}: {lama * 1e9:8.0f} ns/baris")
+    for resolusi in ('s', 'ms'):
+        baru = min(per_baris(Logger, n, resolusi) for _ in range(3))
+        label = f"sesudah ({resolusi})"
+        print(f"  {label:<14}: {baru * 1e9:8.0f} ns/baris  ({lama / baru:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# benchmark/loadgen.py
+"""
+Generator beban lokal untuk server ingest jaringan (src/ingest_server.py).
+
+Membuka sejumlah koneksi TCP (atau socket UDP) di loopback, masing-masing
+mengirim pembacaan dari beberapa perangkat dengan timestamp kirim. Setelah
+selesai, statistik server (perintah STATS) dibaca untuk mendapatkan jumlah
+pembacaan yang benar-benar diterima, laju berkelanjutan dan latensi ingest
+p50/p99 (waktu kirim -> selesai diteruskan ke bus).
+
+Contoh (dari root proyek):
+
+    python benchmark/loadgen.py --jalankan-server
+    python benchmark/loadgen.py --jalankan-server --mode udp --format biner --laju 50000
+    python benchmark/loadgen.py --port 9750 --koneksi 64 --durasi 10
+
+--laju 0 berarti secepat mungkin (throughput maksimum; latensi ikut
+mengukur antrean). Dengan --laju > 0 beban dibagi rata ke semua koneksi.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ingest_server import MAGIC_BINER, REKAM
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Rekaman per tulis/datagram; datagram UDP tetap di bawah MTU loopback
+PER_KIRIM = 32
+
+
+def buat_potongan(format_, daftar_perangkat, n):
+    waktu_ns = time.time_ns()
+    if format_ == 'biner':
+        return b''.join(REKAM.pack(random.choice(daftar_perangkat), 36.0 + random.random() * 2, waktu_ns)
+                        for _ in range(n))
+    detik = waktu_ns / 1_000_000_000
+    return ''.join(f"{random.choice(daftar_perangkat)},{36.0 + random.random() * 2:.2f},{detik:.6f}\n"
+                   for _ in range(n)).encode('utf-8')
+
+
+async def perintah_tcp(host, port, perintah):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(perintah.encode('utf-8') + b'\n')
+    await writer.drain()
+    balasan = await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+    return balasan.decode('utf-8').strip()
+
+
+async def klien_tcp(args, daftar_perangkat, batas_waktu, jeda):
+    _, writer = await asyncio.open_connection(args.host, args.port)
+    terkirim = 0
+    if args.format == 'biner':
+        writer.write(MAGIC_BINER)
+    berikutnya = time.perf_counter()
+    while time.perf_counter() < batas_waktu:
+        writer.write(buat_potongan(args.format, daftar_perangkat, PER_KIRIM))
+        terkirim += PER_KIRIM
+        await writer.drain()
+        if jeda:
+            berikutnya += jeda
+            await asyncio.sleep(max(0.0, berikutnya - time.perf_counter()))
+        else:
+            await asyncio.sleep(0)
+    writer.close()
+    await writer.wait_closed()
+    return terkirim
+
+
+async def klien_udp(args, daftar_perangkat, batas_waktu, jeda):
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, remote_addr=(args.host, args.port))
+    terkirim = 0
+    berikutnya = time.perf_counter()
+    while time.perf_counter() < batas_waktu:
+        potongan = buat_potongan(args.format, daftar_perangkat, PER_KIRIM)
+        transport.sendto(MAGIC_BINER + potongan if args.format == 'biner' else potongan)
+        terkirim += PER_KIRIM
+        if jeda:
+            berikutnya += jeda
+            await asyncio.sleep(max(0.0, berikutnya - time.perf_counter()))
+        else:
+            await asyncio.sleep(0)
+    transport.close()
+    return terkirim
+
+
+async def jalankan(args):
+    # STATS/RESET selalu lewat TCP agar balasannya pasti sampai
+    await perintah_tcp(args.host, args.port, 'RESET')
+    awal = json.loads(await perintah_tcp(args.host, args.port, 'STATS'))
+
+    # Perangkat dibagi rata ke koneksi; jeda per potongan mengikuti --laju
+    perangkat = list(range(args.perangkat))
+    jeda = PER_KIRIM * args.koneksi / args.laju if args.laju else 0.0
+    klien = klien_udp if args.mode == 'udp' else klien_tcp
+    mulai = time.perf_counter()
+    batas_waktu = mulai + args.durasi
+    hasil = await asyncio.gather(*(klien(args, perangkat[i::args.koneksi] or perangkat, batas_waktu, jeda)
+                                   for i in range(args.koneksi)))
+    durasi = time.perf_counter() - mulai
+
+    # Beri server waktu menguras buffer socket sebelum STATS akhir
+    await asyncio.sleep(0.5)
+    akhir = json.loads(await perintah_tcp(args.host, args.port, 'STATS'))
+    return sum(hasil), akhir['diterima'] - awal['diterima'], durasi, akhir
+
+
+def cetak(args, terkirim, diterima, durasi, stat):
+    latensi = stat['latensi_ms']
+    print(f"Loadgen {args.mode.upper()}/{args.format}: {args.koneksi} koneksi, "
+          f"{args.perangkat} perangkat, {durasi:.1f} s"
+          + (f", target {args.laju:,} pembacaan/s" if args.laju else ", secepat mungkin"))
+    print(f"  terkirim  : {terkirim:>12,}")
+    print(f"  diterima  : {diterima:>12,}  ({diterima / durasi:,.0f} pembacaan/s)")
+    if args.mode == 'udp' and terkirim:
+        print(f"  hilang    : {max(0, terkirim - diterima) / terkirim:12.2%}")
+    if latensi['p50'] is not None:
+        print(f"  latensi   : p50 {latensi['p50']:.3f} ms, p99 {latensi['p99']:.3f} ms, "
+              f"maks {latensi['maks']:.3f} ms  ({stat['sampel_latensi']:,} sampel terakhir)")
+    if stat['dibuang']:
+        print(f"  dibuang   : {stat['dibuang']:>12,}  (bus tertinggal, UDP tidak dijeda)")
+    if stat['error']:
+        print(f"  error     : {stat['error']:>12,}")
+
+
+def tunggu_port(host, port, batas=5.0):
+    akhir = time.monotonic() + batas
+    while time.monotonic() < akhir:
+        try:
+            socket.create_connection((host, port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server ingest tidak menjawab di {host}:{port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generator beban untuk server ingest jaringan')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9750)
+    parser.add_argument('--mode', choices=('tcp', 'udp'), default='tcp')
+    parser.add_argument('--format', choices=('teks', 'biner'), default='teks')
+    parser.add_argument('--koneksi', type=int, default=16, help='jumlah koneksi/socket klien')
+    parser.add_argument('--perangkat', type=int, default=256, help='jumlah id perangkat')
+    parser.add_argument('--laju', type=int, default=0, help='target pembacaan/s total (0 = maksimum)')
+    parser.add_argument('--durasi', type=float, default=5.0, help='lama pengiriman (detik)')
+    parser.add_argument('--jalankan-server', action='store_true',
+                        help='jalankan `python -m src.ingest_server` sebagai subprocess')
+    args = parser.parse_args()
+
+    server = None
+    if args.jalankan_server:
+        server = subprocess.Popen([sys.executable, '-m', 'src.ingest_server',
+                                   '--host', args.host, '--port', str(args.port)],
+                                  cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        tunggu_port(args.host, args.port)
+        cetak(args, *asyncio.run(jalankan(args)))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
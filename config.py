@@ -10,8 +10,101 @@ OUTPUT_FILE = 'data/output/monitoring_log.csv'
 
 JUMLAH_MAKSIMAL_RANDOM = 15
 
+HEADLESS = False            # True: tanpa jendela grafik, Matplotlib tidak pernah di-import
 PLOT_UPDATE_INTERVAL = 100  # Waktu update grafik (ms)
-PLOT_HISTORY_LENGTH = 50    # Jumlah data yang ditampilkan di grafik
+PLOT_HISTORY_LENGTH = 50    # Jumlah data yang ditampilkan di grafik (PLOT_DECIMASI = False)
 PLOT_WINDOW_SIZE = (12, 6)  # Ukuran jendela grafik (lebar, tinggi)
+PLOT_JENDELA_DETIK = 100    # Rentang sumbu x (detik ke belakang dari data terbaru; 86400 = riwayat 24 jam)
+PLOT_SENSOR_PER_HALAMAN = 16 # Panel sensor per halaman grafik (small multiples)
+PLOT_GANTI_HALAMAN = 0      # Ganti halaman otomatis tiap N detik (0 = manual: panah kiri/kanan)
+PLOT_DECIMASI = True        # Ringkas riwayat ke min/max per kolom piksel (PLOT_HISTORY_LENGTH tidak dipakai)
+PLOT_DECIMASI_KOLOM = 0     # Jumlah kolom decimasi per panel (0 = perkiraan lebar panel dalam piksel)
 
-DATA_SOURCE = 'file'
\ No newline at end of file
+DATA_SOURCE = 'file'         # 'file', 'random', 'replay' (multi-sensor dari REPLAY_FILE) atau 'jaringan' (server ingest)
+
+# --- Replay ---
+REPLAY_FILE = 'data/input/replay.csv'  # Format long: waktu,id,suhu
+REPLAY_SPEED = 1.0           # Pengali kecepatan (1x, 10x, ...); 0 = secepat mungkin
+
+# --- Ingest jaringan (DATA_SOURCE = 'jaringan') ---
+INGEST_HOST = '127.0.0.1'    # Alamat bind server; '0.0.0.0' untuk menerima dari perangkat di jaringan
+INGEST_PORT_TCP = 9750       # Port TCP (baris teks atau biner b'SUHB' + '<Ifq')
+INGEST_PORT_UDP = 9750       # Port UDP (satu datagram = beberapa baris teks atau b'SUHB' + rekaman)
+INGEST_PETA_SENSOR = {}      # Id perangkat -> id sensor, mis. {'bed-7': 'Kamar-107', 12: 'Kamar-112'}
+INGEST_MAKS_TERTUNDA = 256   # Potongan data menunggu diteruskan ke bus; bila penuh TCP dijeda, UDP dibuang
+
+# --- Jam simulasi ---
+CLOCK_MODE = 'wall'          # 'wall' (jam dinding) atau 'virtual' (secepat mungkin, waktu simulasi)
+CLOCK_MULAI = None           # Waktu awal jam virtual, mis. '2025-01-01 00:00:00' (None = sekarang)
+RANDOM_SEED = None           # Seed data random agar hasil simulasi bisa direproduksi
+
+# --- Sensor ---
+SENSOR_MODE = 'thread'       # 'thread' (1 thread per sensor) atau 'scheduler' (1 thread untuk semua)
+JUMLAH_SENSOR = 1            # Jumlah sensor yang disimulasikan oleh main.py
+INGEST_MODE = 'thread'       # 'thread' (sensor di proses ini) atau 'proses' (worker proses + shared memory)
+INGEST_PROSES = 4            # Jumlah proses worker sensor pada mode 'proses'
+RING_KAPASITAS = 65536       # Kapasitas ring buffer shared memory per proses (record)
+FILE_LOADER = 'cache'        # 'cache' (dataset bersama via mmap), 'stream' (baca per-chunk) atau 'list'
+STREAM_CHUNK_ROWS = 4096     # Jumlah baris per chunk pada mode 'stream'
+STREAM_PREFETCH = 2          # Jumlah chunk yang disiapkan di depan pembaca
+
+# --- Logger ---
+LOG_MODE = 'sinkron'         # 'sinkron' (commit tiap baris) atau 'batch' (group-commit)
+LOG_BATCH_SIZE = 256         # Jumlah baris maksimal sebelum batch di-commit
+LOG_BATCH_MAX_LATENCY = 0.5  # Batas waktu (detik) sebuah baris menunggu di batch
+LOG_DURABILITY = 'flush'     # 'none' (tanpa flush), 'flush', atau 'fsync'
+LOG_MAKS_TERTAHAN = 65536    # Baris maksimal ditahan saat commit gagal (mis. disk penuh); lebihnya dibuang dan dihitung
+LOG_FORMAT = 'csv'           # 'csv' (monitoring_log.csv) atau 'biner' (blok kolumnar, src/binlog.py; selalu group-commit)
+LOG_BINER_FILE = 'data/output/monitoring_log.bin'
+LOG_BINER_KOMPRESI = True    # Kompres kolom tiap blok dengan zlib (~6.6x lebih kecil dari CSV, tanpa ~4.2x; scan ~2x lebih lambat)
+LOG_BINER_LATENSI_SEGERA = 0.1  # Batas tunggu (detik) baris ALERT/HIPOTERMIA di log biner sebelum di-commit
+LOG_ROTASI_UKURAN = 0        # Rotasi ke segmen baru setelah N byte (0 = mati, satu file ditimpa tiap run)
+LOG_ROTASI_INTERVAL = 0      # Rotasi ke segmen baru setiap N detik jam simulasi (0 = mati)
+LOG_ROTASI_KOMPRESI = 'gzip' # Kompres segmen yang sudah ditutup di thread latar (None = tidak)
+LOG_INDEKS_BUCKET = 0        # Lebar bucket (detik) indeks sidecar <log>.idx untuk src/query.py (0 = tanpa indeks)
+LOG_RESOLUSI_WAKTU = 's'     # Resolusi kolom waktu log: 's', 'ms', 'us', atau 'ns' (pecahan detik setelah titik)
+
+# --- Rollup (ringkasan per sensor untuk retensi jangka panjang) ---
+ROLLUP_AKTIF = False         # Simpan rollup di sebelah file log: <log>.rollup_<tingkat>.csv
+ROLLUP_TINGKAT = [           # (nama, lebar bucket detik, retensi detik; 0 = selamanya)
+    ('1m', 60, 2 * 24 * 3600),
+    ('15m', 900, 30 * 24 * 3600),
+    ('1h', 3600, 365 * 24 * 3600),
+]
+
+# --- Data Bus ---
+BUS_MAX_DEPTH = 0            # Kedalaman maksimal antrean bus (0 = tak terbatas)
+BUS_POLICY = 'block'         # 'block', 'drop_oldest', 'drop_newest', atau 'prioritas' (ALERT tidak pernah dibuang)
+
+# --- Analitik streaming ---
+ANALYTICS_AKTIF = False      # Hitung rata-rata/std bergulir, EWMA dan tren per sensor
+ANALYTICS_WINDOW = 30        # Jumlah pembacaan terakhir per sensor di jendela bergulir
+ANALYTICS_EWMA_ALPHA = 0.2   # Bobot pembacaan terbaru pada EWMA
+LOG_ANALYTICS = False        # Tambahkan kolom analitik ke file log CSV
+
+# --- CPU ---
+CPU_MODE = 'polling'         # 'polling' (1 data per iterasi) atau 'batch' (blok + kuras bus)
+CPU_BATCH_SIZE = 512         # Jumlah data maksimal yang dikuras per bangun (mode batch)
+CPU_BLOCK_TIMEOUT = 0.5      # Lama CPU menunggu data di bus sebelum cek status (detik)
+CPU_WORKERS = 1              # >1: CPU pool, bus dipartisi per id sensor ke tiap worker
+KLASIFIKASI_NUMPY_MIN = 64   # Ukuran batch minimal sebelum klasifikasi memakai NumPy (jika terpasang)
+
+# --- Alert ---
+ALERT_MODE = 'langsung'      # 'langsung' (banner tiap pembacaan) atau 'histeresis' (state machine per sensor)
+ALERT_HISTERESIS = 0.3       # Lebar pita keluar (°C): demam selesai di bawah BATAS_DEMAM - nilai ini
+ALERT_INTERVAL_MIN = 60.0    # Jarak minimal antar-alert satu sensor (detik); pembacaan di antaranya dirangkum
+ALERT_ANTREAN_MAKS = 1000    # Kapasitas antrean dispatcher alert (event dibuang jika penuh)
+
+# --- Output konsol ---
+OUTPUT_ASYNC = False         # True: keluaran CPU/alert lewat thread penulis + antrean berbatas
+OUTPUT_LEVEL = 'full'        # 'silent', 'alerts', 'sampled' (1 dari N baris normal), atau 'full'
+OUTPUT_SAMPEL_NORMAL = 10    # Pada 'sampled': cetak 1 dari setiap N baris normal per sensor
+OUTPUT_BATAS_PER_SENSOR = 5  # Baris normal maksimal per sensor per detik (0 = tanpa batas)
+OUTPUT_INTERVAL_RINGKASAN = 5.0  # Interval baris ringkasan "N pembacaan/s, M alert" (0 = mati)
+OUTPUT_ANTREAN_MAKS = 10000  # Kapasitas antrean output (baris dibuang jika penuh)
+
+# --- Metrics (instrumentasi pipeline, src/metrics.py) ---
+METRICS_AKTIF = False        # Latensi per tahap (bus, antre, klasifikasi, log, konsol) + gauge antrean; mati = tanpa baca jam
+METRICS_INTERVAL = 5.0       # Interval baris statistik "[Metrics] ..." (detik; 0 = tanpa baris)
+METRICS_FILE = None          # File teks format Prometheus, mis. 'data/output/metrics.prom' (None = tidak ditulis)
+METRICS_PORT = 0             # Endpoint HTTP lokal http://127.0.0.1:<port>/metrics (0 = mati)
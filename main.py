@@ -3,26 +3,45 @@
 import sys
 import os
 import time
+import random
+import importlib.util
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 try:
     from src.sensor import TempSensor
-    from src.cpu import CPU
+    from src.cpu import CPU, CPUPool
     from src.bus import DataBus
-    # TAMBAHKAN impor visualizer
-    from src.visualizer import TemperatureVisualizer
+    from src.scheduler import SensorScheduler
+    from src.replay import ReplaySource
+    from src.clock import buat_clock, set_clock
     from src.logger import Logger
+    from src.binlog import BinaryLogger
+    from src.analytics import StreamingAnalytics
+    from src.alert import AlertManager, format_alert
+    from src.output import OutputSink
+    from src.rollup import RollupStore
     import config
 except ModuleNotFoundError as e:
     print(f"ERROR: Gagal import modul...")
     print(f"       {e}")
     sys.exit(1)
-except ImportError as e:
-    print(f"ERROR: Gagal import. Mungkin Anda lupa install Matplotlib?")
-    print(f"       Coba jalankan: pip install matplotlib")
-    print(f"       Error asli: {e}")
-    sys.exit(1)
+
+
+def buat_visualizer():
+    """
+    Visualizer (dan Matplotlib) hanya di-import bila grafik dipakai.
+    Tanpa Matplotlib, simulasi tetap jalan dalam mode headless.
+    """
+    if config.HEADLESS:
+        print("Mode HEADLESS: visualisasi grafik dimatikan.")
+        return None
+    if importlib.util.find_spec('matplotlib') is None:
+        print("PERINGATAN: Matplotlib tidak terpasang, berjalan tanpa grafik (headless).")
+        print("            Pasang dengan: pip install matplotlib")
+        return None
+    from src.visualizer import TemperatureVisualizer
+    return TemperatureVisualizer(max_points=config.PLOT_HISTORY_LENGTH)
 
 
 def main():
@@ -31,31 +50,125 @@ def main():
     print("="*50)
     print("Mulai inisialisasi komponen...")
 
+    # Jam dipasang paling awal agar semua komponen memakai jam yang sama
+    clock = buat_clock()
+    set_clock(clock)
+    if config.RANDOM_SEED is not None:
+        random.seed(config.RANDOM_SEED)
+    if clock.is_virtual:
+        print(f"Mode jam VIRTUAL aktif (mulai {clock.now():%Y-%m-%d %H:%M:%S}).")
+
     # --- 1. Perakitan Komponen ---
-    logger = Logger()
-    cpu_utama = CPU()
-    bus_data = DataBus(cpu_target=cpu_utama)
+    if config.LOG_FORMAT == 'biner':
+        logger = BinaryLogger()
+    else:
+        logger = Logger()
+    if config.CPU_WORKERS > 1:
+        cpu_utama = CPUPool(config.CPU_WORKERS)
+    else:
+        cpu_utama = CPU()
+    bus_data = DataBus(cpu_target=cpu_utama, jumlah_shard=config.CPU_WORKERS)
     cpu_utama.attach_bus(bus_data)
+
+    # Analitik streaming dipasang sebelum logger.setup() agar header log ikut
+    analytics = None
+    if config.ANALYTICS_AKTIF:
+        analytics = StreamingAnalytics()
+        bus_data.attach_analytics(analytics)
+        cpu_utama.attach_analytics(analytics)
+        logger.attach_analytics(analytics)
+
     logger.setup()
     cpu_utama.attach_logger(logger)
 
+    # Rollup 1m/15m/1h disimpan di sebelah file log
+    rollup = None
+    if config.ROLLUP_AKTIF:
+        rollup = RollupStore(logger.location)
+        cpu_utama.attach_rollup(rollup)
+
+    # Keluaran konsol asinkron: CPU dan alert tidak lagi print() langsung
+    output = None
+    if config.OUTPUT_ASYNC:
+        output = OutputSink()
+        cpu_utama.attach_output(output)
+
+    # Alert dengan histeresis: banner dikirim dari thread dispatcher sendiri
+    alert_manager = None
+    if config.ALERT_MODE == 'histeresis':
+        if output:
+            alert_manager = AlertManager(sink=lambda event: output.alert(format_alert(event)))
+        else:
+            alert_manager = AlertManager()
+        bus_data.attach_alert_manager(alert_manager)
+        cpu_utama.attach_alert_manager(alert_manager)
+
+    # Instrumentasi pipeline: latensi per tahap, antrean dan laju
+    metrics = None
+    if config.METRICS_AKTIF:
+        from src.metrics import Metrics
+        metrics = Metrics(sink=output.tulis if output else None)
+        bus_data.attach_metrics(metrics)
+        cpu_utama.attach_metrics(metrics)
+        metrics.gauge('pending_log', lambda: logger.statistik()['pending'])
+        if output:
+            metrics.gauge('dibuang_output', lambda: output.jumlah_dibuang)
+
+
+    # TAMBAHKAN: Buat instance visualizer (None pada mode headless)
+    viz = buat_visualizer()
 
-    # TAMBAHKAN: Buat instance visualizer
-    viz = TemperatureVisualizer(max_points=config.PLOT_HISTORY_LENGTH)
-    
     # TAMBAHKAN: Tancapkan visualizer ke Bus
-    bus_data.attach_visualizer(viz)
+    if viz:
+        bus_data.attach_visualizer(viz)
+        if analytics:
+            viz.attach_analytics(analytics)
+
+    # Mode scheduler: semua sensor dijalankan oleh satu thread
+    scheduler = None
+    if config.SENSOR_MODE == 'scheduler':
+        scheduler = SensorScheduler()
+        bus_data.attach_scheduler(scheduler)
 
     print(f"Mode Sumber Data Global diatur ke: '{config.DATA_SOURCE.upper()}'")
 
-    list_sensor = [
-        TempSensor(id='Kamar-101 (File)')
-    ]
+    if config.DATA_SOURCE == 'replay':
+        # Satu file replay memberi data ke banyak kamar sekaligus
+        list_sensor = [
+            ReplaySource(config.REPLAY_FILE, kecepatan=config.REPLAY_SPEED)
+        ]
+    elif config.DATA_SOURCE == 'jaringan':
+        # Perangkat mengirim pembacaan lewat TCP/UDP; satu server untuk semua
+        from src.ingest_server import IngestServer
+        list_sensor = [IngestServer()]
+    else:
+        daftar_id = ['Kamar-101 (File)']
+        # Sensor tambahan untuk simulasi banyak kamar
+        for i in range(1, config.JUMLAH_SENSOR):
+            daftar_id.append(f'Kamar-{101 + i}')
+
+        if config.INGEST_MODE == 'proses':
+            # Sensor dijalankan di proses worker; proses ini hanya menguras
+            # ring buffer shared memory
+            from src.shm_ring import ProsesIngestor
+            list_sensor = [
+                ProsesIngestor(daftar_id, config.INGEST_PROSES, config.RING_KAPASITAS)
+            ]
+        else:
+            list_sensor = [TempSensor(id=id_sensor) for id_sensor in daftar_id]
     
     print("\nKomponen berhasil dirakit.")
 
     # --- 2. Menghubungkan dan Menjalankan ---
     print("Menghubungkan sensor ke bus data...")
+    if scheduler is not None:
+        scheduler.start()
+    if output:
+        output.start()
+    if alert_manager:
+        alert_manager.start()
+    if metrics:
+        metrics.start()
     for sensor in list_sensor:
         bus_data.register_sensor(sensor)
 
@@ -63,14 +176,15 @@ def main():
     cpu_utama.run()
     
     # TAMBAHKAN: Jalankan visualizer di thread-nya sendiri
-    print("Memulai jendela visualisasi (grafik)...")
-    viz.start_in_thread()
+    if viz:
+        print("Memulai jendela visualisasi (grafik)...")
+        viz.start_in_thread()
 
 
     print("\n" + "="*50)
     print("     SIMULASI BERJALAN")
     print(f"     Mode Sumber Data: {config.DATA_SOURCE.upper()}")
-    print(f"     File log akan disimpan di: {config.OUTPUT_FILE}")
+    print(f"     File log akan disimpan di: {logger.location}")
     # ... (sisanya sama) ...
     print("="*50 + "\n")
 
@@ -82,7 +196,7 @@ def main():
             # TAMBAHKAN: Cek apakah jendela visualizer ditutup manual
             # Jika viz.is_running jadi False (karena jendela ditutup)
             # kita bisa anggap itu sebagai sinyal stop.
-            if not viz.is_running and 'viz' in locals():
+            if viz and not viz.is_running:
                  print("\nJendela Visualizer ditutup, menghentikan simulasi...")
                  break # Keluar dari loop untuk shutdown
 
@@ -95,24 +209,39 @@ def main():
         print("\n\n" + "="*50)
         print("     PERINTAH SHUTDOWN (Ctrl+C) DITERIMA")
         print("     Menghentikan semua komponen...")
-        
-        for sensor in list_sensor:
-            if sensor.is_active:
-                sensor.stop_monitoring()
     
     finally:
         # --- BLOK SHUTDOWN ---
         print("\nMenghentikan semua komponen...")
+
+        # Semua sumber data dihentikan di setiap jalur keluar (selesai normal,
+        # Ctrl+C, jendela ditutup) agar thread, stream dan shared memory dilepas
+        for sensor in list_sensor:
+            sensor.stop_monitoring()
         
         # TAMBAHKAN: Hentikan Visualizer
-        if 'viz' in locals() and viz.is_running:
+        if viz and viz.is_running:
             print("Menghentikan visualizer...")
             viz.stop()
             
         print("Memberi CPU 1 detik untuk memproses sisa log...")
         time.sleep(1) 
+        if scheduler is not None:
+            scheduler.stop()
         cpu_utama.stop()
+        if alert_manager:
+            alert_manager.stop()
+        if output:
+            output.stop()
         logger.close()
+        if rollup:
+            rollup.tutup()
+        if metrics:
+            metrics.stop()
+
+        stat_bus = bus_data.statistik()
+        print(f"Bus: {stat_bus['enqueued']} data masuk, {stat_bus['dropped']} dibuang, "
+              f"puncak antrean {stat_bus['high_water']}.")
         
         print("\nSimulasi berhasil dihentikan. Selamat tinggal!")
         print("="*50)
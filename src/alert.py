@@ -0,0 +1,194 @@
+# src/alert.py
+"""
+Manajemen alert per sensor: histeresis, debouncing, dan coalescing.
+
+Setiap sensor punya state machine NORMAL -> DEMAM/HIPOTERMIA -> NORMAL:
+
+- masuk DEMAM saat suhu > BATAS_DEMAM, keluar saat suhu < BATAS_DEMAM - histeresis
+- masuk HIPOTERMIA saat suhu < BATAS_HIPO, keluar saat suhu > BATAS_HIPO + histeresis
+
+Selama kondisi alarm berlangsung, pembacaan tidak memicu banner satu per
+satu, tetapi dirangkum menjadi satu event BERLANJUT paling sering sekali per
+`interval_min` detik (jumlah pembacaan + suhu puncak). Sensor yang
+keluar-masuk alarm dalam interval tersebut juga tidak diumumkan ulang.
+
+Pengiriman event dilakukan oleh thread dispatcher sendiri melalui antrean
+berbatas, sehingga sink yang lambat (konsol, jaringan) tidak pernah
+menahan thread sensor/bus.
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, Optional
+
+import config
+
+NORMAL = 'NORMAL'
+DEMAM = 'DEMAM'
+HIPOTERMIA = 'HIPOTERMIA'
+
+MASUK = 'MASUK'
+BERLANJUT = 'BERLANJUT'
+PULIH = 'PULIH'
+
+
+class AlertEvent:
+    __slots__ = ('id', 'kondisi', 'fase', 'suhu', 'puncak', 'jumlah', 'waktu')
+
+    def __init__(self, id, kondisi, fase, suhu, puncak, jumlah, waktu):
+        self.id = id
+        self.kondisi = kondisi
+        self.fase = fase
+        self.suhu = suhu
+        self.puncak = puncak
+        self.jumlah = jumlah
+        self.waktu = waktu
+
+
+class StateAlert:
+    __slots__ = ('kondisi', 'kondisi_kirim', 'diumumkan', 'terakhir_kirim', 'jumlah', 'puncak')
+
+    def __init__(self):
+        self.kondisi = NORMAL
+        self.kondisi_kirim = NORMAL
+        self.diumumkan = False
+        self.terakhir_kirim = float('-inf')
+        self.jumlah = 0
+        self.puncak = 0.0
+
+
+def format_alert(event: AlertEvent) -> str:
+    judul = 'Demam' if event.kondisi == DEMAM else 'Hipotermia'
+    if event.fase == MASUK:
+        baris = [f"!!! ALERT {event.kondisi} !!!",
+                 f"    ALERT: {judul} terdeteksi!"]
+    elif event.fase == BERLANJUT:
+        baris = [f"!!! ALERT {event.kondisi} (BERLANJUT) !!!",
+                 f"    {event.jumlah} pembacaan sejak alert terakhir"]
+    else:
+        baris = [f"--- {event.kondisi} SELESAI ---",
+                 f"    {event.jumlah} pembacaan sejak alert terakhir"]
+    baris += [f"    SENSOR: {event.id}",
+              f"    SUHU:   {event.suhu}°C (puncak {event.puncak}°C)"]
+    return "\n" + "="*40 + "\n" + "\n".join(baris) + "\n" + "="*40 + "\n"
+
+
+def cetak_alert(event: AlertEvent):
+    """Sink bawaan: banner konsol seperti CPU.handle_interrupt."""
+    print(format_alert(event))
+
+
+class AlertManager:
+    def __init__(self, sink: Optional[Callable[[AlertEvent], None]] = None,
+                 histeresis: float = config.ALERT_HISTERESIS,
+                 interval_min: float = config.ALERT_INTERVAL_MIN,
+                 maks_antrean: int = config.ALERT_ANTREAN_MAKS):
+        print('Inisialisasi alert manager')
+        self.sink = sink or cetak_alert
+        self.histeresis = histeresis
+        self.interval_min = interval_min
+
+        self._state: Dict[str, StateAlert] = {}
+        self._antrean = queue.Queue(maxsize=maks_antrean)
+        self._thread = None
+        self.is_running = False
+
+        self.jumlah_event = 0
+        self.jumlah_dibuang = 0
+
+    def proses(self, data):
+        """
+        Perbarui state machine sensor untuk satu pembacaan. Murah dan tidak
+        pernah blok; event yang dihasilkan diantrekan ke dispatcher.
+        """
+        state = self._state.get(data.id)
+        if state is None:
+            state = self._state.setdefault(data.id, StateAlert())
+
+        suhu = data.suhu
+        waktu = data.waktu_ns / 1_000_000_000
+
+        if state.kondisi == NORMAL:
+            self._cek_masuk(state, data, suhu, waktu)
+            return
+
+        keluar = (suhu < config.BATAS_DEMAM - self.histeresis if state.kondisi == DEMAM
+                  else suhu > config.BATAS_HIPO + self.histeresis)
+        if keluar:
+            if state.diumumkan:
+                self._kirim(AlertEvent(data.id, state.kondisi, PULIH, suhu,
+                                       state.puncak, state.jumlah, waktu))
+                state.terakhir_kirim = waktu
+            state.kondisi = NORMAL
+            state.diumumkan = False
+            state.jumlah = 0
+            self._cek_masuk(state, data, suhu, waktu)
+            return
+
+        state.jumlah += 1
+        if (suhu > state.puncak) if state.kondisi == DEMAM else (suhu < state.puncak):
+            state.puncak = suhu
+
+        if waktu - state.terakhir_kirim >= self.interval_min:
+            # Rangkum semua pembacaan sejak event terakhir jadi satu event
+            fase = BERLANJUT if state.diumumkan else MASUK
+            self._kirim(AlertEvent(data.id, state.kondisi, fase, suhu,
+                                   state.puncak, state.jumlah, waktu))
+            state.kondisi_kirim = state.kondisi
+            state.diumumkan = True
+            state.terakhir_kirim = waktu
+            state.jumlah = 0
+
+    def _cek_masuk(self, state: StateAlert, data, suhu: float, waktu: float):
+        if suhu > config.BATAS_DEMAM:
+            state.kondisi = DEMAM
+        elif suhu < config.BATAS_HIPO:
+            state.kondisi = HIPOTERMIA
+        else:
+            return
+
+        state.puncak = suhu
+        state.jumlah = 1
+        # Debounce: kondisi yang sama yang baru saja diumumkan tidak diumumkan
+        # ulang (kondisi berbeda, mis. demam -> hipotermia, tetap langsung)
+        if (state.kondisi != state.kondisi_kirim
+                or waktu - state.terakhir_kirim >= self.interval_min):
+            self._kirim(AlertEvent(data.id, state.kondisi, MASUK, suhu, suhu, 1, waktu))
+            state.kondisi_kirim = state.kondisi
+            state.diumumkan = True
+            state.terakhir_kirim = waktu
+            state.jumlah = 0
+
+    def _kirim(self, event: AlertEvent):
+        try:
+            self._antrean.put_nowait(event)
+            self.jumlah_event += 1
+        except queue.Full:
+            self.jumlah_dibuang += 1
+
+    def _dispatcher(self):
+        while True:
+            event = self._antrean.get()
+            if event is None:
+                break
+            try:
+                self.sink(event)
+            except Exception as e:
+                print(f"Error saat mengirim alert: {e}")
+
+    def start(self):
+        if self.is_running:
+            print("Alert manager sudah berjalan.")
+            return
+        self.is_running = True
+        self._thread = threading.Thread(target=self._dispatcher, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        # Penanda berhenti dikirim setelah event yang sudah antre
+        self.is_running = False
+        if self._thread:
+            self._antrean.put(None)
+            self._thread.join(timeout=1.0)
+        print(f"Alert manager dihentikan ({self.jumlah_event} event, "
+              f"{self.jumlah_dibuang} dibuang).")
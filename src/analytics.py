@@ -0,0 +1,117 @@
+# src/analytics.py
+"""
+Analitik streaming per sensor dengan biaya O(1) per pembacaan.
+
+Tiap sensor memiliki ring buffer berukuran tetap (`jendela`) untuk suhu dan
+waktunya, ditambah jumlah berjalan (sum dan sum kuadrat), sehingga
+rata-rata/deviasi standar bergulir, EWMA dan laju perubahan (°C/jam) bisa
+diperbarui tanpa menghitung ulang riwayat. Memori per sensor tetap, jadi
+puluhan ribu sensor tetap terbatas (~16 byte x jendela per sensor).
+
+Tahap ini dipasang di DataBus (sebelum data masuk antrean CPU), dan hasilnya
+bisa dibaca oleh CPU, Logger dan TemperatureVisualizer lewat `ringkasan()`.
+"""
+
+import math
+import threading
+from array import array
+from typing import Dict, Optional
+
+import config
+
+
+class StatSensor:
+    __slots__ = ('jendela', 'suhu', 'waktu', 'posisi', 'jumlah', 'total',
+                 'total_kuadrat', 'ewma', '_sejak_hitung_ulang')
+
+    def __init__(self, jendela: int):
+        self.jendela = jendela
+        self.suhu = array('d', bytes(8 * jendela))
+        self.waktu = array('d', bytes(8 * jendela))
+        self.posisi = 0
+        self.jumlah = 0
+        self.total = 0.0
+        self.total_kuadrat = 0.0
+        self.ewma: Optional[float] = None
+        self._sejak_hitung_ulang = 0
+
+    def update(self, suhu: float, waktu: float, alpha: float):
+        pos = self.posisi
+        if self.jumlah == self.jendela:
+            lama = self.suhu[pos]
+            self.total -= lama
+            self.total_kuadrat -= lama * lama
+        else:
+            self.jumlah += 1
+
+        self.suhu[pos] = suhu
+        self.waktu[pos] = waktu
+        self.posisi = (pos + 1) % self.jendela
+        self.total += suhu
+        self.total_kuadrat += suhu * suhu
+        self.ewma = suhu if self.ewma is None else alpha * suhu + (1 - alpha) * self.ewma
+
+        # Cegah galat pembulatan menumpuk: hitung ulang jumlah sekali per jendela
+        # (tetap O(1) teramortisasi)
+        self._sejak_hitung_ulang += 1
+        if self._sejak_hitung_ulang >= self.jendela:
+            self._sejak_hitung_ulang = 0
+            isi = self.suhu if self.jumlah == self.jendela else self.suhu[:self.jumlah]
+            self.total = math.fsum(isi)
+            self.total_kuadrat = math.fsum(x * x for x in isi)
+
+    @property
+    def rata_rata(self) -> float:
+        return self.total / self.jumlah if self.jumlah else 0.0
+
+    @property
+    def std(self) -> float:
+        if self.jumlah < 2:
+            return 0.0
+        rata = self.total / self.jumlah
+        return math.sqrt(max(0.0, self.total_kuadrat / self.jumlah - rata * rata))
+
+    @property
+    def laju_per_jam(self) -> float:
+        """Laju perubahan (°C/jam) antara pembacaan tertua dan terbaru di jendela."""
+        if self.jumlah < 2:
+            return 0.0
+        terbaru = (self.posisi - 1) % self.jendela
+        tertua = self.posisi if self.jumlah == self.jendela else 0
+        durasi = self.waktu[terbaru] - self.waktu[tertua]
+        if durasi <= 0:
+            return 0.0
+        return (self.suhu[terbaru] - self.suhu[tertua]) / durasi * 3600.0
+
+
+class StreamingAnalytics:
+    def __init__(self, jendela: int = config.ANALYTICS_WINDOW,
+                 alpha: float = config.ANALYTICS_EWMA_ALPHA):
+        print(f'Inisialisasi analitik streaming (jendela {jendela}, EWMA alpha {alpha})')
+        self.jendela = max(2, jendela)
+        self.alpha = alpha
+        self.sensor: Dict[str, StatSensor] = {}
+        self._lock = threading.Lock()
+
+    def update(self, data) -> StatSensor:
+        stat = self.sensor.get(data.id)
+        if stat is None:
+            with self._lock:
+                stat = self.sensor.setdefault(data.id, StatSensor(self.jendela))
+        stat.update(data.suhu, data.waktu_ns / 1_000_000_000, self.alpha)
+        return stat
+
+    def get(self, id_sensor: str) -> Optional[StatSensor]:
+        return self.sensor.get(id_sensor)
+
+    def ringkasan(self, id_sensor: str) -> Optional[Dict[str, float]]:
+        stat = self.sensor.get(id_sensor)
+        if stat is None:
+            return None
+        return {
+            'jumlah': stat.jumlah,
+            'rata_rata': stat.rata_rata,
+            'std': stat.std,
+            'ewma': stat.ewma,
+            'laju_per_jam': stat.laju_per_jam,
+        }
@@ -0,0 +1,499 @@
+# src/binlog.py
+"""
+Log biner append-only berbentuk blok kolumnar, alternatif monitoring_log.csv.
+
+Tata letak file (little-endian, semua bagian rata 8 byte):
+
+    header file : magic 'SUHULOG\\0', versi
+    blok*       : header blok | kamus id baru | kolom
+
+Setiap commit batch Logger menjadi satu blok:
+
+- header blok : jumlah baris, jumlah id baru, panjang kamus dan kolom,
+                flag lebar kolom dan kompresi, lebar kolom waktu, serta
+                rentang waktu (ns_min, ns_max) sehingga pembaca bisa
+                melompati blok tanpa membuka kolomnya
+- kamus id    : id sensor yang baru muncul di blok ini (u16 panjang + utf-8);
+                kode sensor = urutan kemunculan pertama di file
+- kolom       : waktu epoch-ns penuh sebagai run-length: selisih awal run
+                terhadap run sebelumnya (run pertama terhadap ns_min),
+                int16/int32/int64 menurut selisih terbesar di blok, lalu
+                jumlah[r] uint16/uint32 (dilewati bila semua run berisi satu
+                baris) | kode sensor uint8/uint16/uint32[n] | suhu
+                float32[n] | status uint8[n] (kode klasifikasi); tiap kolom
+                rata 8 byte, opsional dikompres zlib per blok
+
+Resolusi LOG_RESOLUSI_WAKTU hanya dipakai saat waktu diformat (ekspor CSV,
+kueri); file biner selalu menyimpan nanodetik.
+
+File dibaca lewat mmap (BinLogReader) dan kolom dikembalikan sebagai
+memoryview / array NumPy tanpa parsing teks. Ekspor ke format CSV lama:
+
+    python -m src.binlog ekspor data/output/monitoring_log.bin [hasil.csv]
+    python -m src.binlog info data/output/monitoring_log.bin
+"""
+
+import argparse
+import array
+import csv
+import gzip
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import config
+from src.clock import FormatWaktu
+from src.klasifikasi import NAMA_STATUS
+from src.logger import Logger
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsional
+    np = None
+
+MAGIC_FILE = b'SUHULOG\x00'
+MAGIC_BLOK = b'SBLK'
+VERSI = 2
+
+# magic, versi, cadangan
+HEADER_FILE = struct.Struct('<8sHHI')
+# magic, flag, lebar selisih waktu (byte), cadangan, n, id baru, panjang kamus,
+# panjang kolom (tersimpan), panjang kolom mentah, jumlah run waktu, ns_min, ns_max
+HEADER_BLOK = struct.Struct('<4sBBHIIIIIIqq')
+
+FLAG_ZLIB = 0x01
+FLAG_KODE16 = 0x02
+FLAG_KODE8 = 0x04
+FLAG_RUN_TUNGGAL = 0x08  # semua run satu baris: kolom jumlah tidak ditulis
+FLAG_RUN16 = 0x10
+
+# Lebar selisih waktu (byte) -> typecode array / dtype NumPy
+FORMAT_SELISIH = {2: 'h', 4: 'i', 8: 'q'}
+KODE_STATUS = {nama: kode for kode, nama in enumerate(NAMA_STATUS)}
+
+
+def _rata8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b'\x00' * (_rata8(len(data)) - len(data))
+
+
+class BinaryLogger(Logger):
+    """
+    Backend Logger dengan antarmuka yang sama (setup/writeData/writeRows/
+    flush/statistik/close), termasuk tingkat durability. Selalu group-commit:
+    LOG_MODE 'sinkron' (satu blok per baris, file ~2x CSV) diganti 'batch',
+    dan baris ALERT/HIPOTERMIA di-commit paling lambat `latensiSegera` detik
+    kemudian (LOG_BINER_LATENSI_SEGERA), bukan satu blok per baris.
+    Kolom analitik (LOG_ANALYTICS) tidak disimpan di format biner.
+    """
+
+    def __init__(self, logLocation=config.LOG_BINER_FILE,
+                 mode=config.LOG_MODE,
+                 batchSize=config.LOG_BATCH_SIZE,
+                 maxLatency=config.LOG_BATCH_MAX_LATENCY,
+                 durability=config.LOG_DURABILITY,
+                 kompresi=config.LOG_BINER_KOMPRESI,
+                 rotasiUkuran=config.LOG_ROTASI_UKURAN,
+                 rotasiInterval=config.LOG_ROTASI_INTERVAL,
+                 kompresiSegmen=config.LOG_ROTASI_KOMPRESI,
+                 indeksBucket=config.LOG_INDEKS_BUCKET,
+                 resolusiWaktu=config.LOG_RESOLUSI_WAKTU,
+                 latensiSegera=config.LOG_BINER_LATENSI_SEGERA):
+        if mode != 'batch':
+            # Header blok + padding per baris membuat file lebih besar dari
+            # CSV; baris di-commit per batchSize atau maxLatency
+            print(f"Log biner: LOG_MODE '{mode}' diganti 'batch' "
+                  f"(commit tiap {batchSize} baris atau {maxLatency} detik).")
+            mode = 'batch'
+        super().__init__(logLocation, mode, batchSize, maxLatency, durability,
+                         rotasiUkuran, rotasiInterval, kompresiSegmen, indeksBucket,
+                         resolusiWaktu)
+        self.kompresi = kompresi
+        # Satu blok per baris ALERT membuat header + padding mendominasi file;
+        # baris segera cukup di-commit dalam batas latensi ini
+        self.latensiSegera = latensiSegera
+
+        # Kolom batch yang belum di-commit
+        self._kosongkanBatch()
+
+        self._kodeSensor: Dict[str, int] = {}
+        self._idBaru: List[str] = []
+
+    def _pakaiAnalytics(self):
+        return False
+
+    def _kosongkanBatch(self):
+        self._kosongkanBuffer()
+        self._idBaru = []
+
+    def _kosongkanBuffer(self):
+        # Id baru tidak ikut dibuang: kodenya sudah dipakai, kamusnya harus
+        # tetap sampai ke blok berikutnya
+        self._runNs = array.array('q')
+        self._runN = array.array('I')
+        self._kode = array.array('I')
+        self._suhu = array.array('f')
+        self._status = array.array('B')
+
+    def _bukaFile(self, path, fileMode):
+        self._kodeSensor = {}
+        if fileMode == 'a' and os.path.exists(path) and os.path.getsize(path):
+            # Lanjutkan kamus id yang sudah ada agar kode sensor tetap sama
+            with BinLogReader(path) as reader:
+                for _ in reader.blok():
+                    pass
+                self._kodeSensor = {id_sensor: kode for kode, id_sensor
+                                    in enumerate(reader.sensor)}
+            self.fileHandle = open(path, 'ab')
+        else:
+            # Setiap file/segmen berdiri sendiri: header dan kamus id baru
+            self.fileHandle = open(path, 'wb')
+            self.fileHandle.write(HEADER_FILE.pack(MAGIC_FILE, VERSI, 0, 0))
+        self.fileHandle.flush()
+
+    def _kodeIndeks(self, id_sensor):
+        return self._kodeSensor[id_sensor]
+
+    def _tambahBaris(self, waktu_ns, id_sensor, suhu, status, analitik=None):
+        # Dipanggil dengan self._cond terkunci. Waktu disimpan penuh (ns);
+        # baris dengan waktu sama (mis. satu tenggat jam virtual) berbagi run
+        waktu = waktu_ns
+        kode = self._kodeSensor.get(id_sensor)
+        if kode is None:
+            kode = self._kodeSensor[id_sensor] = len(self._kodeSensor)
+            self._idBaru.append(id_sensor)
+        if self._segmen is not None or self._indeks is not None:
+            self._catatBaris(waktu, id_sensor)
+
+        if self._runNs and self._runNs[-1] == waktu:
+            self._runN[-1] += 1
+        else:
+            self._runNs.append(waktu)
+            self._runN.append(1)
+        self._kode.append(kode)
+        self._suhu.append(suhu)
+        self._status.append(KODE_STATUS.get(status, 0))
+
+        self._pending += 1
+        if self._pending == 1:
+            self._batchStart = time.monotonic()
+            self._cond.notify()
+
+    def _bangunBlok(self) -> bytes:
+        kamus = bytearray()
+        for id_sensor in self._idBaru:
+            teks = id_sensor.encode('utf-8')
+            kamus += struct.pack('<H', len(teks)) + teks
+        kamus = _pad(bytes(kamus))
+
+        flag = 0
+        kode = self._kode
+        if len(self._kodeSensor) <= 0x100:
+            kode = array.array('B', kode)
+            flag |= FLAG_KODE8
+        elif len(self._kodeSensor) <= 0x10000:
+            kode = array.array('H', kode)
+            flag |= FLAG_KODE16
+
+        # Waktu: selisih antar-awal run, dengan lebar terkecil yang muat
+        run_ns = self._runNs
+        ns_min, ns_max = min(run_ns), max(run_ns)
+        selisih = [run_ns[0] - ns_min]
+        selisih += [b - a for a, b in zip(run_ns, run_ns[1:])]
+        terkecil, terbesar = min(selisih), max(selisih)
+        if -0x8000 <= terkecil and terbesar < 0x8000:
+            lebar_waktu = 2
+        elif -0x80000000 <= terkecil and terbesar < 0x80000000:
+            lebar_waktu = 4
+        else:
+            lebar_waktu = 8
+        kolom_waktu = [array.array(FORMAT_SELISIH[lebar_waktu], selisih)]
+
+        run_n = self._runN
+        if len(run_n) == self._pending:
+            flag |= FLAG_RUN_TUNGGAL
+        elif max(run_n) <= 0xFFFF:
+            kolom_waktu.append(array.array('H', run_n))
+            flag |= FLAG_RUN16
+        else:
+            kolom_waktu.append(run_n)
+
+        kolom = b''.join(_pad(k.tobytes()) for k in
+                         (*kolom_waktu, kode, self._suhu, self._status))
+        mentah = len(kolom)
+        if self.kompresi:
+            kolom = _pad(zlib.compress(kolom, 1))
+            flag |= FLAG_ZLIB
+
+        header = HEADER_BLOK.pack(MAGIC_BLOK, flag, lebar_waktu, 0, self._pending,
+                                  len(self._idBaru), len(kamus), len(kolom), mentah,
+                                  len(run_ns), ns_min, ns_max)
+        return header + kamus + kolom
+
+    def _tulisBatch(self) -> int:
+        # Dipanggil dengan self._cond terkunci: satu batch = satu blok.
+        # Kolom baru dikosongkan setelah write berhasil
+        data = self._bangunBlok()
+
+        self.fileHandle.write(data)
+        if self.durability in ('flush', 'fsync'):
+            self.fileHandle.flush()
+        if self.durability == 'fsync':
+            os.fsync(self.fileHandle.fileno())
+        self._kosongkanBatch()
+
+        self.rowsWritten += self._pending
+        self.batchesWritten += 1
+        self.bytesWritten += len(data)
+        self._pending = 0
+        return len(data)
+
+
+class BlokLog:
+    __slots__ = ('n', 'n_run', 'ns_min', 'ns_max', 'offset', 'panjang', 'flag', 'lebar_waktu')
+
+    def __init__(self, n, n_run, ns_min, ns_max, offset, panjang, flag, lebar_waktu):
+        self.n = n
+        self.n_run = n_run
+        self.ns_min = ns_min
+        self.ns_max = ns_max
+        self.offset = offset
+        self.panjang = panjang
+        self.flag = flag
+        self.lebar_waktu = lebar_waktu
+
+
+class BinLogReader:
+    """Pembaca log biner berbasis mmap. `sensor[kode]` -> id sensor."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = None
+        self.sensor: List[str] = []
+
+        if path.endswith('.gz'):
+            # Segmen hasil rotasi yang sudah dikompres: dibuka di memori
+            with gzip.open(self._file) as file:
+                self._mm = file.read()
+        else:
+            ukuran = os.fstat(self._file.fileno()).st_size
+            if ukuran >= HEADER_FILE.size:
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm is None or len(self._mm) < HEADER_FILE.size:
+            self._file.close()
+            raise ValueError(f"Bukan file log biner: {path}")
+        magic, versi, _, _ = HEADER_FILE.unpack_from(self._mm, 0)
+        if magic != MAGIC_FILE or versi != VERSI:
+            raise ValueError(f"Bukan file log biner: {path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            try:
+                self._mm.close()
+            except BufferError:
+                # Masih ada memoryview kolom yang hidup; mmap ditutup oleh GC
+                pass
+            self._mm = None
+        self._file.close()
+
+    def blok(self, mulai: Optional[int] = None, sampai: Optional[int] = None) -> Iterator[BlokLog]:
+        """
+        Telusuri header blok (kamus id ikut dibaca, kolom tidak). `mulai`/
+        `sampai` membatasi ke rentang byte dari indeks; kamus hanya dibangun
+        bila penelusuran dimulai dari awal file.
+        """
+        mm = self._mm
+        dari_awal = mulai is None
+        posisi = HEADER_FILE.size if dari_awal else mulai
+        akhir = len(mm) if sampai is None else min(sampai, len(mm))
+        if dari_awal:
+            self.sensor = []
+        while posisi + HEADER_BLOK.size <= akhir:
+            (magic, flag, lebar_waktu, _, n, id_baru, panjang_kamus, panjang_kolom,
+             _, n_run, ns_min, ns_max) = HEADER_BLOK.unpack_from(mm, posisi)
+            if magic != MAGIC_BLOK:
+                raise ValueError(f"Blok rusak di offset {posisi}")
+            offset_kolom = posisi + HEADER_BLOK.size + panjang_kamus
+            if offset_kolom + panjang_kolom > akhir:
+                break  # blok terakhir belum lengkap (penulisan terputus)
+
+            p = posisi + HEADER_BLOK.size
+            for _ in range(id_baru if dari_awal else 0):
+                (panjang,) = struct.unpack_from('<H', mm, p)
+                self.sensor.append(mm[p + 2:p + 2 + panjang].decode('utf-8'))
+                p += 2 + panjang
+
+            yield BlokLog(n, n_run, ns_min, ns_max, offset_kolom, panjang_kolom, flag, lebar_waktu)
+            posisi = offset_kolom + panjang_kolom
+
+    def _kolomMentah(self, blok: BlokLog):
+        """
+        (selisih_waktu, run_jumlah, kode_sensor, suhu, status) satu blok,
+        tanpa salinan bila tidak terkompresi. run_jumlah None = semua run satu baris.
+        """
+        data = memoryview(self._mm)[blok.offset:blok.offset + blok.panjang]
+        if blok.flag & FLAG_ZLIB:
+            data = memoryview(zlib.decompress(data))
+        n, r = blok.n, blok.n_run
+        if blok.flag & FLAG_KODE8:
+            format_kode = 'B'
+        elif blok.flag & FLAG_KODE16:
+            format_kode = 'H'
+        else:
+            format_kode = 'I'
+        kolom = [(r, FORMAT_SELISIH[blok.lebar_waktu])]
+        if not blok.flag & FLAG_RUN_TUNGGAL:
+            kolom.append((r, 'H' if blok.flag & FLAG_RUN16 else 'I'))
+        kolom += [(n, format_kode), (n, 'f'), (n, 'B')]
+
+        hasil = []
+        posisi = 0
+        for jumlah, format_ in kolom:
+            lebar = struct.calcsize(format_)
+            hasil.append(data[posisi:posisi + jumlah * lebar].cast(format_))
+            posisi += _rata8(jumlah * lebar)
+        if blok.flag & FLAG_RUN_TUNGGAL:
+            hasil.insert(1, None)
+        return hasil
+
+    def kolom(self, blok: BlokLog):
+        """(waktu_ns, kode_sensor, suhu, status) satu blok; waktu sudah dibuka dari run-length."""
+        selisih, run_n, kode, suhu, status = self._kolomMentah(blok)
+        awal_run = array.array('q', accumulate(selisih, initial=blok.ns_min))[1:]
+        if run_n is None:
+            return awal_run, kode, suhu, status
+        ns = array.array('q')
+        for nilai, jumlah in zip(awal_run, run_n):
+            ns.extend([nilai] * jumlah)
+        return ns, kode, suhu, status
+
+    def scan(self, ns_dari: Optional[int] = None, ns_sampai: Optional[int] = None):
+        """
+        Gabungkan kolom semua blok (opsional dibatasi rentang waktu, blok di
+        luar rentang dilewati dari header-nya saja). Mengembalikan
+        (waktu_ns, kode_sensor, suhu, status) berupa array NumPy bila
+        tersedia, selain itu array.array.
+        """
+        blok_dipilih = [blok for blok in self.blok()
+                        if (ns_dari is None or blok.ns_max >= ns_dari)
+                        and (ns_sampai is None or blok.ns_min <= ns_sampai)]
+        bagian = [self._kolomMentah(blok) for blok in blok_dipilih]
+
+        if np is not None:
+            if not bagian:
+                return (np.empty(0, np.int64), np.empty(0, np.uint32),
+                        np.empty(0, np.float32), np.empty(0, np.uint8))
+
+            # Satu join byte per kolom lalu satu frombuffer (bukan per blok)
+            def gabung(i, dtype):
+                return np.frombuffer(b''.join([b[i] for b in bagian]), dtype=dtype)
+
+            # Waktu dan kode lebarnya bisa berbeda antar-blok: dibuka per blok
+            waktu = []
+            for blok, b in zip(blok_dipilih, bagian):
+                awal_run = np.cumsum(np.asarray(b[0], dtype=np.int64)) + blok.ns_min
+                waktu.append(awal_run if b[1] is None else np.repeat(awal_run, np.asarray(b[1])))
+            ns = np.concatenate(waktu)
+            kode = np.concatenate([np.asarray(b[2]).astype(np.uint32) for b in bagian])
+            hasil = (ns, kode, gabung(3, np.float32), gabung(4, np.uint8))
+
+            if ns_dari is not None or ns_sampai is not None:
+                pilih = np.ones(len(ns), dtype=bool)
+                if ns_dari is not None:
+                    pilih &= ns >= ns_dari
+                if ns_sampai is not None:
+                    pilih &= ns <= ns_sampai
+                hasil = tuple(kol[pilih] for kol in hasil)
+            return hasil
+
+        hasil = (array.array('q'), array.array('I'), array.array('f'), array.array('B'))
+        for blok in blok_dipilih:
+            ns, kode, suhu, status = self.kolom(blok)
+            hasil[0].extend(ns)
+            hasil[1].extend(kode)
+            hasil[2].frombytes(suhu.tobytes())
+            hasil[3].frombytes(status.tobytes())
+        if ns_dari is not None or ns_sampai is not None:
+            pilih = [i for i, ns in enumerate(hasil[0])
+                     if (ns_dari is None or ns >= ns_dari) and (ns_sampai is None or ns <= ns_sampai)]
+            hasil = tuple(array.array(kol.typecode, (kol[i] for i in pilih)) for kol in hasil)
+        return hasil
+
+    def baris(self) -> Iterator[tuple]:
+        """Baris per baris: (waktu_ns, id_sensor, suhu, nama_status)."""
+        for blok in self.blok():
+            ns, kode, suhu, status = self.kolom(blok)
+            sensor = self.sensor
+            for i in range(blok.n):
+                yield ns[i], sensor[kode[i]], suhu[i], NAMA_STATUS[status[i]]
+
+
+_FORMAT_DETIK = FormatWaktu('s')
+
+
+def format_waktu(ns: int) -> str:
+    # Resolusi detik seperti kolom waktu CSV lama
+    return _FORMAT_DETIK(ns)
+
+
+def ekspor_csv(path_biner: str, path_csv: str, resolusi: str = config.LOG_RESOLUSI_WAKTU) -> int:
+    """Tulis ulang log biner ke format CSV Logger (waktu,id,suhu,status)."""
+    jumlah = 0
+    format_ = FormatWaktu(resolusi)
+    with BinLogReader(path_biner) as reader, \
+            open(path_csv, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['waktu', 'id', 'suhu', 'status'])
+        for ns, id_sensor, suhu, status in reader.baris():
+            # float32 -> 3 desimal cukup untuk suhu dan mengembalikan teks aslinya
+            writer.writerow([format_(ns), id_sensor, round(suhu, 3), status])
+            jumlah += 1
+    return jumlah
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Alat log biner monitoring suhu')
+    sub = parser.add_subparsers(dest='perintah', required=True)
+
+    p_ekspor = sub.add_parser('ekspor', help='ekspor log biner ke CSV')
+    p_ekspor.add_argument('biner')
+    p_ekspor.add_argument('csv', nargs='?')
+
+    p_info = sub.add_parser('info', help='ringkasan isi log biner')
+    p_info.add_argument('biner')
+
+    args = parser.parse_args(argv)
+
+    if args.perintah == 'ekspor':
+        tujuan = args.csv or os.path.splitext(args.biner)[0] + '.csv'
+        jumlah = ekspor_csv(args.biner, tujuan)
+        print(f"{jumlah} baris diekspor ke {tujuan}")
+    else:
+        with BinLogReader(args.biner) as reader:
+            blok = list(reader.blok())
+            baris = sum(b.n for b in blok)
+            print(f"File   : {args.biner} ({os.path.getsize(args.biner)} byte)")
+            print(f"Blok   : {len(blok)}, baris: {baris}, sensor: {len(reader.sensor)}")
+            if blok:
+                print(f"Rentang: {format_waktu(min(b.ns_min for b in blok))} s/d "
+                      f"{format_waktu(max(b.ns_max for b in blok))}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,51 +1,322 @@
-import queue
+import threading
+import time
+import zlib
+from collections import deque
 import config
-from src.visualizer import TemperatureVisualizer
-from typing import TYPE_CHECKING, Dict, Any
+from src.klasifikasi import kode_status, ALERT, NORMAL
+from src.reading import ReadingPipeline
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 
 if TYPE_CHECKING:
     from .cpu import CPU
+    # Hanya untuk anotasi: modul visualizer (dan Matplotlib) tidak di-import
+    # kecuali visualizer benar-benar dipasang
+    from .visualizer import TemperatureVisualizer
     from .sensor import TempSensor
+    from .scheduler import SensorScheduler
+    from .analytics import StreamingAnalytics
+    from .alert import AlertManager
+    from .metrics import Metrics
+
+
+class StatistikSensor:
+    __slots__ = ('enqueued', 'dropped', 'pending', 'high_water')
+
+    def __init__(self):
+        self.enqueued = 0
+        self.dropped = 0
+        self.pending = 0
+        self.high_water = 0
+
+    def as_dict(self):
+        return {
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'pending': self.pending,
+            'high_water': self.high_water,
+        }
+
+
+class BusBuffer:
+    """
+    Antrean bus berbatas (`maks` = 0 berarti tak terbatas) dengan kebijakan
+    backpressure saat penuh:
+
+    - 'block'       : produsen menunggu sampai ada ruang
+    - 'drop_oldest' : data tertua dibuang
+    - 'drop_newest' : data yang baru datang dibuang
+    - 'prioritas'   : ALERT/HIPOTERMIA tidak pernah dibuang, NORMAL dibuang dulu
+
+    Data prioritas disimpan di deque terpisah; urutan keluar tetap FIFO
+    berdasarkan nomor urut, jadi urutan per sensor tidak berubah.
+    """
+
+    KEBIJAKAN = ('block', 'drop_oldest', 'drop_newest', 'prioritas')
+
+    def __init__(self, maks: int = 0, kebijakan: str = 'block'):
+        if kebijakan not in self.KEBIJAKAN:
+            raise ValueError(f"Kebijakan bus tidak dikenal: {kebijakan}")
+        self.maks = maks
+        self.kebijakan = kebijakan
+
+        self._normal = deque()
+        self._prioritas = deque()
+        self._urutan = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.high_water = 0
+        self.per_sensor: Dict[str, StatistikSensor] = {}
+
+    def __len__(self):
+        return len(self._normal) + len(self._prioritas)
+
+    def _stat(self, id_sensor) -> StatistikSensor:
+        stat = self.per_sensor.get(id_sensor)
+        if stat is None:
+            stat = self.per_sensor[id_sensor] = StatistikSensor()
+        return stat
+
+    def _buang(self, antrean: deque):
+        _, data = antrean.popleft()
+        stat = self._stat(data.id)
+        stat.pending -= 1
+        stat.dropped += 1
+        self.dropped += 1
+
+    def put(self, data, prioritas: bool = False) -> bool:
+        """Masukkan data ke antrean. Mengembalikan False jika data dibuang."""
+        with self._lock:
+            stat = self._stat(data.id)
+
+            if self.maks and len(self) >= self.maks:
+                kebijakan = self.kebijakan
+                if prioritas and kebijakan in ('block', 'prioritas'):
+                    # Data prioritas tidak pernah ditahan atau dibuang:
+                    # buang NORMAL tertua bila ada, selain itu biarkan melewati batas
+                    if kebijakan == 'prioritas' and self._normal:
+                        self._buang(self._normal)
+                elif kebijakan == 'block':
+                    while self.maks and len(self) >= self.maks:
+                        self._not_full.wait()
+                elif kebijakan == 'drop_oldest':
+                    if self._prioritas and (not self._normal or self._prioritas[0][0] < self._normal[0][0]):
+                        self._buang(self._prioritas)
+                    else:
+                        self._buang(self._normal)
+                elif kebijakan == 'prioritas' and self._normal:
+                    self._buang(self._normal)
+                else:
+                    # drop_newest, atau 'prioritas' yang isinya sudah prioritas semua
+                    stat.dropped += 1
+                    self.dropped += 1
+                    return False
+
+            self._urutan += 1
+            (self._prioritas if prioritas else self._normal).append((self._urutan, data))
+
+            stat.enqueued += 1
+            stat.pending += 1
+            if stat.pending > stat.high_water:
+                stat.high_water = stat.pending
+            self.enqueued += 1
+            kedalaman = len(self)
+            if kedalaman > self.high_water:
+                self.high_water = kedalaman
+
+            self._not_empty.notify()
+            return True
+
+    def _ambil(self):
+        # Dipanggil dengan kunci terpegang dan antrean tidak kosong
+        if self._prioritas and (not self._normal or self._prioritas[0][0] < self._normal[0][0]):
+            _, data = self._prioritas.popleft()
+        else:
+            _, data = self._normal.popleft()
+        self._stat(data.id).pending -= 1
+        return data
+
+    def get_nowait(self):
+        with self._lock:
+            if not len(self):
+                return None
+            data = self._ambil()
+            self._not_full.notify()
+            return data
+
+    def get_many(self, max_items: int, timeout: Optional[float] = None) -> List:
+        with self._lock:
+            if not len(self):
+                batas = None if timeout is None else time.monotonic() + timeout
+                while not len(self):
+                    sisa = None if batas is None else batas - time.monotonic()
+                    if sisa is not None and sisa <= 0:
+                        return []
+                    self._not_empty.wait(sisa)
+
+            jumlah = min(max_items, len(self))
+            batch = [self._ambil() for _ in range(jumlah)]
+            self._not_full.notify(jumlah)
+            return batch
+
+    def statistik(self):
+        with self._lock:
+            return {
+                'depth': len(self),
+                'enqueued': self.enqueued,
+                'dropped': self.dropped,
+                'high_water': self.high_water,
+                'per_sensor': {id_sensor: stat.as_dict()
+                               for id_sensor, stat in self.per_sensor.items()},
+            }
+
+
+class BusShard:
+    """View satu partisi bus untuk satu worker CPU (antarmuka sama dengan DataBus)."""
+
+    def __init__(self, buffer: BusBuffer):
+        self.data_buffer = buffer
+
+    def get_buffered_data(self):
+        return self.data_buffer.get_nowait()
+
+    def get_many(self, max_items: int, timeout: float | None = None):
+        return self.data_buffer.get_many(max_items, timeout)
+
+    def statistik(self):
+        return self.data_buffer.statistik()
 
 
 class DataBus:
-    def __init__(self, cpu_target: 'CPU'):
+    def __init__(self, cpu_target: 'CPU', jumlah_shard: int = 1):
         print('Inisialisasi data bus')
 
-        self.data_buffer = queue.Queue()
+        # Satu buffer per shard; data dipartisi berdasarkan id sensor sehingga
+        # urutan pembacaan tiap sensor tetap terjaga di worker yang sama
+        self.shards = [BusBuffer(config.BUS_MAX_DEPTH, config.BUS_POLICY)
+                       for _ in range(max(1, jumlah_shard))]
+        self._shard_sensor: Dict[str, BusBuffer] = {}
+        self.data_buffer = self.shards[0]
         self.cpu = cpu_target
-        self.alert_threshold = config.BATAS_DEMAM
         self.visualizer: 'TemperatureVisualizer' | None = None
+        self.scheduler: 'SensorScheduler' | None = None
+        self.analytics: 'StreamingAnalytics' | None = None
+        self.snapshot_analitik = False
+        self.alert_manager: 'AlertManager' | None = None
+        self.metrics: 'Metrics' | None = None
 
     def attach_visualizer(self, visualizer: 'TemperatureVisualizer'):
         print("Visualizer terhubung ke Data Bus.")
         self.visualizer = visualizer
-      
+
+    def attach_scheduler(self, scheduler: 'SensorScheduler'):
+        print("Sensor scheduler terhubung ke Data Bus.")
+        self.scheduler = scheduler
+
+    def attach_analytics(self, analytics: 'StreamingAnalytics'):
+        print("Analitik streaming terhubung ke Data Bus.")
+        self.analytics = analytics
+        # Kolom analitik log harus memakai statistik saat pembacaan ini,
+        # bukan saat baris ditulis (bisa beberapa pembacaan kemudian)
+        self.snapshot_analitik = config.LOG_ANALYTICS
+
+    def attach_alert_manager(self, alert_manager: 'AlertManager'):
+        print("Alert manager terhubung ke Data Bus.")
+        self.alert_manager = alert_manager
+
+    def attach_metrics(self, metrics: 'Metrics'):
+        print("Metrics terhubung ke Data Bus.")
+        self.metrics = metrics
+        metrics.gauge('antrean_bus', lambda: sum(len(buffer) for buffer in self.shards))
+        metrics.gauge('puncak_antrean_bus', lambda: sum(buffer.high_water for buffer in self.shards))
+        metrics.gauge('dibuang_bus', lambda: sum(buffer.dropped for buffer in self.shards))
+
     def register_sensor(self, sensor: 'TempSensor'):
         print(f"Sensor '{sensor.id}' terhubung ke Data Bus.")
 
-        sensor.mulai_monitoring(callback_function=self.handler_sensor_data)
-    
+        sensor.mulai_monitoring(callback_function=self.handler_sensor_data,
+                                scheduler=self.scheduler)
+
+    def shard(self, indeks: int) -> BusShard:
+        return BusShard(self.shards[indeks])
+
+    def _buffer_untuk(self, id_sensor: str) -> BusBuffer:
+        buffer = self._shard_sensor.get(id_sensor)
+        if buffer is None:
+            # crc32 (bukan hash()) agar partisi stabil antar-proses
+            indeks = zlib.crc32(str(id_sensor).encode('utf-8')) % len(self.shards)
+            buffer = self._shard_sensor[id_sensor] = self.shards[indeks]
+        return buffer
+
     def handler_sensor_data(self, data: Dict[str, any]):
-        self.data_buffer.put(data)
-        
-        suhu = data.get('suhu')
+        metrics = self.metrics
+        if metrics:
+            t_emit = time.perf_counter_ns()
+        buffer = self._buffer_untuk(data.id)
+        suhu = data.suhu
         if suhu is None:
-            return 
-            
-        is_fever = suhu > self.alert_threshold
+            if metrics:
+                data = ReadingPipeline.dari(data)
+                data.t_emit = t_emit
+                data.t_antre = time.perf_counter_ns()
+                metrics.catat('bus', data.t_antre - t_emit)
+            buffer.put(data)
+            return
+
+        # Analitik diperbarui sebelum data sampai ke CPU
+        if self.analytics:
+            stat = self.analytics.update(data)
+            if self.snapshot_analitik:
+                data = ReadingPipeline.dari(data)
+                data.analitik = (stat.rata_rata, stat.std, stat.ewma, stat.laju_per_jam)
+
+        kode = kode_status(suhu)
+        is_fever = kode == ALERT
+
+        # Interrupt demam dikirim lebih dulu agar tidak ikut tertahan
+        # saat buffer bus penuh. Dengan alert manager, semua pembacaan masuk
+        # ke state machine (perlu pembacaan normal untuk tahu kapan pulih)
+        if self.alert_manager:
+            self.alert_manager.proses(data)
+        elif is_fever:
+            self.cpu.handle_interrupt(data)
+
+        if metrics:
+            # Cap antrean dipasang sebelum put(): CPU bisa mengambilnya seketika
+            data = ReadingPipeline.dari(data)
+            data.t_emit = t_emit
+            data.t_antre = time.perf_counter_ns()
+            metrics.catat('bus', data.t_antre - t_emit)
+        buffer.put(data, prioritas=kode != NORMAL)
 
         if self.visualizer:
             try:
-                self.visualizer.add_data_point(suhu, is_fever)
+                self.visualizer.add_data_point(suhu, is_fever, data.id, data.waktu_ns)
             except Exception as e:
                 print(f"Error mengirim data ke visualizer: {e}")
-                
-        if is_fever:
-            self.cpu.handle_interrupt(data)
 
     def get_buffered_data(self):
-        try:
-            return self.data_buffer.get_nowait()
-        except queue.Empty:
-            return None
\ No newline at end of file
+        return self.data_buffer.get_nowait()
+
+    def get_many(self, max_items: int, timeout: float | None = None):
+        """
+        Blok sampai ada data (maks. `timeout` detik), lalu kuras hingga
+        `max_items` data sekaligus. Mengembalikan list kosong jika timeout.
+        """
+        return self.data_buffer.get_many(max_items, timeout)
+
+    def statistik(self):
+        if len(self.shards) == 1:
+            return self.data_buffer.statistik()
+
+        # Gabungkan statistik semua shard
+        total = {'depth': 0, 'enqueued': 0, 'dropped': 0, 'high_water': 0, 'per_sensor': {}}
+        for buffer in self.shards:
+            stat = buffer.statistik()
+            for kunci in ('depth', 'enqueued', 'dropped', 'high_water'):
+                total[kunci] += stat[kunci]
+            total['per_sensor'].update(stat['per_sensor'])
+        return total
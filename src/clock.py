@@ -0,0 +1,173 @@
+# src/clock.py
+"""
+Abstraksi jam yang dipakai bersama oleh sensor, scheduler, logger dan
+visualizer.
+
+- WallClock   : jam dinding biasa (perilaku lama).
+- VirtualClock: waktu simulasi. Menunggu tidak benar-benar tidur, jam
+                langsung maju ke tenggat berikutnya, sehingga sensor
+                mengirim data secepat pipeline mampu menyerap sementara
+                timestamp tetap bertambah JEDA per pembacaan.
+
+Timestamp pembacaan diambil sekali di sensor lewat `waktu_ns_tenggat()`
+(epoch nanodetik; pada jam virtual = tenggat sensor itu sendiri) lalu
+dibawa sampai ke penyimpanan. `FormatWaktu` mengubahnya
+menjadi teks dengan strftime paling banyak sekali per detik.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import config
+
+
+FORMAT_WAKTU = "%Y-%m-%d %H:%M:%S"
+# Resolusi -> jumlah digit pecahan detik
+RESOLUSI_WAKTU = {'s': 0, 'ms': 3, 'us': 6, 'ns': 9}
+
+
+class WallClock:
+    is_virtual = False
+
+    def __init__(self):
+        # Jangkar epoch diambil sekali; selanjutnya waktu_ns() = jangkar +
+        # monotonic, jadi timestamp tidak pernah mundur saat jam dinding
+        # dikoreksi (NTP)
+        self._jangkar_ns = time.time_ns() - time.monotonic_ns()
+
+    def time(self) -> float:
+        """Waktu epoch (detik)."""
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def waktu_ns(self) -> int:
+        """Epoch nanodetik berbasis jam monotonic."""
+        return self._jangkar_ns + time.monotonic_ns()
+
+    def titik_awal(self) -> float:
+        """Tenggat pertama sensor yang baru mulai."""
+        return time.monotonic()
+
+    def waktu_ns_tenggat(self, tenggat: float) -> int:
+        # Jam dinding: pembacaan terjadi saat ini (tenggat sudah tercapai)
+        return self.waktu_ns()
+
+    def tunggu_sampai(self, tenggat: float, event: Optional[threading.Event] = None) -> bool:
+        """
+        Tunggu sampai `monotonic()` mencapai `tenggat`.
+        Mengembalikan True jika `event` di-set (berhenti lebih awal).
+        """
+        sisa = tenggat - time.monotonic()
+        if event is not None:
+            return event.wait(max(0.0, sisa))
+        if sisa > 0:
+            time.sleep(sisa)
+        return False
+
+
+class VirtualClock:
+    is_virtual = True
+
+    def __init__(self, mulai: Optional[datetime] = None):
+        self._epoch_awal = (mulai or datetime.now()).timestamp()
+        self._epoch_awal_ns = round(self._epoch_awal * 1_000_000_000)
+        self._sekarang = 0.0
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self._epoch_awal + self._sekarang
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time())
+
+    def monotonic(self) -> float:
+        return self._sekarang
+
+    def waktu_ns(self) -> int:
+        return self._epoch_awal_ns + round(self._sekarang * 1_000_000_000)
+
+    def titik_awal(self) -> float:
+        # Semua sensor mulai di awal waktu simulasi, bukan di posisi jam saat
+        # didaftarkan (yang bisa sudah dimajukan thread sensor lain)
+        return 0.0
+
+    def waktu_ns_tenggat(self, tenggat: float) -> int:
+        """
+        Timestamp pembacaan dari tenggat sensor itu sendiri. Jam virtual
+        dimajukan bersama oleh semua thread sensor, jadi `waktu_ns()` berisi
+        tenggat sensor tercepat, bukan milik sensor yang membaca.
+        """
+        return self._epoch_awal_ns + round(tenggat * 1_000_000_000)
+
+    def maju(self, detik: float):
+        with self._lock:
+            self._sekarang += detik
+
+    def tunggu_sampai(self, tenggat: float, event: Optional[threading.Event] = None) -> bool:
+        with self._lock:
+            if tenggat > self._sekarang:
+                self._sekarang = tenggat
+        # Lepas GIL sebentar agar thread konsumen (CPU/logger) tetap kebagian jatah
+        time.sleep(0)
+        return event.is_set() if event is not None else False
+
+
+class FormatWaktu:
+    """
+    Epoch-ns -> 'YYYY-mm-dd HH:MM:SS[.fff]'. Awalan per detik di-cache,
+    sehingga strftime hanya dipanggil saat detiknya berganti; pecahan detik
+    ditambahkan sesuai `resolusi` ('s', 'ms', 'us', 'ns').
+    """
+
+    def __init__(self, resolusi: str = 's'):
+        if resolusi not in RESOLUSI_WAKTU:
+            raise ValueError(f"Resolusi waktu tidak dikenal: {resolusi}")
+        self.resolusi = resolusi
+        self.digit = RESOLUSI_WAKTU[resolusi]
+        self.satuan_ns = 10 ** (9 - self.digit)
+        # (detik, teks) diganti sebagai satu tuple: aman dipakai lintas thread
+        self._cache = (None, '')
+
+    def awalan(self, detik: int) -> str:
+        cache = self._cache
+        if cache[0] != detik:
+            cache = self._cache = (detik, datetime.fromtimestamp(detik).strftime(FORMAT_WAKTU))
+        return cache[1]
+
+    def __call__(self, ns: int) -> str:
+        detik, sisa = divmod(ns, 1_000_000_000)
+        if not self.digit:
+            return self.awalan(detik)
+        return f"{self.awalan(detik)}.{sisa // self.satuan_ns:0{self.digit}d}"
+
+
+def parse_waktu(teks: str) -> float:
+    """'YYYY-mm-dd HH:MM:SS[.fff]' -> epoch detik."""
+    return datetime.fromisoformat(teks).timestamp()
+
+
+_clock = WallClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    global _clock
+    _clock = clock
+
+
+def buat_clock():
+    """Buat jam sesuai config.CLOCK_MODE."""
+    if config.CLOCK_MODE == 'virtual':
+        mulai = datetime.fromisoformat(config.CLOCK_MULAI) if config.CLOCK_MULAI else None
+        return VirtualClock(mulai)
+    return WallClock()
@@ -2,19 +2,44 @@ import threading
 import time
 import os
 import config
-from typing import TYPE_CHECKING, Dict, Any
+from src.klasifikasi import klasifikasi_batch, status as status_suhu, NAMA_STATUS
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
 if TYPE_CHECKING:
-    from .bus import DataBus
+    from .bus import DataBus, BusShard
     from .logger import Logger
+    from .analytics import StreamingAnalytics
+    from .alert import AlertManager
+    from .output import OutputSink
+    from .rollup import RollupStore
+    from .metrics import Metrics
 
 
 class CPU:
-    def __init__(self):
-        print('Inisialisasi CPU')
+    def __init__(self, nama: str = 'CPU'):
+        print(f'Inisialisasi {nama}')
+        self.nama = nama
         self.bus : 'DataBus' | None = None
         self.is_running = False
         self._thread = None
+        self.logger: Optional['Logger'] = None
+        self.analytics: Optional['StreamingAnalytics'] = None
+        self.kolom_analitik = False
+        self.alert_manager: Optional['AlertManager'] = None
+        self.output: Optional['OutputSink'] = None
+        self.rollup: Optional['RollupStore'] = None
+        self.metrics: Optional['Metrics'] = None
+
+        # Mode konsumsi bus: 'polling' (lama) atau 'batch' (event-driven)
+        self.mode = config.CPU_MODE
+        self.batch_size = config.CPU_BATCH_SIZE
+        self.block_timeout = config.CPU_BLOCK_TIMEOUT
+
+        # Hasil klasifikasi batch: status terakhir per sensor_idx, statistik
+        # batch terakhir, dan jumlah perpindahan status
+        self.status_terakhir: Dict[int, int] = {}
+        self.statistik_batch: Dict[int, tuple] = {}
+        self.jumlah_crossing = 0
 
         dir_utama = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -26,13 +51,74 @@ class CPU:
         print('CPU terhubung ke logger.')
         self.logger = logger    
 
+    def attach_analytics(self, analytics: 'StreamingAnalytics'):
+        print('CPU terhubung ke analitik streaming.')
+        self.analytics = analytics
+        # Snapshot statistik dari DataBus diteruskan ke logger per baris
+        self.kolom_analitik = config.LOG_ANALYTICS
+
+    def attach_alert_manager(self, alert_manager: 'AlertManager'):
+        # Banner demam/hipotermia diambil alih alert manager
+        print('CPU terhubung ke alert manager.')
+        self.alert_manager = alert_manager
+
+    def attach_output(self, output: 'OutputSink'):
+        print('CPU terhubung ke output sink.')
+        self.output = output
+
+    def attach_rollup(self, rollup: 'RollupStore'):
+        print('CPU terhubung ke rollup.')
+        self.rollup = rollup
+
+    def attach_metrics(self, metrics: 'Metrics'):
+        print('CPU terhubung ke metrics.')
+        self.metrics = metrics
+
+    def _baris_tren(self, id_sensor) -> list:
+        stat = self.analytics.get(id_sensor) if self.analytics else None
+        if stat is None:
+            return []
+        return [f"    TREN:   rata-rata {stat.rata_rata:.1f}°C, "
+                f"{stat.laju_per_jam:+.1f}°C/jam"]
+
+    def _cetak_banner(self, baris: list):
+        teks = "\n" + "="*40 + "\n" + "\n".join(baris) + "\n" + "="*40 + "\n"
+        if self.output:
+            self.output.alert(teks)
+        else:
+            print(teks)
+
     def handle_interrupt(self, alert_data: Dict[str, Any]):
-        print("\n" + "="*40)
-        print(f"!!! INTERRUPT DITERIMA (CPU) !!!")
-        print(f"    ALERT: Demam terdeteksi!")
-        print(f"    SENSOR: {alert_data['id']}")
-        print(f"    SUHU:   {alert_data['suhu']}°C")
-        print("="*40 + "\n")
+        self._cetak_banner([
+            f"!!! INTERRUPT DITERIMA (CPU) !!!",
+            f"    ALERT: Demam terdeteksi!",
+            f"    SENSOR: {alert_data['id']}",
+            f"    SUHU:   {alert_data['suhu']}°C",
+        ] + self._baris_tren(alert_data['id']))
+
+    def tentukan_status(self, suhu: float) -> str:
+        return status_suhu(suhu)
+
+    def _cetak_status(self, id_sensor, suhu, status):
+        if status == "NORMAL":
+            if self.output:
+                self.output.baris(id_sensor, "[CPU->Log]: Data normal dari {}: {}°C",
+                                  id_sensor, suhu)
+            else:
+                print(f"[CPU->Log]: Data normal dari {id_sensor}: {suhu}°C")
+
+        elif status == "HIPOTERMIA" and self.alert_manager is None:
+            # --- INI BLOK BARU ANDA ---
+            # Cetak blok peringatan agar "rame"
+            self._cetak_banner([
+                f"!!! PERINGATAN (CPU-LOG) !!!", # Kita sebut CPU-LOG
+                f"    ALERT: Hipotermia terdeteksi!",
+                f"    SENSOR: {id_sensor}",
+                f"    SUHU:   {suhu}°C",
+            ] + self._baris_tren(id_sensor))
+
+        # (Status "ALERT" untuk DEMAM tidak perlu dicetak di sini,
+        # karena itu sudah ditangani oleh handle_interrupt)
 
     # Di dalam file src/cpu.py
 
@@ -54,37 +140,37 @@ class CPU:
             if data:
                 # --- LOGIKA PINDAH KE SINI ---
                 try:
-                    suhu = data['suhu']
-                    id_sensor = data['id']
+                    metrics = self.metrics
+                    if metrics:
+                        t_ambil = time.perf_counter_ns()
+                        metrics.catat('antre', t_ambil - data.t_antre)
+
+                    suhu = data.suhu
+                    id_sensor = data.id
                     
                     # 2. CPU menentukan status
-                    if suhu > config.BATAS_DEMAM:
-                        status = "ALERT"
-                    elif suhu < config.BATAS_HIPO:
-                        status = "HIPOTERMIA"
-                    else:
-                        status = "NORMAL"
+                    status = self.tentukan_status(suhu)
+                    if metrics:
+                        t_status = time.perf_counter_ns()
+                        metrics.catat('klasifikasi', t_status - t_ambil)
 
                     # 3. CPU memanggil logger sinkron
                     #    (Ini akan menulis 'HIPOTERMIA' ke file CSV)
-                    self.logger.writeData(id_sensor, suhu, status)
+                    analitik = data.get('analitik') if self.kolom_analitik else None
+                    self.logger.writeData(id_sensor, suhu, status, data.waktu_ns, analitik)
+                    if self.rollup:
+                        self.rollup.update(id_sensor, suhu, status, data.waktu_ns)
+                    if metrics:
+                        t_log = time.perf_counter_ns()
+                        metrics.catat('log', t_log - t_status)
+                        metrics.catat('total', t_log - data.t_emit)
                     
                     # 4. Cetak ke konsol (MODIFIKASI)
-                    if status == "NORMAL":
-                        print(f"[CPU->Log]: Data normal dari {id_sensor}: {suhu}°C")
-                    
-                    elif status == "HIPOTERMIA":
-                        # --- INI BLOK BARU ANDA ---
-                        # Cetak blok peringatan agar "rame"
-                        print("\n" + "="*40)
-                        print(f"!!! PERINGATAN (CPU-LOG) !!!") # Kita sebut CPU-LOG
-                        print(f"    ALERT: Hipotermia terdeteksi!")
-                        print(f"    SENSOR: {id_sensor}")
-                        print(f"    SUHU:   {suhu}°C")
-                        print("="*40 + "\n")
-                    
-                    # (Status "ALERT" untuk DEMAM tidak perlu dicetak di sini,
-                    # karena itu sudah ditangani oleh handle_interrupt)
+                    self._cetak_status(id_sensor, suhu, status)
+                    if self.output:
+                        self.output.hitung()
+                    if metrics:
+                        metrics.catat('konsol', time.perf_counter_ns() - t_log)
                         
                 except Exception as e:
                     print(f"ERROR: CPU gagal memproses log: {e}")
@@ -95,13 +181,77 @@ class CPU:
 
         print("CPU 'processing loop' dihentikan.")
 
+    def _processing_loop_batch(self):
+        """
+        Varian event-driven: CPU blok di bus sampai data datang (tanpa sleep
+        polling), lalu menguras hingga `batch_size` data per bangun.
+        Klasifikasi dan logging dijalankan sekali per batch.
+        """
+        print("CPU 'processing loop' (Batch) dimulai...")
+        while self.is_running:
+            if not self.bus or not self.logger:
+                print("CPU: Menunggu bus dan logger ditancapkan...")
+                time.sleep(1)
+                continue
+
+            batch = self.bus.get_many(self.batch_size, timeout=self.block_timeout)
+            if not batch:
+                continue
+
+            try:
+                self._proses_batch(batch)
+            except Exception as e:
+                print(f"ERROR: CPU gagal memproses batch log: {e}")
+
+        print("CPU 'processing loop' dihentikan.")
+
+    def _proses_batch(self, batch):
+        metrics = self.metrics
+        if metrics:
+            t_ambil = time.perf_counter_ns()
+            metrics.catat_banyak('antre', [t_ambil - data.t_antre for data in batch])
+
+        # Klasifikasi + statistik seluruh batch dalam satu lintasan
+        suhu = [data.suhu for data in batch]
+        hasil = klasifikasi_batch(suhu, [data.sensor_idx for data in batch],
+                                  self.status_terakhir)
+        self.statistik_batch = hasil.statistik
+        self.jumlah_crossing += len(hasil.crossing)
+
+        # Waktu pembacaan dari sensor ikut sampai ke log (bukan waktu tulis)
+        if self.kolom_analitik:
+            rows = [(data.id, nilai, NAMA_STATUS[kode], data.waktu_ns, data.get('analitik'))
+                    for data, nilai, kode in zip(batch, suhu, hasil.kode)]
+        else:
+            rows = [(data.id, nilai, NAMA_STATUS[kode], data.waktu_ns)
+                    for data, nilai, kode in zip(batch, suhu, hasil.kode)]
+        if metrics:
+            t_status = time.perf_counter_ns()
+            metrics.catat('klasifikasi', t_status - t_ambil)
+
+        self.logger.writeRows(rows)
+        if self.rollup:
+            self.rollup.update_rows(rows)
+        if metrics:
+            t_log = time.perf_counter_ns()
+            metrics.catat('log', t_log - t_status)
+            metrics.catat_banyak('total', [t_log - data.t_emit for data in batch])
+
+        for id_sensor, suhu, status, *_ in rows:
+            self._cetak_status(id_sensor, suhu, status)
+        if self.output:
+            self.output.hitung(len(rows))
+        if metrics:
+            metrics.catat('konsol', time.perf_counter_ns() - t_log)
+
     def run(self):
         if self.is_running:
             print("CPU sudah berjalan.")
             return
         
         self.is_running = True
-        self._thread = threading.Thread(target=self._processing_loop, daemon=True)
+        target = self._processing_loop_batch if self.mode == 'batch' else self._processing_loop
+        self._thread = threading.Thread(target=target, daemon=True)
         self._thread.start()
 
     def stop(self):
@@ -109,4 +259,64 @@ class CPU:
         self.is_running = False
         if self._thread:
             self._thread.join(timeout=1.0)
-        print("CPU dihentikan.")
\ No newline at end of file
+        print("CPU dihentikan.")
+
+
+class CPUPool:
+    """
+    Kumpulan K worker CPU. DataBus mempartisi data per id sensor (hash shard),
+    dan worker ke-i hanya mengonsumsi shard ke-i, sehingga pembacaan satu
+    sensor tetap diproses berurutan. Semua worker berbagi satu Logger
+    (thread-safe; pakai LOG_MODE 'batch' untuk group-commit).
+    Siklus hidupnya sama dengan CPU: attach_bus/attach_logger/run/stop.
+    """
+
+    def __init__(self, jumlah_worker: int = config.CPU_WORKERS):
+        print(f'Inisialisasi CPU pool ({jumlah_worker} worker)')
+        self.workers = [CPU(nama=f'CPU-{i}') for i in range(max(1, jumlah_worker))]
+
+    @property
+    def is_running(self):
+        return any(worker.is_running for worker in self.workers)
+
+    def attach_bus(self, bus: 'DataBus'):
+        for i, worker in enumerate(self.workers):
+            worker.attach_bus(bus.shard(i))
+
+    def attach_logger(self, logger: 'Logger'):
+        for worker in self.workers:
+            worker.attach_logger(logger)
+
+    def attach_analytics(self, analytics: 'StreamingAnalytics'):
+        for worker in self.workers:
+            worker.attach_analytics(analytics)
+
+    def attach_alert_manager(self, alert_manager: 'AlertManager'):
+        for worker in self.workers:
+            worker.attach_alert_manager(alert_manager)
+
+    def attach_output(self, output: 'OutputSink'):
+        for worker in self.workers:
+            worker.attach_output(output)
+
+    def attach_rollup(self, rollup: 'RollupStore'):
+        for worker in self.workers:
+            worker.attach_rollup(rollup)
+
+    def attach_metrics(self, metrics: 'Metrics'):
+        for worker in self.workers:
+            worker.attach_metrics(metrics)
+
+    def handle_interrupt(self, alert_data: Dict[str, Any]):
+        self.workers[0].handle_interrupt(alert_data)
+
+    def run(self):
+        for worker in self.workers:
+            worker.run()
+
+    def stop(self):
+        # Hentikan semua worker dulu, baru tunggu satu per satu
+        for worker in self.workers:
+            worker.is_running = False
+        for worker in self.workers:
+            worker.stop()
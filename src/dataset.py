@@ -0,0 +1,217 @@
+# src/dataset.py
+"""
+Cache dataset suhu input yang dipakai bersama oleh semua sensor.
+
+File CSV diparse SEKALI per proses (kunci: path + mtime + ukuran) menjadi
+array double, lalu disimpan sebagai sidecar biner `<file>.f64` dan dibuka
+lewat mmap. Setiap sensor hanya menerima memoryview (zero-copy) dan memakai
+cursor-nya sendiri (`index_file`), sehingga 1.000 sensor tetap berbagi satu
+salinan data.
+
+Untuk file replay berukuran gigabyte tersedia StreamingDataset: CSV dibaca
+per-chunk dengan memori terbatas, dan chunk berikutnya di-prefetch oleh
+thread latar.
+"""
+
+import array
+import csv
+import mmap
+import os
+import queue
+import struct
+import threading
+import config
+
+SIDECAR_EXT = '.f64'
+
+# Header sidecar: magic, mtime_ns file sumber, ukuran file sumber (24 byte,
+# kelipatan 8 agar data double di belakangnya tetap rata)
+_MAGIC = b'SUHUF64\x00'
+_HEADER = struct.Struct('<8sqq')
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def muat_dataset(path: str, kolom: str = 'suhu') -> memoryview:
+    """
+    Kembalikan view read-only berisi nilai `kolom` dari CSV di `path`.
+    Melempar FileNotFoundError jika file tidak ada.
+    """
+    path = os.path.abspath(path)
+    info = os.stat(path)
+    kunci = (info.st_mtime_ns, info.st_size)
+
+    with _lock:
+        entri = _cache.get(path)
+        if entri and entri[0] == kunci:
+            return entri[1]
+
+        view = _buka_sidecar(path, kunci)
+        if view is None:
+            data = _parse_csv(path, kolom)
+            view = _tulis_sidecar(path, kunci, data)
+            if view is None:
+                # Direktori read-only dsb: tetap satu salinan, tapi di heap
+                view = memoryview(data)
+
+        _cache[path] = (kunci, view)
+        return view
+
+
+def hapus_cache():
+    """Lupakan semua dataset yang sudah dimuat (mis. untuk pengujian)."""
+    with _lock:
+        _cache.clear()
+
+
+def _parse_csv(path: str, kolom: str) -> array.array:
+    data = array.array('d')
+    with open(path, 'r', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if not header or kolom not in header:
+            return data
+        idx = header.index(kolom)
+
+        tambah = data.append
+        for row in reader:
+            try:
+                tambah(float(row[idx]))
+            except (ValueError, IndexError):
+                pass
+    return data
+
+
+def _buka_sidecar(path: str, kunci) -> memoryview | None:
+    sidecar = path + SIDECAR_EXT
+    try:
+        with open(sidecar, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            magic, mtime_ns, ukuran = _HEADER.unpack(header)
+            if magic != _MAGIC or (mtime_ns, ukuran) != kunci:
+                return None
+            if (os.fstat(f.fileno()).st_size - _HEADER.size) % 8:
+                return None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    return memoryview(mm)[_HEADER.size:].cast('d')
+
+
+def _tulis_sidecar(path: str, kunci, data: array.array) -> memoryview | None:
+    sidecar = path + SIDECAR_EXT
+    sementara = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        with open(sementara, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, *kunci))
+            data.tofile(f)
+        os.replace(sementara, sidecar)
+    except OSError:
+        try:
+            os.remove(sementara)
+        except OSError:
+            pass
+        return None
+    return _buka_sidecar(path, kunci)
+
+
+class StreamingDataset:
+    """
+    Sumber data streaming: generator membaca `ukuran_chunk` baris per chunk,
+    thread latar menyiapkan hingga `prefetch` chunk di depan pembaca.
+    Memori terpakai ~ (prefetch + 1) * ukuran_chunk nilai, berapapun besar file.
+    """
+
+    def __init__(self, path: str, kolom: str = 'suhu',
+                 ukuran_chunk: int = config.STREAM_CHUNK_ROWS,
+                 prefetch: int = config.STREAM_PREFETCH):
+        # Dibuka di sini agar FileNotFoundError langsung sampai ke pemanggil
+        self._file = open(path, 'r', newline='')
+        self.path = path
+        self.kolom = kolom
+        self.ukuran_chunk = max(1, ukuran_chunk)
+
+        self._antrean = queue.Queue(maxsize=max(1, prefetch))
+        self._stop = threading.Event()
+        self._chunk = array.array('d')
+        self._posisi = 0
+        self._habis = False
+
+        self._thread = threading.Thread(target=self._produsen, daemon=True)
+        self._thread.start()
+
+    def _baca_chunk(self):
+        reader = csv.reader(self._file)
+        header = next(reader, None)
+        if not header or self.kolom not in header:
+            return
+        idx = header.index(self.kolom)
+
+        chunk = array.array('d')
+        for row in reader:
+            try:
+                chunk.append(float(row[idx]))
+            except (ValueError, IndexError):
+                continue
+            if len(chunk) >= self.ukuran_chunk:
+                yield chunk
+                chunk = array.array('d')
+        if chunk:
+            yield chunk
+
+    def _produsen(self):
+        try:
+            for chunk in self._baca_chunk():
+                while not self._stop.is_set():
+                    try:
+                        self._antrean.put(chunk, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    break
+        except Exception as e:
+            print(f"ERROR: Gagal membaca stream {self.path}: {e}")
+        finally:
+            self._file.close()
+            # Penanda akhir data
+            while True:
+                try:
+                    self._antrean.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    if self._stop.is_set():
+                        break
+
+    def _isi_chunk(self) -> bool:
+        if self._habis:
+            return False
+        chunk = self._antrean.get()
+        if chunk is None:
+            self._habis = True
+            return False
+        self._chunk = chunk
+        self._posisi = 0
+        return True
+
+    def ada_data(self) -> bool:
+        """Blok sampai chunk pertama siap; False jika file tidak berisi data."""
+        if self._posisi < len(self._chunk):
+            return True
+        return self._isi_chunk()
+
+    def berikutnya(self) -> float | None:
+        """Nilai berikutnya, atau None jika data sudah habis."""
+        if self._posisi >= len(self._chunk) and not self._isi_chunk():
+            return None
+        nilai = self._chunk[self._posisi]
+        self._posisi += 1
+        return nilai
+
+    def tutup(self):
+        self._stop.set()
+        self._habis = True
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,73 @@
+# src/decimasi.py
+"""
+Decimasi min/max (M4) inkremental untuk riwayat visualizer yang panjang.
+
+Sumbu waktu dibagi menjadi kolom selebar `lebar` detik (kira-kira satu
+piksel layar). Dari setiap kolom hanya disimpan titik pertama, minimum,
+maksimum dan terakhir, urut waktu. Garis yang digambar dari titik-titik ini
+identik secara visual dengan data mentah pada resolusi tersebut, dan puncak
+demam maupun lembah hipotermia tidak pernah hilang (berbeda dengan LTTB
+atau rata-rata yang bisa melewatkan ekstrem).
+
+Pembaruan O(1) per pembacaan: `tambah()` hanya memperbarui kolom terbuka
+dan mengembalikan titik kolom yang baru ditutup (biasanya kosong), jadi
+pemanggil cukup menambahkan titik itu ke ring buffer-nya. Jumlah titik
+yang digambar bergantung pada jumlah kolom (lebar layar), bukan panjang
+riwayat.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+Titik = Tuple[float, float, bool]
+
+
+class DecimasiM4:
+    __slots__ = ('lebar', '_kolom', '_n', '_pertama', '_terakhir', '_min', '_max', '_demam')
+
+    def __init__(self, lebar: float):
+        if lebar <= 0:
+            raise ValueError(f"Lebar kolom decimasi harus > 0: {lebar}")
+        self.lebar = lebar
+        self._kolom = None
+        self._n = 0
+        self._pertama = self._terakhir = self._min = self._max = None
+        self._demam = False
+
+    def tambah(self, waktu: float, suhu: float, demam: bool = False) -> List[Titik]:
+        """Masukkan satu pembacaan; kembalikan titik kolom yang ditutup (jika ada)."""
+        titik = (waktu, suhu, demam)
+        kolom = math.floor(waktu / self.lebar)
+        if self._n and kolom <= self._kolom:
+            # Pembacaan terlambat (kolom < kolom terbuka) ikut kolom terbuka
+            self._terakhir = titik
+            if suhu < self._min[1]:
+                self._min = titik
+            if suhu > self._max[1]:
+                self._max = titik
+            self._demam = self._demam or demam
+            self._n += 1
+            return []
+
+        ditutup = self._titik() if self._n else []
+        self._kolom = kolom
+        self._pertama = self._terakhir = self._min = self._max = titik
+        self._demam = demam
+        self._n = 1
+        return ditutup
+
+    def _titik(self) -> List[Titik]:
+        unik = {id(t): t for t in (self._pertama, self._min, self._max, self._terakhir)}
+        hasil = sorted(unik.values(), key=lambda t: t[0])
+        if self._demam and not any(t[2] for t in hasil):
+            # Pembacaan demam di kolom ini tidak terpilih: tandai titik maksimumnya
+            hasil = [(t[0], t[1], True) if t is self._max else t for t in hasil]
+        return hasil
+
+    def terbuka(self) -> List[Titik]:
+        """Titik kolom yang masih terbuka (untuk digambar setelah titik tertutup)."""
+        return self._titik() if self._n else []
+
+    @property
+    def terakhir(self) -> Optional[Titik]:
+        return self._terakhir
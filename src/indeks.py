@@ -0,0 +1,199 @@
+# src/indeks.py
+"""
+Indeks jarang (sparse) untuk file log: rentang byte per bucket waktu per sensor.
+
+Sidecar `<file log>.idx` berisi header lalu rekaman lebar tetap yang
+tersusun menurut bucket waktu:
+
+    bucket (epoch detik awal) | hash sensor (crc32) | kode sensor | awal | akhir
+
+`awal`/`akhir` adalah offset byte batch-batch log yang memuat baris sensor
+tersebut pada bucket itu. Karena urut bucket, pembaca cukup binary search ke
+bucket awal lalu membaca rekaman sampai bucket akhir, jadi biaya kueri
+bergantung pada rentang yang diminta, bukan ukuran total log. Hash sensor
+bisa bertabrakan; pembaca selalu menyaring ulang baris menurut id aslinya.
+
+Bucket ditahan satu bucket di belakang bucket terbaru sebelum ditulis, agar
+batch dari worker CPU yang sedikit terlambat tetap masuk bucket yang benar.
+Batch yang datang lebih terlambat lagi (bucket-nya sudah ditulis) tetap
+diindeks di bucket aslinya sebagai rekaman di luar urutan. Saat indeks
+ditutup, rekaman diurutkan ulang; pembaca yang membuka indeks yang belum
+urut (run masih berjalan) mengurutkannya di memori.
+"""
+
+import array
+import mmap
+import os
+import struct
+import sys
+import zlib
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+MAGIC = b'SUHUIDX\x00'
+HEADER = struct.Struct('<8sq')
+# bucket, hash sensor, kode sensor (log biner; 0xFFFFFFFF untuk CSV), awal, akhir
+REKAM = struct.Struct('<qIIQQ')
+TANPA_KODE = 0xFFFFFFFF
+
+
+def path_indeks(path_log: str) -> str:
+    return path_log + '.idx'
+
+
+def hash_sensor(id_sensor: str) -> int:
+    return zlib.crc32(id_sensor.encode('utf-8'))
+
+
+class PenulisIndeks:
+    def __init__(self, path_log: str, ukuran_bucket: int, lanjut: bool = False):
+        self.path = path_indeks(path_log)
+        self.ukuran_bucket = max(1, int(ukuran_bucket))
+        self._hash: Dict[str, int] = {}
+        # bucket -> {id_sensor: [kode, awal, akhir]}
+        self._terbuka: Dict[int, Dict[str, list]] = {}
+        self._batas_tulis = None
+        self.jumlah_telat = 0
+
+        if lanjut and os.path.exists(self.path):
+            self._file = open(self.path, 'ab')
+        else:
+            self._file = open(self.path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, self.ukuran_bucket))
+
+    def catat_batch(self, detik_min: float, detik_max: float, sensor: Dict[str, int],
+                    awal: int, akhir: int):
+        """Catat satu batch log (`sensor`: id -> kode) yang menempati byte [awal, akhir)."""
+        ukuran = self.ukuran_bucket
+        bucket_awal = int(detik_min // ukuran) * ukuran
+        bucket_akhir = int(detik_max // ukuran) * ukuran
+        if self._batas_tulis is not None and bucket_awal < self._batas_tulis:
+            # Bucket lama sudah ditulis: rekaman bucket aslinya langsung
+            # ditulis di luar urutan, sisanya masuk bucket terbuka
+            telat_akhir = min(bucket_akhir, self._batas_tulis - ukuran)
+            self._tulis({bucket: {id_sensor: [kode, awal, akhir] for id_sensor, kode in sensor.items()}
+                         for bucket in range(bucket_awal, telat_akhir + 1, ukuran)})
+            self.jumlah_telat += 1
+            bucket_awal = telat_akhir + ukuran
+
+        for bucket in range(bucket_awal, bucket_akhir + 1, ukuran):
+            entri = self._terbuka.get(bucket)
+            if entri is None:
+                entri = self._terbuka[bucket] = {}
+            for id_sensor, kode in sensor.items():
+                rentang = entri.get(id_sensor)
+                if rentang is None:
+                    entri[id_sensor] = [kode, awal, akhir]
+                else:
+                    rentang[2] = akhir
+
+        self._tulis_sampai(bucket_akhir - ukuran)
+
+    def _tulis(self, per_bucket: Dict[int, Dict[str, list]]):
+        data = bytearray()
+        for bucket in sorted(per_bucket):
+            for id_sensor, (kode, awal, akhir) in per_bucket[bucket].items():
+                h = self._hash.get(id_sensor)
+                if h is None:
+                    h = self._hash[id_sensor] = hash_sensor(id_sensor)
+                data += REKAM.pack(bucket, h, kode, awal, akhir)
+        self._file.write(data)
+        self._file.flush()
+
+    def _tulis_sampai(self, batas: int):
+        siap = sorted(b for b in self._terbuka if b < batas)
+        if not siap:
+            return
+        self._tulis({bucket: self._terbuka.pop(bucket) for bucket in siap})
+        self._batas_tulis = siap[-1] + self.ukuran_bucket
+
+    def _urutkan_file(self):
+        # Urutkan ulang rekaman menurut bucket (stabil), ganti file secara atomik
+        with open(self.path, 'rb') as file:
+            header = file.read(HEADER.size)
+            isi = file.read()
+        rekam = [isi[i:i + REKAM.size] for i in range(0, len(isi) - len(isi) % REKAM.size, REKAM.size)]
+        rekam.sort(key=lambda r: REKAM.unpack_from(r)[0])
+        sementara = self.path + '.tmp'
+        with open(sementara, 'wb') as file:
+            file.write(header)
+            file.write(b''.join(rekam))
+        os.replace(sementara, self.path)
+
+    def tutup(self):
+        self._tulis_sampai(float('inf'))
+        self._file.close()
+        if self.jumlah_telat:
+            self._urutkan_file()
+
+
+class IndeksLog:
+    """Pembaca sidecar indeks (mmap + binary search menurut bucket)."""
+
+    def __init__(self, path_log: str):
+        self.path = path_indeks(path_log)
+        with open(self.path, 'rb') as file:
+            ukuran = os.fstat(file.fileno()).st_size
+            if ukuran < HEADER.size:
+                raise ValueError(f"Indeks tidak valid: {self.path}")
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.ukuran_bucket = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Indeks tidak valid: {self.path}")
+        self.jumlah = (len(self._mm) - HEADER.size) // REKAM.size
+
+        # Kolom bucket (int64 pertama tiap rekaman). Indeks yang masih ditulis
+        # bisa memuat rekaman di luar urutan; urutan baca lalu dibuat di memori
+        kolom = array.array('q', self._mm[HEADER.size:HEADER.size + self.jumlah * REKAM.size])
+        if sys.byteorder != 'little':
+            kolom.byteswap()
+        self._bucket = kolom[::REKAM.size // kolom.itemsize]
+        self._urutan = None
+        if any(a > b for a, b in zip(self._bucket, self._bucket[1:])):
+            self._urutan = sorted(range(self.jumlah), key=self._bucket.__getitem__)
+            self._bucket = array.array('q', (self._bucket[i] for i in self._urutan))
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _rekam(self, i: int) -> Tuple[int, int, int, int, int]:
+        # `i` = posisi dalam urutan bucket
+        if self._urutan is not None:
+            i = self._urutan[i]
+        return REKAM.unpack_from(self._mm, HEADER.size + i * REKAM.size)
+
+    def rentang(self, id_sensor: Optional[str] = None, dari: Optional[float] = None,
+                sampai: Optional[float] = None) -> List[Tuple[int, int, int]]:
+        """
+        Rentang byte [(awal, akhir, kode)] yang mungkin memuat baris
+        `id_sensor` pada [dari, sampai] (epoch detik), urut dan digabung.
+        """
+        kiri = 0
+        if dari is not None:
+            kiri = bisect_left(self._bucket, int(dari // self.ukuran_bucket) * self.ukuran_bucket)
+        h = hash_sensor(id_sensor) if id_sensor is not None else None
+
+        hasil = []
+        for i in range(kiri, self.jumlah):
+            bucket, h_rekam, kode, awal, akhir = self._rekam(i)
+            if sampai is not None and bucket > sampai:
+                break
+            if h is not None and h_rekam != h:
+                continue
+            hasil.append((awal, akhir, kode))
+
+        # Gabungkan rentang yang bersinggungan (banyak sensor berbagi batch)
+        hasil.sort()
+        gabung: List[list] = []
+        for awal, akhir, kode in hasil:
+            if gabung and awal <= gabung[-1][1]:
+                gabung[-1][1] = max(gabung[-1][1], akhir)
+            else:
+                gabung.append([awal, akhir, kode])
+        return [tuple(r) for r in gabung]
@@ -0,0 +1,376 @@
+# src/ingest_server.py
+"""
+Server ingest jaringan (asyncio, UDP + TCP) sebagai sumber data DataBus.
+
+Perangkat bedside mengirim pembacaan ke satu port (TCP dan UDP). Semua
+koneksi dilayani oleh satu event loop di satu thread, tanpa thread per
+koneksi. Dua format framing didukung:
+
+- teks  : satu pembacaan per baris `id,suhu[,waktu]\\n` (waktu = epoch
+          detik, boleh berpecahan; kosong = waktu terima server)
+- biner : diawali magic b'SUHB' (sekali per koneksi TCP, atau di awal
+          setiap datagram UDP) lalu rekaman '<Ifq' berurutan:
+          id perangkat u32, suhu f32, waktu epoch ns i64 (0 = waktu terima)
+
+Id perangkat dipetakan ke id sensor lewat INGEST_PETA_SENSOR (id teks atau
+angka -> id sensor); perangkat yang tidak terdaftar memakai id-nya sendiri
+(angka menjadi 'Perangkat-<n>').
+
+Event loop tidak pernah memanggil DataBus langsung: potongan data diserahkan
+ke satu thread penerus lewat antrean tanpa blok, dan callback bus (yang bisa
+menunggu saat BUS_POLICY 'block' dan antrean bus penuh) berjalan di thread
+itu. Bila INGEST_MAKS_TERTUNDA potongan masih menunggu, semua koneksi TCP
+berhenti dibaca (backpressure TCP sampai ke perangkat) dan datagram UDP
+dibuang (dihitung di `dibuang`) sampai antrean tinggal separuh.
+
+Perintah teks `STATS` membalas satu baris JSON berisi jumlah pembacaan,
+koneksi, error dan latensi ingest (waktu selesai diteruskan ke bus dikurangi
+waktu kirim perangkat; hanya bermakna bila jam perangkat = jam server,
+mis. loopback). `RESET` mengosongkan sampel latensi.
+
+Standalone (sink penghitung, tanpa pipeline) untuk benchmark/loadgen.py:
+
+    python -m src.ingest_server --port 9750
+"""
+
+import argparse
+import array
+import asyncio
+import json
+import queue
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+import config
+from src.clock import get_clock
+from src.reading import Reading
+from src.replay import SensorVirtual
+
+MAGIC_BINER = b'SUHB'
+REKAM = struct.Struct('<Ifq')
+# Baris teks tanpa '\n' yang lebih panjang dari ini dianggap rusak
+MAKS_BARIS = 4096
+SAMPEL_LATENSI = 65536
+
+
+class StatistikIngest:
+    def __init__(self):
+        self.diterima = 0
+        self.error = 0
+        self.dibuang = 0
+        self.koneksi = 0
+        self.mulai = time.monotonic()
+        self._latensi = array.array('q', bytes(8 * SAMPEL_LATENSI))
+        self._n_latensi = 0
+
+    def catat_latensi(self, ns: int):
+        self._latensi[self._n_latensi % SAMPEL_LATENSI] = ns
+        self._n_latensi += 1
+
+    def reset_latensi(self):
+        self._n_latensi = 0
+
+    def as_dict(self) -> dict:
+        n = min(self._n_latensi, SAMPEL_LATENSI)
+        sampel = sorted(self._latensi[:n])
+
+        def persentil(p):
+            return sampel[min(n - 1, int(p * n))] / 1_000_000 if n else None
+
+        return {
+            'diterima': self.diterima,
+            'error': self.error,
+            'dibuang': self.dibuang,
+            'koneksi': self.koneksi,
+            'uptime': round(time.monotonic() - self.mulai, 3),
+            'sampel_latensi': n,
+            'latensi_ms': {'p50': persentil(0.50), 'p99': persentil(0.99),
+                           'maks': sampel[-1] / 1_000_000 if n else None},
+        }
+
+
+class _ProtokolTCP(asyncio.Protocol):
+    def __init__(self, server: 'IngestServer'):
+        self.server = server
+        self.transport = None
+        self.sisa = b''
+        self.biner = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.stat.koneksi += 1
+        self.server.tambah_tcp(transport)
+
+    def connection_lost(self, exc):
+        self.server.stat.koneksi -= 1
+        self.server.hapus_tcp(self.transport)
+
+    def data_received(self, data: bytes):
+        buf = self.sisa + data if self.sisa else data
+        if self.biner is None:
+            if len(buf) < len(MAGIC_BINER):
+                self.sisa = buf
+                return
+            # Format ditentukan sekali dari awal koneksi
+            self.biner = buf.startswith(MAGIC_BINER)
+            if self.biner:
+                buf = buf[len(MAGIC_BINER):]
+
+        if self.biner:
+            n = len(buf) - len(buf) % REKAM.size
+            self.server.terima_biner(buf[:n])
+            self.sisa = buf[n:]
+            return
+
+        akhir = buf.rfind(b'\n')
+        if akhir < 0:
+            if len(buf) > MAKS_BARIS:
+                self.server.stat.error += 1
+                buf = b''
+            self.sisa = buf
+            return
+        balasan = self.server.terima_teks(buf[:akhir])
+        if balasan:
+            self.transport.write(balasan)
+        self.sisa = buf[akhir + 1:]
+
+
+class _ProtokolUDP(asyncio.DatagramProtocol):
+    def __init__(self, server: 'IngestServer'):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        if data.startswith(MAGIC_BINER):
+            data = data[len(MAGIC_BINER):]
+            n = len(data) - len(data) % REKAM.size
+            if n != len(data):
+                self.server.stat.error += 1
+            self.server.terima_biner(data[:n], udp=True)
+            return
+        balasan = self.server.terima_teks(data, udp=True)
+        if balasan:
+            self.transport.sendto(balasan, addr)
+
+
+class IngestServer:
+    """
+    Sumber data jaringan. Antarmukanya sama dengan TempSensor (`id`,
+    `is_active`, `mulai_monitoring`, `stop_monitoring`) sehingga bisa
+    didaftarkan ke DataBus seperti sensor biasa.
+    """
+
+    def __init__(self, host: str = config.INGEST_HOST, port_tcp: int = config.INGEST_PORT_TCP,
+                 port_udp: int = config.INGEST_PORT_UDP, peta_sensor: Optional[dict] = None):
+        self.host = host
+        self.port_tcp = port_tcp
+        self.port_udp = port_udp
+        self.peta_sensor = config.INGEST_PETA_SENSOR if peta_sensor is None else peta_sensor
+        self.id = f'Ingest jaringan ({host} tcp:{port_tcp} udp:{port_udp})'
+        self.sensor: Dict[object, SensorVirtual] = {}
+        self.jumlah_data = 0
+        self.is_active = False
+        self.on_data_callback = None
+        self.stat = StatistikIngest()
+        self.maks_tertunda = config.INGEST_MAKS_TERTUNDA
+
+        # Potongan data dari event loop menuju thread penerus (callback bus)
+        self._antrean = queue.SimpleQueue()
+        self._penerus = None
+        self._tcp = set()
+        self._dijeda = False
+
+        self._thread = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._berhenti: Optional[asyncio.Event] = None
+        self._siap = threading.Event()
+
+    def _sensor_untuk(self, perangkat) -> SensorVirtual:
+        sensor = self.sensor.get(perangkat)
+        if sensor is None:
+            id_baris = self.peta_sensor.get(perangkat)
+            if id_baris is None:
+                id_baris = f'Perangkat-{perangkat}' if isinstance(perangkat, int) else perangkat
+            sensor = self.sensor[perangkat] = SensorVirtual(id_baris)
+        return sensor
+
+    def tambah_tcp(self, transport):
+        self._tcp.add(transport)
+        if self._dijeda:
+            transport.pause_reading()
+
+    def hapus_tcp(self, transport):
+        self._tcp.discard(transport)
+
+    def _atur_jeda(self, jeda: bool):
+        # Dipanggil di thread event loop
+        if self._dijeda == jeda:
+            return
+        self._dijeda = jeda
+        for transport in self._tcp:
+            if jeda:
+                transport.pause_reading()
+            else:
+                transport.resume_reading()
+
+    def _kirim(self, daftar, udp: bool = False):
+        """Serahkan potongan data ke thread penerus tanpa menunggu bus."""
+        if self._dijeda and udp:
+            # UDP tidak punya flow control: selama jeda, datagram dibuang
+            self.stat.dibuang += len(daftar)
+            return
+        self._antrean.put(daftar)
+        if not self._dijeda and self._antrean.qsize() >= self.maks_tertunda:
+            self._atur_jeda(True)
+
+    def _looping_penerus(self):
+        while True:
+            daftar = self._antrean.get()
+            if daftar is None:
+                break
+            self._teruskan(daftar)
+            if self._dijeda and self._antrean.qsize() <= self.maks_tertunda // 2:
+                try:
+                    self._loop.call_soon_threadsafe(self._atur_jeda, False)
+                except RuntimeError:
+                    pass  # event loop sudah berhenti
+
+    def _teruskan(self, daftar):
+        """Teruskan [(perangkat, suhu, waktu_ns)] ke bus; waktu_ns 0 = waktu terima."""
+        sekarang = get_clock().waktu_ns()
+        callback = self.on_data_callback
+        for perangkat, suhu, waktu_ns in daftar:
+            sensor = self.sensor.get(perangkat) or self._sensor_untuk(perangkat)
+            sensor.jumlah_data += 1
+            sensor.suhu = suhu
+            data = Reading(waktu_ns or sekarang, sensor.id, suhu, sensor.jumlah_data, sensor.sensor_idx)
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"Error saat menjalankan callback: {e}")
+        self.jumlah_data += len(daftar)
+        self.stat.diterima += len(daftar)
+
+        # Satu pembacaan jam per potongan data: latensi = selesai - waktu kirim
+        selesai = time.time_ns()
+        for _, _, waktu_ns in daftar:
+            if waktu_ns:
+                self.stat.catat_latensi(selesai - waktu_ns)
+
+    def terima_biner(self, data: bytes, udp: bool = False):
+        if data:
+            self._kirim([(perangkat, round(suhu, 2), waktu_ns)
+                         for perangkat, suhu, waktu_ns in REKAM.iter_unpack(data)], udp)
+
+    def terima_teks(self, data: bytes, udp: bool = False) -> Optional[bytes]:
+        """Proses baris-baris teks; mengembalikan balasan perintah (jika ada)."""
+        daftar = []
+        balasan = []
+        for baris in data.split(b'\n'):
+            baris = baris.strip()
+            if not baris:
+                continue
+            if baris == b'STATS':
+                balasan.append(json.dumps(self.stat.as_dict()).encode('utf-8') + b'\n')
+                continue
+            if baris == b'RESET':
+                self.stat.reset_latensi()
+                balasan.append(b'OK\n')
+                continue
+            try:
+                bagian = baris.decode('utf-8').split(',')
+                waktu_ns = round(float(bagian[2]) * 1_000_000_000) if len(bagian) > 2 and bagian[2] else 0
+                daftar.append((bagian[0], float(bagian[1]), waktu_ns))
+            except (ValueError, IndexError, UnicodeDecodeError):
+                self.stat.error += 1
+        if daftar:
+            self._kirim(daftar, udp)
+        return b''.join(balasan) or None
+
+    async def _utama(self):
+        self._loop = asyncio.get_running_loop()
+        self._berhenti = asyncio.Event()
+        server_tcp = await self._loop.create_server(lambda: _ProtokolTCP(self),
+                                                    self.host, self.port_tcp)
+        transport_udp, _ = await self._loop.create_datagram_endpoint(
+            lambda: _ProtokolUDP(self), local_addr=(self.host, self.port_udp))
+        print(f"Ingest server mendengarkan di {self.host} (tcp:{self.port_tcp}, udp:{self.port_udp})")
+        self._siap.set()
+        try:
+            await self._berhenti.wait()
+        finally:
+            transport_udp.close()
+            server_tcp.close()
+            await server_tcp.wait_closed()
+
+    def _looping(self):
+        try:
+            asyncio.run(self._utama())
+        except OSError as e:
+            print(f"ERROR: Ingest server gagal dibuka: {e}")
+        finally:
+            self._siap.set()
+            # Potongan yang sudah diterima tetap diteruskan ke bus
+            self._antrean.put(None)
+            self._penerus.join(timeout=2.0)
+        print(f"\nINFO: Ingest server selesai: {self.jumlah_data} data dari {len(self.sensor)} perangkat.")
+        self.is_active = False
+
+    def mulai_monitoring(self, callback_function, scheduler=None):
+        # Server mengatur waktunya sendiri (event loop), jadi scheduler tidak dipakai
+        if self.is_active:
+            print('Ingest server already active')
+            return
+
+        self.on_data_callback = callback_function
+        self.is_active = True
+        self._siap.clear()
+        self._dijeda = False
+        self._penerus = threading.Thread(target=self._looping_penerus, daemon=True)
+        self._penerus.start()
+        self._thread = threading.Thread(target=self._looping, daemon=True)
+        self._thread.start()
+        self._siap.wait(5.0)
+
+    def stop_monitoring(self):
+        if self._loop is not None and self._berhenti is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._berhenti.set)
+            except RuntimeError:
+                pass  # event loop sudah berhenti
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self.is_active = False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Server ingest jaringan (sink penghitung)')
+    parser.add_argument('--host', default=config.INGEST_HOST)
+    parser.add_argument('--port', type=int, default=config.INGEST_PORT_TCP,
+                        help='port TCP dan UDP')
+    args = parser.parse_args(argv)
+
+    server = IngestServer(args.host, args.port, args.port)
+    server.mulai_monitoring(lambda data: None)
+    try:
+        terakhir, waktu = 0, time.monotonic()
+        while server.is_active:
+            time.sleep(1.0)
+            sekarang = time.monotonic()
+            laju = (server.jumlah_data - terakhir) / (sekarang - waktu)
+            if laju:
+                print(f"[Ingest] {laju:,.0f} pembacaan/s (total {server.jumlah_data:,})")
+            terakhir, waktu = server.jumlah_data, sekarang
+    except KeyboardInterrupt:
+        pass
+    server.stop_monitoring()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
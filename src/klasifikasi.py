@@ -0,0 +1,154 @@
+# src/klasifikasi.py
+"""
+Satu-satunya implementasi klasifikasi suhu (NORMAL / ALERT / HIPOTERMIA).
+
+DataBus (deteksi demam untuk interrupt) dan CPU (status log) sama-sama
+memakai modul ini, jadi keduanya tidak mungkin berbeda pendapat.
+
+`klasifikasi_batch` memproses satu batch hasil pengurasan bus sekaligus:
+kode status, statistik per sensor (jumlah/min/max/rata-rata) dan
+perpindahan status per sensor. Jika NumPy tersedia dan batch cukup besar,
+semuanya dihitung dalam satu lintasan vektor; jika tidak, dipakai loop
+Python biasa dengan hasil yang sama.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import config
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsional
+    np = None
+
+NORMAL = 0
+ALERT = 1
+HIPOTERMIA = 2
+NAMA_STATUS = ('NORMAL', 'ALERT', 'HIPOTERMIA')
+
+
+def kode_status(suhu: float) -> int:
+    if suhu > config.BATAS_DEMAM:
+        return ALERT
+    elif suhu < config.BATAS_HIPO:
+        return HIPOTERMIA
+    return NORMAL
+
+
+def status(suhu: float) -> str:
+    return NAMA_STATUS[kode_status(suhu)]
+
+
+def adalah_demam(suhu: float) -> bool:
+    return suhu > config.BATAS_DEMAM
+
+
+class HasilBatch:
+    """
+    kode      : kode status per pembacaan (urutan sama dengan input)
+    statistik : {sensor_idx: (jumlah, min, max, rata_rata)}
+    crossing  : [(posisi, sensor_idx, kode_lama, kode_baru)] urut posisi
+    """
+    __slots__ = ('kode', 'statistik', 'crossing')
+
+    def __init__(self, kode, statistik, crossing):
+        self.kode = kode
+        self.statistik = statistik
+        self.crossing = crossing
+
+    def nama_status(self) -> List[str]:
+        return [NAMA_STATUS[k] for k in self.kode]
+
+
+def klasifikasi_batch(suhu: Sequence[float], indeks: Sequence[int],
+                      status_terakhir: Optional[Dict[int, int]] = None) -> HasilBatch:
+    """
+    Klasifikasikan satu batch. `status_terakhir` (sensor_idx -> kode) dipakai
+    untuk mendeteksi perpindahan status antar-batch dan diperbarui di tempat.
+    """
+    if np is not None and len(suhu) >= config.KLASIFIKASI_NUMPY_MIN:
+        return _batch_numpy(suhu, indeks, status_terakhir)
+    return _batch_python(suhu, indeks, status_terakhir)
+
+
+def _batch_python(suhu, indeks, status_terakhir) -> HasilBatch:
+    demam, hipo = config.BATAS_DEMAM, config.BATAS_HIPO
+    terakhir = status_terakhir if status_terakhir is not None else {}
+    kode: List[int] = []
+    agregat: Dict[int, List[float]] = {}
+    crossing: List[Tuple[int, int, int, int]] = []
+
+    for posisi, (nilai, idx) in enumerate(zip(suhu, indeks)):
+        k = ALERT if nilai > demam else HIPOTERMIA if nilai < hipo else NORMAL
+        kode.append(k)
+
+        lama = terakhir.get(idx)
+        if lama is not None and lama != k:
+            crossing.append((posisi, idx, lama, k))
+        terakhir[idx] = k
+
+        a = agregat.get(idx)
+        if a is None:
+            agregat[idx] = [1, nilai, nilai, nilai]
+        else:
+            a[0] += 1
+            a[3] += nilai
+            if nilai < a[1]:
+                a[1] = nilai
+            if nilai > a[2]:
+                a[2] = nilai
+
+    statistik = {idx: (a[0], a[1], a[2], a[3] / a[0]) for idx, a in agregat.items()}
+    return HasilBatch(kode, statistik, crossing)
+
+
+def _batch_numpy(suhu, indeks, status_terakhir) -> HasilBatch:
+    nilai = np.asarray(suhu, dtype=np.float64)
+    idx = np.asarray(indeks, dtype=np.int64)
+
+    kode = np.zeros(len(nilai), dtype=np.uint8)
+    kode[nilai > config.BATAS_DEMAM] = ALERT
+    kode[nilai < config.BATAS_HIPO] = HIPOTERMIA
+
+    # Statistik per sensor: peta sensor -> 0..m-1 lalu agregasi sekaligus
+    unik, inv = np.unique(idx, return_inverse=True)
+    jumlah = np.bincount(inv)
+    total = np.bincount(inv, weights=nilai)
+    minimum = np.full(len(unik), np.inf)
+    maksimum = np.full(len(unik), -np.inf)
+    np.minimum.at(minimum, inv, nilai)
+    np.maximum.at(maksimum, inv, nilai)
+    rata = total / jumlah
+
+    # Perpindahan status: urutkan stabil per sensor, bandingkan dengan
+    # pembacaan sebelumnya dari sensor yang sama
+    urut = np.argsort(inv, kind='stable')
+    kode_urut = kode[urut].astype(np.int16)
+    inv_urut = inv[urut]
+    sebelumnya = np.empty_like(kode_urut)
+    sebelumnya[1:] = kode_urut[:-1]
+    awal_grup = np.ones(len(urut), dtype=bool)
+    awal_grup[1:] = inv_urut[1:] != inv_urut[:-1]
+
+    terakhir = status_terakhir if status_terakhir is not None else {}
+    lama_awal = np.array([terakhir.get(s, -1) for s in unik.tolist()], dtype=np.int16)
+    sebelumnya[awal_grup] = lama_awal[inv_urut[awal_grup]]
+    berubah = (sebelumnya != kode_urut) & (sebelumnya >= 0)
+
+    posisi = urut[berubah]
+    susun = np.argsort(posisi, kind='stable')
+    crossing = list(zip(posisi[susun].tolist(),
+                        unik[inv_urut[berubah][susun]].tolist(),
+                        sebelumnya[berubah][susun].tolist(),
+                        kode_urut[berubah][susun].tolist()))
+
+    # Status terakhir tiap sensor = pembacaan terakhirnya di batch ini
+    akhir_grup = np.ones(len(urut), dtype=bool)
+    akhir_grup[:-1] = inv_urut[1:] != inv_urut[:-1]
+    if status_terakhir is not None:
+        status_terakhir.update(zip(unik[inv_urut[akhir_grup]].tolist(),
+                                   kode_urut[akhir_grup].tolist()))
+
+    statistik = {s: (n, mn, mx, r) for s, n, mn, mx, r in zip(
+        unik.tolist(), jumlah.tolist(), minimum.tolist(), maksimum.tolist(), rata.tolist())}
+    return HasilBatch(kode.tolist(), statistik, crossing)
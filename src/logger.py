@@ -1,64 +1,392 @@
 # src/logger.py
 
 import csv
-from datetime import datetime
+import io
+import os
+import threading
+import time
 from pathlib import Path
 import config # Menggunakan config utama kita
+from src.clock import FormatWaktu, get_clock
+from src.rotasi import PengelolaSegmen
+from src.indeks import PenulisIndeks, TANPA_KODE
+
+# Status yang memaksa batch langsung di-commit (tidak boleh tertahan di buffer)
+STATUS_SEGERA = ('ALERT', 'HIPOTERMIA')
+
 
 class Logger: # MODIFIKASI: Nama kelas diubah ke Logger
-    def __init__(self, logLocation=config.OUTPUT_FILE): # MODIFIKASI: Baca dari config
+    def __init__(self, logLocation=config.OUTPUT_FILE, # MODIFIKASI: Baca dari config
+                 mode=config.LOG_MODE,
+                 batchSize=config.LOG_BATCH_SIZE,
+                 maxLatency=config.LOG_BATCH_MAX_LATENCY,
+                 durability=config.LOG_DURABILITY,
+                 rotasiUkuran=config.LOG_ROTASI_UKURAN,
+                 rotasiInterval=config.LOG_ROTASI_INTERVAL,
+                 kompresiSegmen=config.LOG_ROTASI_KOMPRESI,
+                 indeksBucket=config.LOG_INDEKS_BUCKET,
+                 resolusiWaktu=config.LOG_RESOLUSI_WAKTU):
         self.location = logLocation
         self.fileHandle = None
         self.writer = None
         self.ready = False
-        print(f"Logger (Sinkron) diinisialisasi. Lokasi log: {self.location}")
+
+        # Mode 'batch': baris ditampung di buffer lalu di-commit sekaligus
+        self.mode = mode
+        self.batchSize = max(1, batchSize) if mode == 'batch' else 1
+        self.maxLatency = maxLatency
+        self.durability = durability
+        # Batas tunggu baris ALERT/HIPOTERMIA (detik); 0 = commit seketika
+        self.latensiSegera = 0.0
+        self._batasSegera = None
+
+        self._buffer = io.StringIO()
+        self._bufferWriter = csv.writer(self._buffer)
+        self._pending = 0
+        self._batchStart = 0.0
+        self._cond = threading.Condition()
+        self._timerThread = None
+        self.analytics = None
+
+        # Timestamp baris berasal dari pembacaan sensor (epoch ns); teksnya
+        # dibentuk dengan awalan per detik yang di-cache
+        self._formatWaktu = FormatWaktu(resolusiWaktu)
+
+        # Rotasi segmen (0 = mati untuk ukuran maupun interval)
+        self.rotasiUkuran = rotasiUkuran
+        self.rotasiInterval = rotasiInterval
+        self.kompresiSegmen = kompresiSegmen
+        self._segmen = None
+
+        # Indeks jarang per bucket waktu per sensor (0 = mati)
+        self.indeksBucket = indeksBucket
+        self._indeks = None
+        self._offset = 0
+        self._batchWaktuMin = None
+        self._batchWaktuMax = None
+        self._batchSensor = set()
+
+        # Counter untuk memantau trade-off durability vs throughput
+        self.rowsWritten = 0
+        self.commitGagal = 0
+        self.rowsDropped = 0
+        # Baris yang boleh tertahan saat commit gagal (mis. disk penuh)
+        self.maksTertahan = max(config.LOG_MAKS_TERTAHAN, self.batchSize)
+        self.batchesWritten = 0
+        self.bytesWritten = 0
+
+        print(f"Logger ({self.mode}) diinisialisasi. Lokasi log: {self.location}")
+
+    def attach_analytics(self, analytics):
+        """Tambahkan kolom analitik (LOG_ANALYTICS) ke setiap baris log."""
+        print('Logger terhubung ke analitik streaming.')
+        self.analytics = analytics
+
+    def _pakaiAnalytics(self):
+        return self.analytics is not None and config.LOG_ANALYTICS
 
     def setup(self, fileMode='w') -> bool:
         try:
             Path(self.location).parent.mkdir(parents=True, exist_ok=True)
-            
-            # MODIFIKASI: Tambahkan encoding='utf-8'
-            self.fileHandle = open(self.location, fileMode, newline='', encoding='utf-8')
-            self.writer = csv.writer(self.fileHandle)
-
-            if fileMode == 'w':
-                self.writer.writerow([
-                    'waktu',
-                    'id',
-                    'suhu',
-                    'status'
-                ])
-            self.fileHandle.flush()
+
+            if self.rotasiUkuran or self.rotasiInterval:
+                # Mode rotasi: tulis ke segmen bernomor, run lama tidak ditimpa
+                self._segmen = PengelolaSegmen(self.location, self.rotasiUkuran,
+                                               self.rotasiInterval, self.kompresiSegmen,
+                                               self._teksWaktu)
+                self._bukaFile(self._segmen.buka_berikutnya().path, 'w')
+                self._bukaIndeks(self._segmen.aktif.path, 'w')
+            else:
+                self._bukaFile(self.location, fileMode)
+                self._bukaIndeks(self.location, fileMode)
             self.ready = True
+
+            if self.mode == 'batch':
+                self._timerThread = threading.Thread(target=self._timerLoop, daemon=True)
+                self._timerThread.start()
+
             print('SETUP Logger BERHASIL')
             return True
         except Exception as e:
             print(f"SETUP Logger GAGAL: {e}")
             return False
 
-    def writeData(self, id_sensor, suhu, status):
+    def _bukaFile(self, path, fileMode):
+        # MODIFIKASI: Tambahkan encoding='utf-8'
+        self.fileHandle = open(path, fileMode, newline='', encoding='utf-8')
+        self.writer = csv.writer(self.fileHandle)
+
+        if fileMode == 'w':
+            header = [
+                'waktu',
+                'id',
+                'suhu',
+                'status'
+            ]
+            if self._pakaiAnalytics():
+                header += ['rata_rata', 'std', 'ewma', 'laju_per_jam']
+            self.writer.writerow(header)
+        self.fileHandle.flush()
+
+    def _bukaIndeks(self, path, fileMode):
+        self.fileHandle.flush()
+        self._offset = os.fstat(self.fileHandle.fileno()).st_size
+        if not self.indeksBucket:
+            return
+        lanjut = fileMode == 'a'
+        if lanjut and self._offset and not os.path.exists(path + '.idx'):
+            # Isi lama tidak terindeks; indeks parsial akan menyesatkan kueri
+            print(f"Indeks log dimatikan: {path} sudah berisi data tanpa indeks.")
+            self._indeks = None
+            return
+        self._indeks = PenulisIndeks(path, self.indeksBucket, lanjut=lanjut)
+
+    def _rotasi(self):
+        # Dipanggil dengan self._cond terkunci, tepat setelah commit
+        self.fileHandle.close()
+        if self._indeks is not None:
+            self._indeks.tutup()
+        self._segmen.segel()
+        info = self._segmen.buka_berikutnya()
+        self._bukaFile(info.path, 'w')
+        self._bukaIndeks(info.path, 'w')
+        print(f"Log dirotasi ke segmen {info.nomor}: {info.path}")
+
+    def writeData(self, id_sensor, suhu, status, waktu_ns=None, analitik=None):
+        """
+        `waktu_ns`: waktu pembacaan (epoch ns); None = waktu tulis.
+        `analitik`: snapshot (rata_rata, std, ewma, laju_per_jam) saat pembacaan.
+        """
         if not self.ready:
             print("GAGAL SIMPAN DATA: Logger tidak siap.")
             return False
-            
+
         try:
-            waktu = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.writer.writerow([
-                waktu,
-                id_sensor,
-                suhu,
-                status
-            ])
-            self.fileHandle.flush()
+            if waktu_ns is None:
+                waktu_ns = get_clock().waktu_ns()
+            with self._cond:
+                self._tambahBaris(waktu_ns, id_sensor, suhu, status, analitik)
+                if self._pending >= self.batchSize:
+                    self._commit()
+                elif status in STATUS_SEGERA:
+                    self._segera()
             # Hapus "print("BERHASIL SIMPAN DATA")" agar tidak spam konsol
             return True
         except Exception as e:
             print(f"GAGAL SIMPAN DATA: {e}")
             return False
 
+    def writeRows(self, rows):
+        """
+        Tulis banyak baris (id_sensor, suhu, status[, waktu_ns[, analitik]])
+        dengan satu kali kunci. Baris tanpa waktu_ns memakai waktu tulis.
+        """
+        if not self.ready:
+            print("GAGAL SIMPAN DATA: Logger tidak siap.")
+            return False
+
+        try:
+            sekarang = None
+            with self._cond:
+                segera = False
+                for row in rows:
+                    analitik = None
+                    if len(row) > 4:
+                        id_sensor, suhu, status, waktu_ns, analitik = row
+                    elif len(row) > 3:
+                        id_sensor, suhu, status, waktu_ns = row
+                    else:
+                        id_sensor, suhu, status = row
+                        if sekarang is None:
+                            sekarang = get_clock().waktu_ns()
+                        waktu_ns = sekarang
+                    self._tambahBaris(waktu_ns, id_sensor, suhu, status, analitik)
+                    if status in STATUS_SEGERA:
+                        segera = True
+                    if self._pending >= self.batchSize:
+                        self._commit()
+                if self._pending:
+                    if self.mode != 'batch':
+                        self._commit()
+                    elif segera:
+                        self._segera()
+            return True
+        except Exception as e:
+            print(f"GAGAL SIMPAN DATA: {e}")
+            return False
+
+    def flush(self):
+        """Paksa commit semua baris yang masih tertahan di batch."""
+        with self._cond:
+            if self._pending:
+                self._commit()
+
+    def _teksWaktu(self, waktu_ns):
+        # Waktu baris -> teks untuk manifest segmen
+        return self._formatWaktu(waktu_ns)
+
+    def _detikWaktu(self, waktu_ns):
+        # Waktu baris -> epoch detik untuk bucket indeks
+        return waktu_ns / 1_000_000_000
+
+    def _kodeIndeks(self, id_sensor):
+        return TANPA_KODE
+
+    def _catatBaris(self, waktu, id_sensor):
+        # Dipanggil per baris (kunci terpegang) bila rotasi/indeks aktif
+        if self._segmen is not None:
+            self._segmen.catat(waktu, id_sensor)
+        if self._indeks is not None:
+            if self._batchWaktuMin is None or waktu < self._batchWaktuMin:
+                self._batchWaktuMin = waktu
+            if self._batchWaktuMax is None or waktu > self._batchWaktuMax:
+                self._batchWaktuMax = waktu
+            self._batchSensor.add(id_sensor)
+
+    def _tambahBaris(self, waktu_ns, id_sensor, suhu, status, analitik=None):
+        # Dipanggil dengan self._cond terkunci
+        row = [
+            self._formatWaktu(waktu_ns),
+            id_sensor,
+            suhu,
+            status
+        ]
+        if self._pakaiAnalytics():
+            # Statistik saat pembacaan (snapshot DataBus), bukan saat baris
+            # ditulis; tanpa snapshot kolomnya dikosongkan
+            if analitik is not None:
+                row += [f"{nilai:.2f}" for nilai in analitik]
+            else:
+                row += ['', '', '', '']
+        self._bufferWriter.writerow(row)
+        if self._segmen is not None or self._indeks is not None:
+            self._catatBaris(waktu_ns, id_sensor)
+        self._pending += 1
+        if self._pending == 1:
+            self._batchStart = time.monotonic()
+            self._cond.notify()
+
+    def _segera(self):
+        # Dipanggil dengan self._cond terkunci setelah baris ALERT/HIPOTERMIA:
+        # commit seketika, atau paling lambat latensiSegera detik lagi
+        if not self.latensiSegera:
+            self._commit()
+        elif self._batasSegera is None:
+            self._batasSegera = time.monotonic() + self.latensiSegera
+            self._cond.notify()
+
+    def _commit(self):
+        # Dipanggil dengan self._cond terkunci
+        baris = self._pending
+        try:
+            jumlahByte = self._tulisBatch()
+        except Exception:
+            # Batch tetap ditahan untuk dicoba lagi. Tenggat digeser satu
+            # maxLatency agar timer menunggu, bukan langsung mengulang
+            self.commitGagal += 1
+            self._batchStart = time.monotonic()
+            self._batasSegera = None
+            if self._pending >= self.maksTertahan:
+                self._buangTertahan()
+            raise
+        self._batasSegera = None
+        awal = self._offset
+        self._offset += jumlahByte
+        if self._indeks is not None and self._batchSensor:
+            self._indeks.catat_batch(self._detikWaktu(self._batchWaktuMin),
+                                     self._detikWaktu(self._batchWaktuMax),
+                                     {id_sensor: self._kodeIndeks(id_sensor)
+                                      for id_sensor in self._batchSensor},
+                                     awal, self._offset)
+            self._batchWaktuMin = self._batchWaktuMax = None
+            self._batchSensor = set()
+        if self._segmen is not None:
+            self._segmen.catat_commit(baris, jumlahByte)
+            if self._segmen.perlu_rotasi():
+                self._rotasi()
+
+    def _buangTertahan(self):
+        # Commit terus gagal dan batas tertahan tercapai: buang batch secara
+        # eksplisit (dihitung) daripada menumpuk di memori tanpa batas
+        print(f"GAGAL SIMPAN DATA: {self._pending} baris tertahan dibuang.")
+        self.rowsDropped += self._pending
+        self._kosongkanBuffer()
+        self._pending = 0
+        self._batchWaktuMin = self._batchWaktuMax = None
+        self._batchSensor = set()
+
+    def _kosongkanBuffer(self):
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+    def _tulisBatch(self) -> int:
+        # Tulis seluruh batch sekaligus; mengembalikan jumlah byte. Buffer
+        # baru dikosongkan setelah write berhasil
+        data = self._buffer.getvalue()
+
+        self.fileHandle.write(data)
+        if self.durability in ('flush', 'fsync'):
+            self.fileHandle.flush()
+        if self.durability == 'fsync':
+            os.fsync(self.fileHandle.fileno())
+        self._kosongkanBuffer()
+
+        jumlahByte = len(data.encode('utf-8'))
+        self.rowsWritten += self._pending
+        self.batchesWritten += 1
+        self.bytesWritten += jumlahByte
+        self._pending = 0
+        return jumlahByte
+
+    def _timerLoop(self):
+        """Commit batch yang sudah menunggu lebih lama dari maxLatency."""
+        with self._cond:
+            while self.ready:
+                if self._pending:
+                    batas = self._batchStart + self.maxLatency
+                    if self._batasSegera is not None and self._batasSegera < batas:
+                        batas = self._batasSegera
+                    sisa = batas - time.monotonic()
+                    if sisa <= 0:
+                        try:
+                            self._commit()
+                        except Exception as e:
+                            # _commit sudah menggeser tenggat batch
+                            print(f"GAGAL SIMPAN DATA: {e}")
+                        continue
+                    self._cond.wait(sisa)
+                else:
+                    self._cond.wait()
+
+    def statistik(self):
+        return {
+            'rows': self.rowsWritten,
+            'batches': self.batchesWritten,
+            'bytes': self.bytesWritten,
+            'pending': self._pending,
+            'commit_gagal': self.commitGagal,
+            'dropped': self.rowsDropped,
+        }
+
     # Fungsi penting untuk menutup file
     def close(self):
         if self.fileHandle:
             print("\nMenutup file log...")
+            with self._cond:
+                if self._pending:
+                    try:
+                        self._commit()
+                    except Exception as e:
+                        print(f"GAGAL SIMPAN DATA: {self._pending} baris tidak tertulis: {e}")
+                self.ready = False
+                self._cond.notify_all()
+            if self._timerThread:
+                self._timerThread.join(timeout=1.0)
             self.fileHandle.close()
-            self.ready = False
\ No newline at end of file
+            if self._indeks is not None:
+                self._indeks.tutup()
+            if self._segmen is not None:
+                # Segmen terakhir ikut disegel; tunggu kompresi yang tersisa
+                self._segmen.tutup()
+            print(f"Log: {self.rowsWritten} baris, {self.batchesWritten} batch, "
+                  f"{self.bytesWritten} byte ditulis.")
@@ -0,0 +1,265 @@
+# src/metrics.py
+"""
+Instrumentasi pipeline opsional: latensi per tahap, gauge antrean dan laju.
+
+Setiap pembacaan diberi cap waktu `time.perf_counter_ns()` di dua titik:
+saat callback sensor masuk ke DataBus (`t_emit`) dan tepat sebelum masuk
+antrean bus (`t_antre`). Cap waktu dibawa salinan `ReadingPipeline` yang
+dibuat DataBus (src/reading.py), jadi Reading biasa tidak membesar. CPU
+mengukur sisanya. Tahap yang dicatat:
+
+- bus         : emit -> masuk antrean (analitik, alert manager, shard, salinan)
+- antre       : masuk antrean -> diambil CPU (termasuk tunggu backpressure)
+- klasifikasi : penentuan status oleh CPU
+- log         : Logger.writeData / writeRows (commit pada LOG_MODE 'sinkron')
+- konsol      : keluaran per pembacaan (print atau OutputSink)
+- total       : emit -> log selesai
+
+bus, antre dan total dicatat per pembacaan; klasifikasi, log dan konsol per
+panggilan (satu pembacaan pada CPU_MODE 'polling', satu batch pada 'batch').
+Jumlah sampel tahap bus dan total sekaligus menjadi penghitung pembacaan
+masuk dan pembacaan ter-log.
+
+Tanpa metrics (METRICS_AKTIF = False) komponen tidak pernah membaca jam;
+biayanya hanya satu cek `if self.metrics` per pembacaan/batch.
+
+Ekspor: baris statistik periodik, file teks format Prometheus (ditulis
+atomik, cocok untuk textfile collector) dan/atau endpoint HTTP lokal
+`http://127.0.0.1:<METRICS_PORT>/metrics`.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+import config
+
+TAHAP = ('bus', 'antre', 'klasifikasi', 'log', 'konsol', 'total')
+
+# Batas atas bucket (ns): 1-2-5 dari 1 us sampai 10 s
+BATAS_BUCKET = [m * 10 ** e for e in range(3, 10) for m in (1, 2, 5)] + [10 ** 10]
+
+
+class Histogram:
+    """Histogram bucket tetap (kumulatif saat diekspor, gaya Prometheus)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket = [0] * (len(BATAS_BUCKET) + 1)
+        self.jumlah = 0
+        self.total_ns = 0
+
+    def catat(self, ns: int):
+        with self._lock:
+            self.bucket[bisect_left(BATAS_BUCKET, ns)] += 1
+            self.jumlah += 1
+            self.total_ns += ns
+
+    def catat_banyak(self, daftar_ns: List[int]):
+        with self._lock:
+            bucket = self.bucket
+            for ns in daftar_ns:
+                bucket[bisect_left(BATAS_BUCKET, ns)] += 1
+            self.jumlah += len(daftar_ns)
+            self.total_ns += sum(daftar_ns)
+
+    def salinan(self):
+        with self._lock:
+            return list(self.bucket), self.jumlah, self.total_ns
+
+
+def persentil(bucket: List[int], p: float) -> Optional[float]:
+    """Perkiraan persentil (ns) dari isi bucket, interpolasi linear dalam bucket."""
+    jumlah = sum(bucket)
+    if not jumlah:
+        return None
+    target = p * jumlah
+    kumulatif = 0
+    for i, n in enumerate(bucket):
+        if n and kumulatif + n >= target:
+            bawah = BATAS_BUCKET[i - 1] if i else 0
+            atas = BATAS_BUCKET[i] if i < len(BATAS_BUCKET) else BATAS_BUCKET[-1]
+            return bawah + (atas - bawah) * (target - kumulatif) / n
+        kumulatif += n
+    return float(BATAS_BUCKET[-1])
+
+
+def _ms(ns: Optional[float]) -> str:
+    return '-' if ns is None else f"{ns / 1_000_000:.3f}"
+
+
+class Metrics:
+    def __init__(self, interval: float = config.METRICS_INTERVAL,
+                 path_file: Optional[str] = config.METRICS_FILE,
+                 port: int = config.METRICS_PORT,
+                 sink: Optional[Callable[[str], None]] = None):
+        print('Inisialisasi metrics pipeline')
+        self.interval = interval
+        self.path_file = path_file
+        self.port = port
+        self.sink = sink or print
+
+        self.tahap: Dict[str, Histogram] = {nama: Histogram() for nama in TAHAP}
+        self._gauge: Dict[str, Callable[[], float]] = {}
+        self._sebelumnya = None
+
+        self.is_running = False
+        self._thread = None
+        self._berhenti = threading.Event()
+        self._http = None
+
+    # --- Jalur panas (dipanggil hanya bila metrics terpasang) ---
+    def catat(self, tahap: str, ns: int):
+        self.tahap[tahap].catat(ns)
+
+    def catat_banyak(self, tahap: str, daftar_ns: List[int]):
+        if daftar_ns:
+            self.tahap[tahap].catat_banyak(daftar_ns)
+
+    # --- Gauge: dibaca hanya saat ekspor ---
+    def gauge(self, nama: str, fungsi: Callable[[], float]):
+        """Daftarkan gauge (mis. kedalaman antrean) yang dibaca saat ekspor."""
+        self._gauge[nama] = fungsi
+
+    def _baca_gauge(self) -> Dict[str, float]:
+        hasil = {}
+        for nama, fungsi in self._gauge.items():
+            try:
+                hasil[nama] = fungsi()
+            except Exception as e:
+                print(f"Error membaca gauge {nama}: {e}")
+        return hasil
+
+    # --- Ekspor ---
+    def baris_statistik(self) -> str:
+        """Satu baris ringkasan sejak baris sebelumnya (laju dan p50/p99 per tahap)."""
+        sekarang = time.monotonic()
+        salinan = {nama: hist.salinan() for nama, hist in self.tahap.items()}
+        sebelumnya, self._sebelumnya = self._sebelumnya, (sekarang, salinan)
+
+        if sebelumnya is None:
+            durasi, lama = None, {}
+        else:
+            durasi, lama = sekarang - sebelumnya[0], sebelumnya[1]
+
+        bagian = []
+        for nama, (bucket, jumlah, _) in salinan.items():
+            if nama in lama:
+                # Hanya sampel dalam interval ini
+                bucket = [a - b for a, b in zip(bucket, lama[nama][0])]
+            if not any(bucket):
+                continue
+            bagian.append(f"{nama} p50 {_ms(persentil(bucket, 0.5))}/p99 {_ms(persentil(bucket, 0.99))}")
+
+        def laju(nama):
+            jumlah = salinan[nama][1] - (lama[nama][1] if nama in lama else 0)
+            return f"{jumlah / durasi:,.0f}/s" if durasi else f"{jumlah:,}"
+
+        gauge = ', '.join(f"{nama} {nilai:g}" for nama, nilai in self._baca_gauge().items())
+        return (f"[Metrics] masuk {laju('bus')}, ter-log {laju('total')} | ms: "
+                + (', '.join(bagian) or '-') + (f" | {gauge}" if gauge else ''))
+
+    def prometheus(self) -> str:
+        baris = [
+            '# HELP suhu_tahap_latensi_detik Latensi tahap pipeline monitoring suhu.',
+            '# TYPE suhu_tahap_latensi_detik histogram',
+        ]
+        for nama, hist in self.tahap.items():
+            bucket, jumlah, total_ns = hist.salinan()
+            kumulatif = 0
+            for batas, n in zip(BATAS_BUCKET, bucket):
+                kumulatif += n
+                baris.append(f'suhu_tahap_latensi_detik_bucket{{tahap="{nama}",le="{batas / 1e9:g}"}} {kumulatif}')
+            baris.append(f'suhu_tahap_latensi_detik_bucket{{tahap="{nama}",le="+Inf"}} {jumlah}')
+            baris.append(f'suhu_tahap_latensi_detik_sum{{tahap="{nama}"}} {total_ns / 1e9:.9f}')
+            baris.append(f'suhu_tahap_latensi_detik_count{{tahap="{nama}"}} {jumlah}')
+
+        baris += [
+            '# HELP suhu_pembacaan_total Pembacaan yang masuk bus dan yang selesai di-log.',
+            '# TYPE suhu_pembacaan_total counter',
+            f'suhu_pembacaan_total{{tahap="masuk"}} {self.tahap["bus"].jumlah}',
+            f'suhu_pembacaan_total{{tahap="log"}} {self.tahap["total"].jumlah}',
+            '# HELP suhu_gauge Kedalaman antrean dan gauge komponen lain.',
+            '# TYPE suhu_gauge gauge',
+        ]
+        baris += [f'suhu_gauge{{nama="{nama}"}} {nilai:g}'
+                  for nama, nilai in self._baca_gauge().items()]
+        return '\n'.join(baris) + '\n'
+
+    def tulis_file(self):
+        # Tulis ke file sementara lalu ganti, agar pembaca tidak melihat file setengah jadi
+        sementara = self.path_file + '.tmp'
+        with open(sementara, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(sementara, self.path_file)
+
+    def _mulai_http(self):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                isi = metrics.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(isi)))
+                self.end_headers()
+                self.wfile.write(isi)
+
+            def log_message(self, *args):
+                pass  # Jangan spam konsol tiap scrape
+
+        try:
+            self._http = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        except OSError as e:
+            print(f"ERROR: Endpoint metrics gagal dibuka di port {self.port}: {e}")
+            return
+        self._http.daemon_threads = True
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+        print(f"Metrics tersedia di http://127.0.0.1:{self.port}/metrics")
+
+    def _ekspor(self):
+        if self.interval > 0:
+            self.sink(self.baris_statistik())
+        if self.path_file:
+            try:
+                self.tulis_file()
+            except OSError as e:
+                print(f"Error menulis file metrics: {e}")
+
+    def _looping(self):
+        # File tetap diperbarui walau baris statistik dimatikan (interval 0)
+        jeda = self.interval if self.interval > 0 else 5.0
+        self.baris_statistik()  # titik awal laju
+        while not self._berhenti.wait(jeda):
+            self._ekspor()
+
+    def start(self):
+        if self.is_running:
+            print("Metrics sudah berjalan.")
+            return
+        self.is_running = True
+        self._berhenti.clear()
+        if self.port:
+            self._mulai_http()
+        if self.interval > 0 or self.path_file:
+            self._thread = threading.Thread(target=self._looping, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._berhenti.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        if self._http:
+            self._http.shutdown()
+            self._http.server_close()
+        # Ekspor terakhir agar file/baris mencakup seluruh run
+        self._ekspor()
@@ -0,0 +1,181 @@
+# src/output.py
+"""
+Keluaran konsol asinkron untuk jalur panas (CPU, alert).
+
+Pemanggil hanya memasukkan baris ke antrean berbatas; satu thread penulis
+menguras antrean dan menulis ke stdout dalam potongan besar, jadi stdout
+yang lambat atau dialihkan tidak lagi memperlambat pipeline. Jika antrean
+penuh, baris dibuang (dan dihitung), bukan ditunggu.
+
+Level verbositas:
+
+- 'silent'  : tidak ada keluaran per pembacaan maupun alert
+- 'alerts'  : hanya banner alert
+- 'sampled' : alert + satu dari setiap `sampel` baris normal per sensor
+- 'full'    : semua baris (tetap dibatasi `batas_per_sensor` baris/detik)
+
+Selain itu, setiap `interval_ringkasan` detik dicetak satu baris ringkasan
+("N pembacaan/s, M alert"), pengganti keluaran per pembacaan saat skala besar.
+"""
+
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import config
+
+
+class OutputSink:
+    LEVEL = ('silent', 'alerts', 'sampled', 'full')
+
+    def __init__(self, level: str = config.OUTPUT_LEVEL,
+                 sampel: int = config.OUTPUT_SAMPEL_NORMAL,
+                 batas_per_sensor: int = config.OUTPUT_BATAS_PER_SENSOR,
+                 interval_ringkasan: float = config.OUTPUT_INTERVAL_RINGKASAN,
+                 maks_antrean: int = config.OUTPUT_ANTREAN_MAKS,
+                 stream=None):
+        if level not in self.LEVEL:
+            raise ValueError(f"Level output tidak dikenal: {level}")
+        print(f'Inisialisasi output sink (level {level})')
+        self.level = level
+        self.sampel = max(1, sampel)
+        self.batas_per_sensor = batas_per_sensor
+        self.interval_ringkasan = interval_ringkasan
+        self.stream = stream or sys.stdout
+
+        self._antrean = queue.Queue(maxsize=maks_antrean)
+        self._thread = None
+        self.is_running = False
+
+        # Status per sensor: hitungan sampel dan jendela rate limit [detik, jumlah]
+        self._hitung_sampel: Dict[str, int] = {}
+        self._jendela: Dict[str, List[int]] = {}
+
+        self._lock = threading.Lock()
+        self.jumlah_pembacaan = 0
+        self.jumlah_alert = 0
+        self.jumlah_dibuang = 0
+        self._ringkasan_terakhir = (0, 0)
+
+    def hitung(self, jumlah: int = 1):
+        """Catat pembacaan yang sudah diproses (untuk baris ringkasan)."""
+        with self._lock:
+            self.jumlah_pembacaan += jumlah
+
+    def baris(self, id_sensor: str, pola: str, *args):
+        """
+        Baris per pembacaan (mis. data normal). `pola` baru di-format jika
+        baris benar-benar akan ditulis.
+        """
+        level = self.level
+        if level == 'silent' or level == 'alerts':
+            return
+
+        if level == 'sampled':
+            n = self._hitung_sampel.get(id_sensor, 0)
+            self._hitung_sampel[id_sensor] = n + 1
+            if n % self.sampel:
+                return
+
+        if self.batas_per_sensor:
+            detik = int(time.monotonic())
+            jendela = self._jendela.get(id_sensor)
+            if jendela is None or jendela[0] != detik:
+                jendela = self._jendela[id_sensor] = [detik, 0]
+            if jendela[1] >= self.batas_per_sensor:
+                return
+            jendela[1] += 1
+
+        self._masukkan(pola.format(*args))
+
+    def alert(self, teks: str):
+        """Banner alert; tidak terkena sampling maupun rate limit."""
+        with self._lock:
+            self.jumlah_alert += 1
+        if self.level != 'silent':
+            self._masukkan(teks)
+
+    def tulis(self, teks: str):
+        """Pesan umum (bukan per pembacaan); hanya disembunyikan pada 'silent'."""
+        if self.level != 'silent':
+            self._masukkan(teks)
+
+    def _masukkan(self, teks: str):
+        if not self.is_running:
+            # Sink belum/tidak berjalan: tulis langsung seperti print()
+            print(teks, file=self.stream)
+            return
+        try:
+            self._antrean.put_nowait(teks)
+        except queue.Full:
+            with self._lock:
+                self.jumlah_dibuang += 1
+
+    def _baris_ringkasan(self, durasi: float) -> str:
+        with self._lock:
+            pembacaan, alert = self.jumlah_pembacaan, self.jumlah_alert
+            dibuang = self.jumlah_dibuang
+        pembacaan_lalu, alert_lalu = self._ringkasan_terakhir
+        self._ringkasan_terakhir = (pembacaan, alert)
+        laju = (pembacaan - pembacaan_lalu) / durasi if durasi > 0 else 0.0
+        return (f"[Ringkasan] {laju:,.0f} pembacaan/s, {alert - alert_lalu} alert "
+                f"(total {pembacaan} pembacaan, {dibuang} baris dibuang)")
+
+    def _penulis(self):
+        interval = self.interval_ringkasan
+        sebelumnya = time.monotonic()
+        berhenti = False
+
+        while not berhenti:
+            timeout = None
+            if interval > 0:
+                timeout = max(0.0, sebelumnya + interval - time.monotonic())
+
+            potongan = []
+            try:
+                item = self._antrean.get(timeout=timeout)
+                if item is None:
+                    berhenti = True
+                else:
+                    potongan.append(item)
+                # Kuras sisa antrean agar ditulis dalam satu write()
+                while not berhenti and len(potongan) < 1024:
+                    item = self._antrean.get_nowait()
+                    if item is None:
+                        berhenti = True
+                    else:
+                        potongan.append(item)
+            except queue.Empty:
+                pass
+
+            sekarang = time.monotonic()
+            if interval > 0 and sekarang - sebelumnya >= interval:
+                potongan.append(self._baris_ringkasan(sekarang - sebelumnya))
+                sebelumnya = sekarang
+
+            if potongan:
+                try:
+                    self.stream.write("\n".join(potongan) + "\n")
+                    self.stream.flush()
+                except Exception as e:
+                    print(f"Error menulis output: {e}", file=sys.stderr)
+
+    def start(self):
+        if self.is_running:
+            print("Output sink sudah berjalan.")
+            return
+        self.is_running = True
+        self._thread = threading.Thread(target=self._penulis, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        # Penanda berhenti diantrekan setelah semua baris yang tersisa
+        self._antrean.put(None)
+        self._thread.join(timeout=2.0)
+        print(f"Output sink dihentikan ({self.jumlah_pembacaan} pembacaan, "
+              f"{self.jumlah_alert} alert, {self.jumlah_dibuang} baris dibuang).")
@@ -0,0 +1,253 @@
+# src/query.py
+"""
+Kueri log monitoring (CSV maupun biner, satu file maupun segmen rotasi).
+
+Urutan penyaringan:
+1. manifest segmen (jika ada): lewati segmen di luar rentang waktu atau
+   yang tidak memuat sensor yang diminta
+2. indeks sidecar `<file>.idx` (LOG_INDEKS_BUCKET > 0): baca hanya rentang
+   byte yang memuat sensor pada bucket waktu yang diminta (segmen `.gz`
+   dibaca dalam satu lintasan maju lewat aliran gzip)
+3. saring ulang per baris (id dan waktu)
+
+File tanpa indeks tetap bisa dikueri, tetapi dengan scan penuh.
+
+Contoh:
+
+    python -m src.query --sensor "Kamar-101 (File)" --dari "2025-01-01 02:00:00" --sampai "2025-01-01 03:00:00"
+    python -m src.query --agregat 900 --dari "2025-01-01 00:00:00"
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import mmap
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import config
+from src.binlog import BinLogReader, MAGIC_FILE
+from src.clock import FormatWaktu, parse_waktu
+from src.indeks import IndeksLog, TANPA_KODE, path_indeks
+from src.klasifikasi import NAMA_STATUS
+from src.rollup import StatAgregat, baca as baca_rollup, pilih_tier
+from src.rotasi import baca_manifest
+
+FORMAT_WAKTU = "%Y-%m-%d %H:%M:%S"
+
+
+def ke_detik(waktu) -> Optional[float]:
+    """datetime / teks 'YYYY-mm-dd HH:MM:SS[.fff]' / epoch -> epoch detik."""
+    if waktu is None or isinstance(waktu, (int, float)):
+        return waktu
+    if isinstance(waktu, str):
+        return parse_waktu(waktu)
+    return waktu.timestamp()
+
+
+def daftar_file(path: str, id_sensor: Optional[str] = None,
+                dari: Optional[float] = None, sampai: Optional[float] = None) -> List[str]:
+    """File log yang relevan: segmen dari manifest, atau `path` itu sendiri."""
+    entri = baca_manifest(path)
+    if not entri:
+        return [path] if os.path.exists(path) else []
+
+    folder = os.path.dirname(path)
+    hasil = []
+    for e in entri:
+        if id_sensor is not None and e['mulai'] is not None and id_sensor not in e['sensor']:
+            continue
+        # Waktu manifest bisa dibulatkan ke detik; beri kelonggaran satu detik
+        if dari is not None and e['selesai'] is not None and ke_detik(e['selesai']) + 1 <= dari:
+            continue
+        if sampai is not None and e['mulai'] is not None and ke_detik(e['mulai']) > sampai:
+            continue
+        hasil.append(os.path.join(folder, e['file']))
+    return hasil
+
+
+def _rentang(path: str, id_sensor, dari, sampai) -> Optional[List[Tuple[int, int, int]]]:
+    path_log = path[:-3] if path.endswith('.gz') else path
+    if not os.path.exists(path_indeks(path_log)):
+        return None
+    with IndeksLog(path_log) as indeks:
+        return indeks.rentang(id_sensor, dari, sampai)
+
+
+def _adalah_biner(path: str) -> bool:
+    buka = gzip.open if path.endswith('.gz') else open
+    with buka(path, 'rb') as file:
+        return file.read(len(MAGIC_FILE)) == MAGIC_FILE
+
+
+def _bagian_csv(path, rentang):
+    """Teks tiap rentang byte (atau seluruh file) untuk csv.reader."""
+    if path.endswith('.gz'):
+        # Aliran gzip tidak bisa diakses acak: rentang yang urut dibaca dalam
+        # satu lintasan maju (seek maju mendekompres dan membuang byte di
+        # antaranya), tanpa memuat seluruh segmen ke memori
+        with gzip.open(path, 'rb') as file:
+            if rentang is None:
+                yield io.TextIOWrapper(file, encoding='utf-8', newline='')
+                return
+            for awal, akhir, _ in rentang:
+                file.seek(awal)
+                yield io.StringIO(file.read(akhir - awal).decode('utf-8'), newline='')
+        return
+
+    with open(path, 'rb') as file:
+        konten = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.fstat(file.fileno()).st_size else b''
+        for awal, akhir, _ in (rentang if rentang is not None else [(0, len(konten), 0)]):
+            yield io.StringIO(konten[awal:akhir].decode('utf-8'), newline='')
+
+
+def _baris_csv(path, rentang, id_sensor, dari, sampai):
+    awalan_terakhir, detik_terakhir = None, None
+    for bagian in _bagian_csv(path, rentang):
+        for row in csv.reader(bagian):
+            if len(row) < 4 or row[0] == 'waktu':
+                continue
+            if id_sensor is not None and row[1] != id_sensor:
+                continue
+            # Parse awalan 'YYYY-mm-dd HH:MM:SS' sekali per detik; pecahan
+            # detik (LOG_RESOLUSI_WAKTU selain 's') ditambahkan terpisah
+            teks = row[0]
+            if teks[:19] != awalan_terakhir:
+                awalan_terakhir = teks[:19]
+                detik_terakhir = datetime.strptime(awalan_terakhir, FORMAT_WAKTU).timestamp()
+            detik = detik_terakhir + float(teks[19:]) if len(teks) > 19 else detik_terakhir
+            if (dari is not None and detik < dari) or \
+                    (sampai is not None and detik > sampai):
+                continue
+            yield detik, teks, row[1], float(row[2]), row[3]
+
+
+def _baris_biner(path, rentang, id_sensor, dari, sampai):
+    with BinLogReader(path) as reader:
+        if rentang is None or id_sensor is None:
+            # Kamus id lengkap perlu penelusuran header dari awal file
+            for _ in reader.blok():
+                pass
+        sensor = reader.sensor
+        bagian = rentang if rentang is not None else [(None, None, TANPA_KODE)]
+
+        ns_dari = None if dari is None else int(dari * 1_000_000_000)
+        ns_sampai = None if sampai is None else int(sampai * 1_000_000_000)
+        format_ = FormatWaktu(config.LOG_RESOLUSI_WAKTU)
+        for awal, akhir, kode_target in bagian:
+            if id_sensor is not None and kode_target == TANPA_KODE:
+                kode_target = sensor.index(id_sensor) if id_sensor in sensor else None
+                if kode_target is None:
+                    return
+            for blok in reader.blok(awal, akhir):
+                if (ns_dari is not None and blok.ns_max < ns_dari) or \
+                        (ns_sampai is not None and blok.ns_min > ns_sampai):
+                    continue
+                ns, kode, suhu, status = reader.kolom(blok)
+                for i in range(blok.n):
+                    if id_sensor is not None and kode[i] != kode_target:
+                        continue
+                    t = ns[i]
+                    if (ns_dari is not None and t < ns_dari) or \
+                            (ns_sampai is not None and t > ns_sampai):
+                        continue
+                    yield (t / 1_000_000_000, format_(t),
+                           id_sensor if id_sensor is not None else sensor[kode[i]],
+                           round(suhu[i], 3), NAMA_STATUS[status[i]])
+
+
+def _baris(path, id_sensor=None, dari=None, sampai=None):
+    dari, sampai = ke_detik(dari), ke_detik(sampai)
+    for file in daftar_file(path, id_sensor, dari, sampai):
+        rentang = _rentang(file, id_sensor, dari, sampai)
+        if rentang is not None and not rentang:
+            continue
+        baca = _baris_biner if _adalah_biner(file) else _baris_csv
+        yield from baca(file, rentang, id_sensor, dari, sampai)
+
+
+def cari(path: str = config.OUTPUT_FILE, id_sensor: Optional[str] = None,
+         dari=None, sampai=None) -> Iterator[Tuple[str, str, float, str]]:
+    """Baris log (waktu, id, suhu, status) milik `id_sensor` pada [dari, sampai]."""
+    for _, teks, id_baris, suhu, status in _baris(path, id_sensor, dari, sampai):
+        yield teks, id_baris, suhu, status
+
+
+def tier_untuk_interval(interval: float, dari: Optional[float] = None,
+                        tingkat=config.ROLLUP_TINGKAT) -> Optional[str]:
+    """
+    Tingkat rollup paling kasar yang lebarnya membagi habis `interval` dan
+    retensinya masih mencakup `dari` (lewat `pilih_tier`); None = log mentah.
+    """
+    pilihan = pilih_tier(dari=dari, resolusi=interval,
+                         tingkat=[t for t in tingkat if interval % t[1] == 0])
+    return pilihan[0] if pilihan else None
+
+
+def agregat(path: str = config.OUTPUT_FILE, id_sensor: Optional[str] = None,
+            dari=None, sampai=None, interval: float = 3600,
+            pakai_rollup: bool = False) -> Dict[Tuple[str, float], StatAgregat]:
+    """
+    Jumlah/min/max/rata-rata/jumlah ALERT per sensor per interval.
+    Kunci hasil: (id_sensor, epoch awal interval).
+
+    `pakai_rollup`: hitung dari tingkat rollup yang cocok (jauh lebih cepat,
+    tetapi hanya mencakup bucket yang sudah ditutup dan yang awalnya di
+    dalam rentang); jika tidak ada tingkat yang cocok atau retensinya tidak
+    lagi mencakup `dari`, baca log mentah.
+    """
+    hasil: Dict[Tuple[str, float], StatAgregat] = {}
+    dari, sampai = ke_detik(dari), ke_detik(sampai)
+    nama_tier = tier_untuk_interval(interval, dari) if pakai_rollup else None
+    if nama_tier is not None:
+        for (id_baris, awal), bucket in baca_rollup(path, nama_tier, id_sensor, dari, sampai).items():
+            kunci = (id_baris, awal // interval * interval)
+            stat = hasil.get(kunci)
+            if stat is None:
+                stat = hasil[kunci] = StatAgregat()
+            stat.gabung(bucket.jumlah, bucket.minimum, bucket.maksimum, bucket.total, bucket.alert)
+        return hasil
+
+    for detik, _, id_baris, suhu, status in _baris(path, id_sensor, dari, sampai):
+        kunci = (id_baris, detik // interval * interval)
+        stat = hasil.get(kunci)
+        if stat is None:
+            stat = hasil[kunci] = StatAgregat()
+        stat.tambah(suhu, status)
+    return hasil
+
+
+def main(argv=None):
+    bawaan = config.LOG_BINER_FILE if config.LOG_FORMAT == 'biner' else config.OUTPUT_FILE
+    parser = argparse.ArgumentParser(description='Kueri log monitoring suhu')
+    parser.add_argument('--log', default=bawaan, help=f'file log (bawaan: {bawaan})')
+    parser.add_argument('--sensor', help='id sensor, mis. "Kamar-101 (File)"')
+    parser.add_argument('--dari', help='waktu awal "YYYY-mm-dd HH:MM:SS"')
+    parser.add_argument('--sampai', help='waktu akhir "YYYY-mm-dd HH:MM:SS"')
+    parser.add_argument('--agregat', type=float, metavar='DETIK',
+                        help='tampilkan agregat per sensor per interval DETIK')
+    parser.add_argument('--rollup', action='store_true',
+                        help='hitung agregat dari file rollup (ROLLUP_AKTIF)')
+    args = parser.parse_args(argv)
+
+    if args.agregat:
+        hasil = agregat(args.log, args.sensor, args.dari, args.sampai, args.agregat,
+                        pakai_rollup=args.rollup)
+        print(f"{'sensor':<20}{'mulai':<21}{'jumlah':>8}{'min':>8}{'max':>8}{'rata':>8}{'alert':>7}")
+        for (id_sensor, awal), stat in sorted(hasil.items()):
+            print(f"{id_sensor:<20}{datetime.fromtimestamp(awal).strftime(FORMAT_WAKTU):<21}"
+                  f"{stat.jumlah:>8}{stat.minimum:>8.1f}{stat.maksimum:>8.1f}"
+                  f"{stat.rata_rata:>8.2f}{stat.alert:>7}")
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(['waktu', 'id', 'suhu', 'status'])
+        for baris in cari(args.log, args.sensor, args.dari, args.sampai):
+            writer.writerow(baris)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
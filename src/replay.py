@@ -0,0 +1,128 @@
+# src/replay.py
+"""
+Replay rekaman bangsal dari satu file long-format (`waktu,id,suhu`).
+
+File dibaca sekali secara streaming, setiap baris diteruskan ke sensor
+virtual sesuai kolom `id`, dan jarak antar-baris asli dipertahankan
+(dibagi `kecepatan`). Dengan kecepatan 0 data dikirim secepat mungkin,
+cocok untuk uji kapasitas DataBus/CPU/Logger.
+"""
+
+import csv
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import config
+from src.clock import get_clock
+from src.reading import Reading, indeks_sensor, id_sensor
+
+
+class SensorVirtual:
+    """Status satu sensor hasil demultiplex dari file replay."""
+    __slots__ = ('id', 'sensor_idx', 'jumlah_data', 'suhu')
+
+    def __init__(self, id: str):
+        self.sensor_idx = indeks_sensor(id)
+        self.id = id_sensor(self.sensor_idx)
+        self.jumlah_data = 0
+        self.suhu = None
+
+
+def _parse_waktu(nilai: str) -> datetime:
+    try:
+        return datetime.fromtimestamp(float(nilai))
+    except ValueError:
+        return datetime.fromisoformat(nilai)
+
+
+class ReplaySource:
+    """
+    Sumber data replay. Antarmukanya sama dengan TempSensor (`id`,
+    `is_active`, `mulai_monitoring`, `stop_monitoring`) sehingga bisa
+    didaftarkan ke DataBus seperti sensor biasa.
+    """
+
+    def __init__(self, path: str = config.REPLAY_FILE, kecepatan: float = config.REPLAY_SPEED):
+        self.path = path
+        self.kecepatan = kecepatan
+        self.id = f'Replay ({os.path.basename(path)})'
+        self.sensor: Dict[str, SensorVirtual] = {}
+        self.jumlah_data = 0
+        self.is_active = False
+        self.on_data_callback = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def _sensor_untuk(self, id_sensor: str) -> SensorVirtual:
+        sensor = self.sensor.get(id_sensor)
+        if sensor is None:
+            sensor = self.sensor[id_sensor] = SensorVirtual(id_sensor)
+        return sensor
+
+    def looping(self):
+        print(f'\n======Replay Started {self.path} (x{self.kecepatan or "maks"})======')
+
+        try:
+            with open(self.path, 'r', newline='', encoding='utf-8') as file:
+                reader = csv.DictReader(file)
+                clock = get_clock()
+                awal_data: Optional[datetime] = None
+                awal_jam = 0.0
+
+                for row in reader:
+                    if not self.is_active:
+                        break
+                    try:
+                        waktu = _parse_waktu(row['waktu'])
+                        id_baris = row['id']
+                        suhu = float(row['suhu'])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+
+                    if self.kecepatan > 0:
+                        # Pertahankan jarak antar-kedatangan asli (dipercepat)
+                        if awal_data is None:
+                            awal_data, awal_jam = waktu, clock.monotonic()
+                        target = awal_jam + (waktu - awal_data).total_seconds() / self.kecepatan
+                        if target > clock.monotonic() and clock.tunggu_sampai(target, self._stop_event):
+                            break
+
+                    sensor = self._sensor_untuk(id_baris)
+                    sensor.jumlah_data += 1
+                    sensor.suhu = suhu
+                    self.jumlah_data += 1
+
+                    data = Reading(round(waktu.timestamp() * 1_000_000_000), sensor.id, suhu, sensor.jumlah_data, sensor.sensor_idx)
+
+                    if self.on_data_callback:
+                        try:
+                            self.on_data_callback(data)
+                        except Exception as e:
+                            print(f"Error saat menjalankan callback: {e}")
+
+        except FileNotFoundError:
+            print(f"ERROR: File replay tidak ditemukan di {self.path}")
+
+        print(f"\nINFO: Replay selesai: {self.jumlah_data} data dari {len(self.sensor)} sensor.")
+        print(f'\n======Replay Stopped {self.path}======')
+        self.is_active = False
+
+    def mulai_monitoring(self, callback_function, scheduler=None):
+        # Replay mengatur waktunya sendiri, jadi scheduler tidak dipakai
+        if self.is_active:
+            print('Replay already active')
+            return
+
+        self.on_data_callback = callback_function
+        self.is_active = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.looping, daemon=True)
+        self._thread.start()
+
+    def stop_monitoring(self):
+        self.is_active = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
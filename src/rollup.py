@@ -0,0 +1,319 @@
+# src/rollup.py
+"""
+Rollup bertingkat (mis. 1 menit, 15 menit, 1 jam) untuk retensi jangka panjang.
+
+CPU memanggil `RollupStore.update_rows()` untuk setiap batch yang sudah
+diklasifikasi; bucket ditentukan dari waktu pembacaan sensor. Tiap tingkat menyimpan satu bucket terbuka per sensor
+(jumlah/min/max/total/jumlah ALERT) yang diperbarui O(1) per pembacaan.
+Saat pembacaan sensor masuk bucket berikutnya, bucket lama ditutup dan
+ditambahkan ke file tingkatnya di sebelah file log (pembacaan terlambat
+ditulis sebagai baris parsial bucket waktunya sendiri dan dihitung):
+
+    <file log>.rollup_1m.csv, <file log>.rollup_15m.csv, ...
+
+Setiap tingkat punya retensi sendiri; baris yang lebih tua dari retensi
+dibuang dengan kompaksi berkala di thread latar (file ditulis ulang paling
+sering sekali per 10% masa retensi); jalur tulis CPU hanya menambah baris.
+
+Pembaca memakai `pilih_tier()` untuk mengambil tingkat paling kasar yang
+masih memenuhi resolusi permintaan, lalu `baca()`.
+"""
+
+import csv
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import config
+from src.clock import get_clock
+
+FORMAT_WAKTU = "%Y-%m-%d %H:%M:%S"
+HEADER = ['awal', 'id', 'jumlah', 'min', 'max', 'rata_rata', 'alert']
+
+
+class StatAgregat:
+    __slots__ = ('jumlah', 'minimum', 'maksimum', 'total', 'alert')
+
+    def __init__(self):
+        self.jumlah = 0
+        self.minimum = float('inf')
+        self.maksimum = float('-inf')
+        self.total = 0.0
+        self.alert = 0
+
+    def tambah(self, suhu: float, status: str):
+        self.jumlah += 1
+        self.total += suhu
+        if suhu < self.minimum:
+            self.minimum = suhu
+        if suhu > self.maksimum:
+            self.maksimum = suhu
+        if status == 'ALERT':
+            self.alert += 1
+
+    def gabung(self, jumlah: int, minimum: float, maksimum: float, total: float, alert: int):
+        self.jumlah += jumlah
+        self.total += total
+        if minimum < self.minimum:
+            self.minimum = minimum
+        if maksimum > self.maksimum:
+            self.maksimum = maksimum
+        self.alert += alert
+
+    @property
+    def rata_rata(self) -> float:
+        return self.total / self.jumlah if self.jumlah else 0.0
+
+
+def path_tier(path_log: str, nama: str) -> str:
+    return f"{path_log}.rollup_{nama}.csv"
+
+
+class RollupTier:
+    def __init__(self, path_log: str, nama: str, lebar: int, retensi: float):
+        self.nama = nama
+        self.lebar = int(lebar)
+        self.retensi = retensi
+        self.path = path_tier(path_log, nama)
+        # id_sensor -> [awal, jumlah, min, max, total, alert]
+        self.terbuka: Dict[str, list] = {}
+        # (id_sensor, awal) -> bucket parsial pembacaan terlambat
+        self._telat: Dict[Tuple[str, int], list] = {}
+        self.jumlah_telat = 0
+        self._tertua: Optional[float] = None
+        # Melindungi file tingkat dari penulisan ulang oleh thread kompaksi
+        self._kunci = threading.Lock()
+        self._kompaktor: Optional[threading.Thread] = None
+        self._buka()
+
+    def _buka(self):
+        baru = not os.path.exists(self.path) or not os.path.getsize(self.path)
+        if not baru:
+            with open(self.path, newline='', encoding='utf-8') as file:
+                reader = csv.reader(file)
+                next(reader, None)
+                pertama = next(reader, None)
+                if pertama:
+                    self._tertua = datetime.strptime(pertama[0], FORMAT_WAKTU).timestamp()
+        self._file = open(self.path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if baru:
+            self._writer.writerow(HEADER)
+
+    def update(self, id_sensor: str, detik: float, suhu: float, alert: int) -> bool:
+        """Mengembalikan True jika ada bucket yang ditutup (perlu flush)."""
+        awal = int(detik // self.lebar) * self.lebar
+        b = self.terbuka.get(id_sensor)
+        if b is None or awal > b[0]:
+            if b is None:
+                self.terbuka[id_sensor] = [awal, 1, suhu, suhu, suhu, alert]
+                return False
+            self._tulis(id_sensor, b)
+            self._tulis_telat()
+            self.terbuka[id_sensor] = [awal, 1, suhu, suhu, suhu, alert]
+            return True
+
+        if awal < b[0]:
+            # Pembacaan terlambat: masuk bucket waktunya sendiri (yang mungkin
+            # sudah ditulis) sebagai baris parsial; pembaca menggabungkan
+            # baris dengan (awal, id) yang sama
+            self.jumlah_telat += 1
+            kunci = (id_sensor, awal)
+            b = self._telat.get(kunci)
+            if b is None:
+                self._telat[kunci] = [awal, 1, suhu, suhu, suhu, alert]
+                return False
+
+        b[1] += 1
+        b[4] += suhu
+        b[5] += alert
+        if suhu < b[2]:
+            b[2] = suhu
+        if suhu > b[3]:
+            b[3] = suhu
+        return False
+
+    def _tulis_telat(self):
+        for (id_sensor, _), b in self._telat.items():
+            self._tulis(id_sensor, b)
+        self._telat.clear()
+
+    def _tulis(self, id_sensor: str, b: list):
+        awal, jumlah, minimum, maksimum, total, alert = b
+        with self._kunci:
+            self._writer.writerow([datetime.fromtimestamp(awal).strftime(FORMAT_WAKTU), id_sensor,
+                                   jumlah, minimum, maksimum, round(total / jumlah, 3), alert])
+        if self._tertua is None:
+            self._tertua = awal
+        elif (self.retensi and awal - self._tertua > self.retensi * 1.1
+              and self._kompaktor is None):
+            # Jalur tulis hanya menambah baris; penulisan ulang file berjalan di latar
+            self._kompaktor = threading.Thread(target=self._kompaksi, args=(awal - self.retensi,),
+                                               name=f"rollup-{self.nama}", daemon=True)
+            self._kompaktor.start()
+
+    def _kompaksi(self, batas: float):
+        """
+        Tulis ulang file tanpa baris yang lebih tua dari `batas`. Bagian yang
+        sudah ada saat mulai disaring tanpa lock; hanya ekor yang ditambahkan
+        selama penyaringan disalin di bawah lock sebelum file ditukar.
+        """
+        sementara = self.path + '.tmp'
+        try:
+            with self._kunci:
+                self._file.flush()
+                ukuran = os.path.getsize(self.path)
+            tertua = self._saring(batas, ukuran, sementara)
+            with self._kunci:
+                self._file.flush()
+                with open(self.path, 'rb') as masuk, open(sementara, 'ab') as keluar:
+                    masuk.seek(ukuran)
+                    ekor = masuk.readline()
+                    if tertua is None and ekor:
+                        tertua = ekor.split(b',', 1)[0].decode()
+                    keluar.write(ekor)
+                    shutil.copyfileobj(masuk, keluar)
+                self._file.close()
+                os.replace(sementara, self.path)
+                self._file = open(self.path, 'a', newline='', encoding='utf-8')
+                self._writer = csv.writer(self._file)
+            self._tertua = datetime.strptime(tertua, FORMAT_WAKTU).timestamp() if tertua else None
+        except (OSError, ValueError) as e:
+            print(f"GAGAL KOMPAKSI ROLLUP {self.nama}: {e}")
+            if os.path.exists(sementara):
+                os.remove(sementara)
+        finally:
+            self._kompaktor = None
+
+    def _saring(self, batas: float, ukuran: int, sementara: str) -> Optional[str]:
+        """Salin header dan baris >= `batas` dari `ukuran` byte pertama file."""
+        batas_teks = datetime.fromtimestamp(batas).strftime(FORMAT_WAKTU).encode()
+        panjang = len(batas_teks)
+        tertua = None
+        with open(self.path, 'rb') as masuk, open(sementara, 'wb') as keluar:
+            header = masuk.readline()
+            keluar.write(header)
+            dibaca = len(header)
+            while dibaca < ukuran:
+                baris = masuk.readline()
+                if not baris:
+                    break
+                dibaca += len(baris)
+                if baris[:panjang] >= batas_teks:
+                    if tertua is None:
+                        tertua = baris[:panjang].decode()
+                    keluar.write(baris)
+        return tertua
+
+    def flush(self):
+        with self._kunci:
+            self._file.flush()
+
+    def tutup(self):
+        # Bucket yang masih terbuka ditulis apa adanya (sebagian); pembaca
+        # menggabungkan baris dengan (awal, id) yang sama
+        for id_sensor, b in self.terbuka.items():
+            self._tulis(id_sensor, b)
+        self.terbuka.clear()
+        self._tulis_telat()
+        kompaktor = self._kompaktor
+        if kompaktor is not None:
+            kompaktor.join()
+        with self._kunci:
+            self._file.close()
+
+
+class RollupStore:
+    def __init__(self, path_log: str, tingkat=config.ROLLUP_TINGKAT):
+        print(f"Inisialisasi rollup ({', '.join(nama for nama, _, _ in tingkat)})")
+        self.path_log = path_log
+        folder = os.path.dirname(path_log)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.tier = [RollupTier(path_log, nama, lebar, retensi)
+                     for nama, lebar, retensi in tingkat]
+        self._lock = threading.Lock()
+
+    def update(self, id_sensor: str, suhu: float, status: str, waktu_ns: Optional[int] = None):
+        self.update_rows([(id_sensor, suhu, status) if waktu_ns is None
+                          else (id_sensor, suhu, status, waktu_ns)])
+
+    def update_rows(self, rows):
+        """
+        Perbarui semua tingkat dengan baris (id_sensor, suhu, status[, waktu_ns])
+        dari CPU. Baris tanpa waktu_ns memakai waktu sekarang.
+        """
+        sekarang = get_clock().time()
+        with self._lock:
+            for tier in self.tier:
+                ditutup = False
+                update = tier.update
+                for row in rows:
+                    id_sensor, suhu, status = row[0], row[1], row[2]
+                    if suhu is None:
+                        continue
+                    detik = row[3] / 1_000_000_000 if len(row) > 3 else sekarang
+                    if update(id_sensor, detik, suhu, 1 if status == 'ALERT' else 0):
+                        ditutup = True
+                if ditutup:
+                    tier.flush()
+
+    def tutup(self):
+        with self._lock:
+            for tier in self.tier:
+                tier.tutup()
+        telat = max(tier.jumlah_telat for tier in self.tier) if self.tier else 0
+        print(f"Rollup disimpan ({telat} pembacaan terlambat masuk bucket lama)." if telat
+              else "Rollup disimpan.")
+
+
+def pilih_tier(dari: Optional[float] = None, sampai: Optional[float] = None,
+               resolusi: Optional[float] = None, maks_titik: Optional[int] = None,
+               tingkat=config.ROLLUP_TINGKAT, sekarang: Optional[float] = None):
+    """
+    Pilih tingkat paling kasar yang lebar bucket-nya <= `resolusi` (atau
+    rentang / `maks_titik`) dan retensinya masih mencakup `dari` (tanpa
+    `dari` = sejak awal, hanya tingkat tanpa retensi).
+    Mengembalikan (nama, lebar) atau None jika perlu data mentah.
+    """
+    if resolusi is None and maks_titik and dari is not None:
+        akhir = sampai if sampai is not None else (sekarang or get_clock().time())
+        resolusi = (akhir - dari) / maks_titik
+    sekarang = sekarang if sekarang is not None else get_clock().time()
+
+    calon = [(nama, lebar) for nama, lebar, retensi in tingkat
+             if (resolusi is None or lebar <= resolusi)
+             and (not retensi or (dari is not None and sekarang - retensi <= dari))]
+    if not calon:
+        return None
+    return max(calon, key=lambda t: t[1])
+
+
+def baca(path_log: str, nama: str, id_sensor: Optional[str] = None,
+         dari: Optional[float] = None, sampai: Optional[float] = None
+         ) -> Dict[Tuple[str, float], StatAgregat]:
+    """
+    Bucket rollup satu tingkat yang dimulai di [dari, sampai]:
+    {(id_sensor, epoch awal bucket): StatAgregat}.
+    """
+    hasil: Dict[Tuple[str, float], StatAgregat] = {}
+    path = path_tier(path_log, nama)
+    if not os.path.exists(path):
+        return hasil
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for awal_teks, id_baris, jumlah, minimum, maksimum, rata, alert in reader:
+            if id_sensor is not None and id_baris != id_sensor:
+                continue
+            awal = datetime.strptime(awal_teks, FORMAT_WAKTU).timestamp()
+            if (dari is not None and awal < dari) or (sampai is not None and awal > sampai):
+                continue
+            stat = hasil.get((id_baris, awal))
+            if stat is None:
+                stat = hasil[(id_baris, awal)] = StatAgregat()
+            jumlah = int(jumlah)
+            stat.gabung(jumlah, float(minimum), float(maksimum), float(rata) * jumlah, int(alert))
+    return hasil
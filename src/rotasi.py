@@ -0,0 +1,194 @@
+# src/rotasi.py
+"""
+Rotasi file log ke segmen bernomor, dengan kompresi latar dan manifest.
+
+Jika rotasi aktif, Logger/BinaryLogger tidak lagi menimpa satu file, tetapi
+menulis ke `<nama>.00001<ext>`, `<nama>.00002<ext>`, ... dan pindah segmen
+saat ukurannya melewati `ukuran_maks` byte atau umurnya melewati `interval`
+detik (jam simulasi). Run baru melanjutkan penomoran, bukan menimpa.
+
+Segmen yang sudah ditutup dikompres gzip (`.gz`) oleh satu thread pekerja,
+jadi jalur tulis tidak pernah menunggu kompresi. `<file log>.manifest.json`
+mencatat setiap segmen beserta rentang waktu dan himpunan sensornya, agar
+pembacaan berikutnya bisa melewati file yang tidak relevan.
+"""
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+from typing import Callable, List, Optional
+
+from src.clock import get_clock
+
+AKTIF = 'aktif'
+TERTUTUP = 'tertutup'
+TERKOMPRESI = 'terkompresi'
+
+
+class InfoSegmen:
+    __slots__ = ('nomor', 'path', 'mulai', 'selesai', 'baris', 'byte', 'sensor',
+                 'status', 'dibuka')
+
+    def __init__(self, nomor: int, path: str):
+        self.nomor = nomor
+        self.path = path
+        self.mulai = None
+        self.selesai = None
+        self.baris = 0
+        self.byte = 0
+        self.sensor = set()
+        self.status = AKTIF
+        self.dibuka = get_clock().monotonic()
+
+    def as_dict(self, teks_waktu: Callable) -> dict:
+        return {
+            'file': os.path.basename(self.path),
+            'nomor': self.nomor,
+            'mulai': teks_waktu(self.mulai) if self.mulai is not None else None,
+            'selesai': teks_waktu(self.selesai) if self.selesai is not None else None,
+            'baris': self.baris,
+            'byte': self.byte,
+            'sensor': sorted(self.sensor),
+            'status': self.status,
+        }
+
+
+def path_manifest(location: str) -> str:
+    # Ekstensi ikut dipertahankan: log CSV dan biner bisa berbagi folder
+    return location + '.manifest.json'
+
+
+def baca_manifest(location: str) -> List[dict]:
+    """Daftar segmen dari manifest log di `location` (kosong jika belum ada)."""
+    try:
+        with open(path_manifest(location), encoding='utf-8') as file:
+            return json.load(file).get('segmen', [])
+    except FileNotFoundError:
+        return []
+
+
+class PengelolaSegmen:
+    def __init__(self, location: str, ukuran_maks: int, interval: float,
+                 kompresi: Optional[str], teks_waktu: Callable = str):
+        self.location = location
+        self.ukuran_maks = ukuran_maks
+        self.interval = interval
+        self.kompresi = kompresi
+        self.teks_waktu = teks_waktu
+        self.manifest = path_manifest(location)
+
+        # Entri segmen run sebelumnya disimpan apa adanya
+        self._entri: List[dict] = baca_manifest(location)
+        self._lock = threading.Lock()
+        self._antrean = queue.Queue()
+        self._thread = None
+        self.aktif: Optional[InfoSegmen] = None
+
+        if self.kompresi:
+            self._thread = threading.Thread(target=self._pekerja, daemon=True)
+            self._thread.start()
+            # Segmen yang tertutup tapi belum sempat dikompres (mis. crash)
+            for entri in self._entri:
+                if entri['status'] == TERTUTUP:
+                    self._antrean.put(entri)
+
+    def path_segmen(self, nomor: int) -> str:
+        dasar, ext = os.path.splitext(self.location)
+        return f"{dasar}.{nomor:05d}{ext}"
+
+    def buka_berikutnya(self) -> InfoSegmen:
+        nomor = max((entri['nomor'] for entri in self._entri), default=0) + 1
+        self.aktif = InfoSegmen(nomor, self.path_segmen(nomor))
+        with self._lock:
+            self._entri.append(self.aktif.as_dict(self.teks_waktu))
+            self._simpan()
+        return self.aktif
+
+    def catat(self, waktu, id_sensor):
+        # Dipanggil per baris dengan kunci logger terpegang
+        info = self.aktif
+        if info.mulai is None or waktu < info.mulai:
+            info.mulai = waktu
+        if info.selesai is None or waktu > info.selesai:
+            info.selesai = waktu
+        info.sensor.add(id_sensor)
+
+    def catat_commit(self, baris: int, jumlah_byte: int):
+        self.aktif.baris += baris
+        self.aktif.byte += jumlah_byte
+
+    def perlu_rotasi(self) -> bool:
+        info = self.aktif
+        if self.ukuran_maks and info.byte >= self.ukuran_maks:
+            return True
+        if self.interval and get_clock().monotonic() - info.dibuka >= self.interval:
+            return True
+        return False
+
+    def segel(self):
+        """Tutup segmen aktif di manifest dan antrekan kompresinya."""
+        info = self.aktif
+        self.aktif = None
+        if not info.baris:
+            # Segmen kosong (mis. dibuka tepat sebelum shutdown) tidak dicatat
+            with self._lock:
+                self._entri.pop()
+                self._simpan()
+            try:
+                os.remove(info.path)
+            except OSError:
+                pass
+            return
+
+        info.status = TERTUTUP
+        entri = info.as_dict(self.teks_waktu)
+        with self._lock:
+            self._entri[-1] = entri
+            self._simpan()
+        if self.kompresi:
+            self._antrean.put(entri)
+
+    def _simpan(self):
+        # Dipanggil dengan self._lock terpegang; tulis atomik lewat file sementara
+        sementara = self.manifest + '.tmp'
+        with open(sementara, 'w', encoding='utf-8') as file:
+            json.dump({'log': os.path.basename(self.location), 'segmen': self._entri},
+                      file, indent=1)
+        os.replace(sementara, self.manifest)
+
+    def _pekerja(self):
+        while True:
+            entri = self._antrean.get()
+            if entri is None:
+                break
+            folder = os.path.dirname(self.location)
+            asal = os.path.join(folder, entri['file'])
+            tujuan = asal + '.gz'
+            try:
+                with open(asal, 'rb') as masuk, gzip.open(tujuan, 'wb', compresslevel=6) as keluar:
+                    shutil.copyfileobj(masuk, keluar, 1024 * 1024)
+                os.remove(asal)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                print(f"Gagal mengompres segmen {asal}: {e}")
+                continue
+
+            with self._lock:
+                for e in self._entri:
+                    if e['nomor'] == entri['nomor']:
+                        e['file'] = os.path.basename(tujuan)
+                        e['byte_terkompresi'] = os.path.getsize(tujuan)
+                        e['status'] = TERKOMPRESI
+                self._simpan()
+
+    def tutup(self):
+        """Segel segmen aktif lalu tunggu sampai semua kompresi selesai."""
+        if self.aktif is not None:
+            self.segel()
+        if self._thread:
+            self._antrean.put(None)
+            self._thread.join()
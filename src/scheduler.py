@@ -0,0 +1,96 @@
+import heapq
+import itertools
+import threading
+from typing import TYPE_CHECKING, List, Tuple
+from src.clock import get_clock
+
+if TYPE_CHECKING:
+    from .sensor import TempSensor
+
+
+class SensorScheduler:
+    """
+    Menjalankan banyak TempSensor dari SATU thread memakai min-heap tenggat.
+    Tiap sensor punya periode sendiri (`sensor.periode`); thread hanya bangun
+    saat ada sensor yang jatuh tempo, bukan polling tiap 0.1 detik.
+    Dengan VirtualClock, jam langsung dimajukan ke tenggat terdekat sehingga
+    urutan dan timestamp pembacaan tetap deterministik.
+    """
+
+    def __init__(self):
+        print('Inisialisasi sensor scheduler')
+        self._heap: List[Tuple[float, int, 'TempSensor']] = []
+        self._urutan = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self.is_running = False
+
+    def tambah(self, sensor: 'TempSensor'):
+        with self._cond:
+            heapq.heappush(self._heap, (get_clock().titik_awal(), next(self._urutan), sensor))
+            self._cond.notify()
+
+    def hapus(self, sensor: 'TempSensor'):
+        # Penghapusan lazy: entri sensor yang sudah tidak aktif dibuang saat
+        # keluar dari heap. Cukup bangunkan thread agar tidak menunggu lama.
+        with self._cond:
+            self._cond.notify()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _loop(self):
+        clock = get_clock()
+        with self._cond:
+            while self.is_running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                tenggat, _, sensor = self._heap[0]
+                sisa = tenggat - clock.monotonic()
+                if sisa > 0:
+                    if clock.is_virtual:
+                        clock.tunggu_sampai(tenggat)
+                    else:
+                        self._cond.wait(sisa)
+                    continue
+
+                heapq.heappop(self._heap)
+                if not sensor.is_active:
+                    sensor.selesai()
+                    continue
+
+                # Callback sensor (bus, CPU interrupt, dst.) dijalankan tanpa
+                # memegang kunci agar tambah()/hapus() tidak ikut tertahan.
+                self._cond.release()
+                try:
+                    lanjut = sensor.langkah(tenggat)
+                except Exception as e:
+                    print(f"Error pada sensor '{sensor.id}': {e}")
+                    lanjut = False
+                finally:
+                    self._cond.acquire()
+
+                if lanjut and sensor.is_active:
+                    heapq.heappush(self._heap,
+                                   (tenggat + sensor.periode, next(self._urutan), sensor))
+                else:
+                    sensor.selesai()
+
+    def start(self):
+        if self.is_running:
+            print("Scheduler sudah berjalan.")
+            return
+
+        self.is_running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self.is_running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        print("Scheduler dihentikan.")
@@ -4,7 +4,13 @@ import threading
 import csv
 import os
 import config
-from datetime import datetime
+from src.dataset import muat_dataset, StreamingDataset
+from src.clock import get_clock
+from src.reading import Reading, indeks_sensor, id_sensor
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .scheduler import SensorScheduler
 
 
 class TempSensor:
@@ -16,16 +22,24 @@ class TempSensor:
         self.suhu = 37.1
         self.on_data_callback = None
         self.index_file = 0
-        self.id = id
+        # Id di-intern lewat registry agar semua pembacaan berbagi string yang sama
+        self.sensor_idx = indeks_sensor(id)
+        self.id = id_sensor(self.sensor_idx)
         self.is_active = False
+        self.periode = config.JEDA
+        self._stop_event = threading.Event()
+        self._scheduler = None
+        # Tenggat (jam monotonic) pembacaan yang sedang berjalan
+        self.tenggat = 0.0
 
         dir_utama = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.file_path = os.path.join(dir_utama, 'data', 'input', 'input.csv')
         self.data_suhu_dari_file = []
+        self._stream: Optional[StreamingDataset] = None
 
         if self.sumber_data == 'file':
             self._muat_data_dari_file()
-            if not self.data_suhu_dari_file:
+            if not self.data_suhu_dari_file and self._stream is None:
                 print(f"PERINGATAN: Gagal memuat data file, sensor '{self.id}' akan beralih ke mode 'random'.")
                 self.sumber_data = 'random'
 
@@ -41,12 +55,8 @@ class TempSensor:
             if self.suhu is None:
                 return None
 
-        return {
-            'waktu': datetime.now(),
-            'id' : self.id,
-            'suhu': self.suhu,
-            'reading_number': self.jumlah_data
-        }
+        return Reading(get_clock().waktu_ns_tenggat(self.tenggat), self.id, self.suhu,
+                       self.jumlah_data, self.sensor_idx)
 
     def buat_temperatur_acak(self):
         rand = random.random()
@@ -62,14 +72,29 @@ class TempSensor:
 
     def _muat_data_dari_file(self):
         try:
-            with open(self.file_path, 'r') as file:
-                reader = csv.DictReader(file)
+            if config.FILE_LOADER == 'stream':
+                # File besar: baca per-chunk, sampel pertama siap dalam hitungan ms
+                stream = StreamingDataset(self.file_path)
+                if stream.ada_data():
+                    self._stream = stream
+                    print(f"Berhasil membuka stream data dari file.")
+                else:
+                    stream.tutup()
+                    print(f"PERINGATAN: Tidak ada data di {self.file_path}")
+                return
+
+            if config.FILE_LOADER == 'cache':
+                # View zero-copy ke dataset bersama; cursor tetap index_file milik sensor ini
+                self.data_suhu_dari_file = muat_dataset(self.file_path)
+            else:
+                with open(self.file_path, 'r') as file:
+                    reader = csv.DictReader(file)
 
-                for row in reader:
-                    try:
-                        self.data_suhu_dari_file.append(float(row['suhu']))
-                    except (ValueError, KeyError):
-                        pass
+                    for row in reader:
+                        try:
+                            self.data_suhu_dari_file.append(float(row['suhu']))
+                        except (ValueError, KeyError):
+                            pass
 
             if not self.data_suhu_dari_file:
                 print(f"PERINGATAN: Tidak ada data di {self.file_path}")
@@ -82,6 +107,13 @@ class TempSensor:
             self.data_suhu_dari_file = []
 
     def baca_suhu_dari_file(self):
+        if self._stream is not None:
+            nilai_suhu = self._stream.berikutnya()
+            if nilai_suhu is None:
+                return None
+            self.index_file += 1
+            return nilai_suhu
+
         if self.index_file >= len(self.data_suhu_dari_file):
             return None  
 
@@ -92,46 +124,75 @@ class TempSensor:
         return nilai_suhu
     
 
+    def langkah(self, tenggat: float) -> bool:
+        """
+        Satu siklus sensor pada `tenggat`: baca suhu lalu kirim ke callback.
+        Mengembalikan False jika sensor sudah selesai (data habis / batas random).
+        """
+        self.tenggat = tenggat
+        data = self.baca_temperatur()
+
+        if data is None:
+            print(f"\nINFO: Sensor '{self.id}' telah selesai membaca file.")
+            return False
+
+        if self.on_data_callback:
+            try:
+                self.on_data_callback(data)
+            except Exception as e:
+                print(f"Error saat menjalankan callback: {e}")
+
+        if self.sumber_data == 'random' and self.jumlah_data >= config.JUMLAH_MAKSIMAL_RANDOM:
+            print(f"\nINFO: Sensor '{self.id}' telah mencapai batas {config.JUMLAH_MAKSIMAL_RANDOM} data random.")
+            return False
+
+        return True
+
+    def selesai(self):
+        print(f'\n======Monitoring Stopped {self.id}======')
+        self.is_active = False
+
     def looping(self):
         print(f'\n======Monitoring Started {self.id}======')
 
+        clock = get_clock()
+        tenggat = clock.titik_awal()
         while self.is_active:
-            data = self.baca_temperatur()
-
-            if data is None:
-                print(f"\nINFO: Sensor '{self.id}' telah selesai membaca file.")
+            if not self.langkah(tenggat):
                 break
 
-            if self.on_data_callback:
-                try:
-                    self.on_data_callback(data)
-                except Exception as e:
-                    print(f"Error saat menjalankan callback: {e}")
-
-            if self.sumber_data == 'random' and self.jumlah_data >= config.JUMLAH_MAKSIMAL_RANDOM:
-                print(f"\nINFO: Sensor '{self.id}' telah mencapai batas {config.JUMLAH_MAKSIMAL_RANDOM} data random.")
+            # Tunggu JEDA, tapi langsung bangun begitu stop_monitoring() dipanggil
+            tenggat += self.periode
+            if clock.tunggu_sampai(tenggat, self._stop_event):
                 break
 
-            start_sleep = time.time()
-            while time.time() - start_sleep < config.JEDA:
-                if not self.is_active:
-                    break
-                time.sleep(0.1)
-
-        print(f'\n======Monitoring Stopped {self.id}======')
-        self.is_active = False
+        self.selesai()
 
-    def mulai_monitoring(self, callback_function):
+    def mulai_monitoring(self, callback_function, scheduler: Optional['SensorScheduler'] = None):
         if self.is_active:
             print('Sensor already active')
             return
 
         self.on_data_callback = callback_function
         self.is_active = True
+        self._stop_event.clear()
+
+        if scheduler is not None:
+            # Mode scheduler: tidak ada thread per sensor
+            print(f'\n======Monitoring Started {self.id}======')
+            self._scheduler = scheduler
+            scheduler.tambah(self)
+            return
+
         self._thread = threading.Thread(target=self.looping, daemon=True)
         self._thread.start()
 
     def stop_monitoring(self):
         self.is_active = False
+        self._stop_event.set()
+        if self._scheduler is not None:
+            self._scheduler.hapus(self)
         if self._thread:
             self._thread.join(timeout=1.0)
+        if self._stream is not None:
+            self._stream.tutup()
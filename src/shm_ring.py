@@ -0,0 +1,252 @@
+# src/shm_ring.py
+"""
+Ingestion multi-proses lewat ring buffer di `multiprocessing.shared_memory`.
+
+Kelompok sensor dijalankan di proses worker terpisah (masing-masing dengan
+SensorScheduler sendiri) dan menulis record biner berukuran tetap ke ring
+miliknya. Proses utama membaca record langsung dari memori bersama dengan
+`struct.iter_unpack`, tanpa pickle dan tanpa salinan per record, lalu
+meneruskannya ke callback DataBus seperti sensor biasa.
+
+Setiap ring hanya punya satu produsen dan satu konsumen (SPSC) dengan dua
+penghitung 64-bit (head/tail). Isi record ditulis dan dibaca tanpa kunci;
+hanya publikasi penghitung yang lewat `multiprocessing.Lock` milik ring.
+Acquire/release semafor itu menjadi memory barrier antarproses, sehingga
+konsumen tidak pernah melihat head baru sebelum isi record-nya (juga pada
+CPU dengan memory ordering lemah seperti ARM64), dan produsen tidak
+menimpa slot sebelum konsumen selesai membacanya. Produsen menyimpan
+salinan tail dan hanya membaca ulang (dengan kunci) saat ring tampak
+penuh, jadi biayanya satu pasang acquire/release per record di produsen
+dan dua per potongan di konsumen.
+"""
+
+import multiprocessing as mp
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Sequence
+
+import config
+from src.reading import Reading, indeks_sensor, id_sensor
+
+# Record: indeks sensor (u32), nomor pembacaan (u32), waktu epoch ns (i64), suhu (f64)
+RECORD = struct.Struct('<IIqd')
+# head dan tail dipisah 64 byte agar tidak berbagi cache line
+_COUNTER = struct.Struct('<Q')
+_OFFSET_HEAD = 0
+_OFFSET_TAIL = 64
+_OFFSET_DATA = 128
+
+
+class SharedRing:
+    """Ring buffer SPSC berisi record RECORD di atas shared memory."""
+
+    def __init__(self, kapasitas: int, nama: Optional[str] = None, kunci=None):
+        """
+        Tanpa `nama`: buat ring baru (pemilik). Dengan `nama`: buka ring yang
+        sudah ada; `kunci` harus kunci milik pemilik (dikirim ke proses worker).
+        """
+        self.kapasitas = kapasitas
+        ukuran = _OFFSET_DATA + kapasitas * RECORD.size
+        if nama is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=ukuran)
+            self._pemilik = True
+            _COUNTER.pack_into(self.shm.buf, _OFFSET_HEAD, 0)
+            _COUNTER.pack_into(self.shm.buf, _OFFSET_TAIL, 0)
+            self.kunci = mp.Lock()
+        else:
+            if kunci is None:
+                raise ValueError("Ring yang sudah ada perlu kunci milik pemiliknya")
+            self.shm = shared_memory.SharedMemory(name=nama)
+            self._pemilik = False
+            self.kunci = kunci
+        self.nama = self.shm.name
+        self._buf = self.shm.buf
+        # Salinan tail milik produsen (hanya bertambah)
+        self._tail_produsen = 0
+
+    def _baca_counter(self, offset: int) -> int:
+        with self.kunci:
+            return _COUNTER.unpack_from(self._buf, offset)[0]
+
+    def _tulis_counter(self, offset: int, nilai: int):
+        with self.kunci:
+            _COUNTER.pack_into(self._buf, offset, nilai)
+
+    def __len__(self):
+        with self.kunci:
+            return (_COUNTER.unpack_from(self._buf, _OFFSET_HEAD)[0]
+                    - _COUNTER.unpack_from(self._buf, _OFFSET_TAIL)[0])
+
+    def tulis(self, indeks: int, nomor: int, waktu_ns: int, suhu: float) -> bool:
+        """Sisi produsen. Mengembalikan False jika ring penuh."""
+        # head hanya ditulis produsen sendiri, jadi boleh dibaca tanpa kunci
+        head = _COUNTER.unpack_from(self._buf, _OFFSET_HEAD)[0]
+        if head - self._tail_produsen >= self.kapasitas:
+            self._tail_produsen = self._baca_counter(_OFFSET_TAIL)
+            if head - self._tail_produsen >= self.kapasitas:
+                return False
+        posisi = _OFFSET_DATA + (head % self.kapasitas) * RECORD.size
+        RECORD.pack_into(self._buf, posisi, indeks, nomor, waktu_ns, suhu)
+        # Publikasikan record setelah isinya lengkap ditulis (release lewat kunci)
+        self._tulis_counter(_OFFSET_HEAD, head + 1)
+        return True
+
+    def baca(self, proses: Callable, maks: int = 4096) -> int:
+        """
+        Sisi konsumen: panggil `proses(indeks, nomor, waktu_ns, suhu)` untuk
+        hingga `maks` record yang tersedia. Mengembalikan jumlah record.
+        """
+        # tail hanya ditulis konsumen sendiri; head dibaca dengan kunci (acquire)
+        tail = _COUNTER.unpack_from(self._buf, _OFFSET_TAIL)[0]
+        jumlah = min(self._baca_counter(_OFFSET_HEAD) - tail, maks)
+        if jumlah <= 0:
+            return 0
+
+        awal = tail % self.kapasitas
+        potongan = min(jumlah, self.kapasitas - awal)
+        # Maksimal dua potongan (sebelum dan sesudah wrap-around)
+        for mulai, n in ((awal, potongan), (0, jumlah - potongan)):
+            if n:
+                view = self._buf[_OFFSET_DATA + mulai * RECORD.size:
+                                 _OFFSET_DATA + (mulai + n) * RECORD.size]
+                for record in RECORD.iter_unpack(view):
+                    proses(*record)
+                view.release()
+
+        # Slot baru boleh ditimpa produsen setelah tail dipublikasikan
+        self._tulis_counter(_OFFSET_TAIL, tail + jumlah)
+        return jumlah
+
+    def tutup(self):
+        self._buf = None
+        self.shm.close()
+        if self._pemilik:
+            self.shm.unlink()
+
+
+def _worker_proses(nama_ring: str, kunci_ring, kapasitas: int, daftar_id: Sequence[str],
+                   indeks_awal: int, stop_event):
+    """Titik masuk proses worker: jalankan sekelompok sensor dan tulis ke ring."""
+    from src.sensor import TempSensor
+    from src.scheduler import SensorScheduler
+
+    ring = SharedRing(kapasitas, nama=nama_ring, kunci=kunci_ring)
+    indeks_lokal = {nama: indeks_awal + i for i, nama in enumerate(daftar_id)}
+
+    def kirim(data):
+        record = (indeks_lokal[data.id], data.reading_number,
+                  data.waktu_ns, data.suhu)
+        # Backpressure: tunggu konsumen bila ring penuh
+        while not ring.tulis(*record):
+            if stop_event.is_set():
+                return
+            time.sleep(0.001)
+
+    scheduler = SensorScheduler()
+    scheduler.start()
+    daftar_sensor = [TempSensor(id=nama) for nama in daftar_id]
+    for sensor in daftar_sensor:
+        sensor.mulai_monitoring(callback_function=kirim, scheduler=scheduler)
+
+    while not stop_event.is_set() and any(s.is_active for s in daftar_sensor):
+        stop_event.wait(0.2)
+
+    for sensor in daftar_sensor:
+        sensor.stop_monitoring()
+    scheduler.stop()
+    ring.tutup()
+
+
+class ProsesIngestor:
+    """
+    Sumber data multi-proses. Antarmukanya sama dengan TempSensor sehingga
+    bisa didaftarkan ke DataBus; satu thread di proses utama menguras semua
+    ring dan memanggil callback bus.
+    """
+
+    def __init__(self, daftar_id: List[str], jumlah_proses: int = config.INGEST_PROSES,
+                 kapasitas: int = config.RING_KAPASITAS):
+        self.id = f'Ingestor ({jumlah_proses} proses)'
+        # Indeks global + id yang sudah di-intern untuk membangun Reading
+        self._indeks_global = [indeks_sensor(nama) for nama in daftar_id]
+        self.daftar_id = [id_sensor(i) for i in self._indeks_global]
+        self.jumlah_proses = max(1, min(jumlah_proses, len(self.daftar_id)))
+        self.kapasitas = kapasitas
+        self.jumlah_data = 0
+        self.is_active = False
+        self.on_data_callback = None
+
+        self._rings: List[SharedRing] = []
+        self._proses: List[mp.Process] = []
+        self._stop_event = mp.Event()
+        self._thread = None
+
+    def _kirim(self, indeks, nomor, waktu_ns, suhu):
+        self.jumlah_data += 1
+        data = Reading(waktu_ns, self.daftar_id[indeks], suhu, nomor, self._indeks_global[indeks])
+        try:
+            self.on_data_callback(data)
+        except Exception as e:
+            print(f"Error saat menjalankan callback: {e}")
+
+    def _konsumen(self):
+        while True:
+            jumlah = 0
+            for ring in self._rings:
+                jumlah += ring.baca(self._kirim)
+            if jumlah:
+                continue
+
+            if not any(p.is_alive() for p in self._proses):
+                # Semua worker selesai: kuras sisa data terakhir lalu berhenti
+                if not any(len(ring) for ring in self._rings):
+                    break
+                continue
+            if self._stop_event.wait(0.001):
+                break
+
+        print(f"\nINFO: Ingestor selesai: {self.jumlah_data} data diterima.")
+        self.is_active = False
+
+    def mulai_monitoring(self, callback_function, scheduler=None):
+        if self.is_active:
+            print('Ingestor already active')
+            return
+
+        self.on_data_callback = callback_function
+        self.is_active = True
+        self._stop_event.clear()
+
+        # Bagi sensor ke beberapa kelompok, satu ring per proses
+        ukuran = -(-len(self.daftar_id) // self.jumlah_proses)
+        for i in range(self.jumlah_proses):
+            kelompok = self.daftar_id[i * ukuran:(i + 1) * ukuran]
+            if not kelompok:
+                continue
+            ring = SharedRing(self.kapasitas)
+            proses = mp.Process(target=_worker_proses,
+                                args=(ring.nama, ring.kunci, self.kapasitas, kelompok, i * ukuran,
+                                      self._stop_event),
+                                daemon=True)
+            self._rings.append(ring)
+            self._proses.append(proses)
+            proses.start()
+
+        self._thread = threading.Thread(target=self._konsumen, daemon=True)
+        self._thread.start()
+
+    def stop_monitoring(self):
+        self._stop_event.set()
+        for proses in self._proses:
+            proses.join(timeout=2.0)
+            if proses.is_alive():
+                proses.terminate()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self.is_active = False
+        for ring in self._rings:
+            ring.tutup()
+        self._rings = []
+        self._proses = []
@@ -1,161 +1,389 @@
 # src/visualizer.py - Real-Time Temperature Visualization
 """
 Modul untuk visualisasi real-time suhu pasien menggunakan Matplotlib.
-Implementasi animation dengan FuncAnimation untuk live updates.
 
 Features:
-- Real-time line plot
+- Satu panel per sensor (small multiples), dibagi ke beberapa halaman
+  bila sensor lebih banyak dari PLOT_SENSOR_PER_HALAMAN
 - Fever & Hypothermia threshold line
 - Color coding (blue=hypothermia, green=normal, red=fever)
 - Alert markers
-- Auto-scroll window
+- Auto-scroll window: sumbu x = detik relatif terhadap pembacaan terbaru
+  sensor itu
+- Decimasi min/max (src/decimasi.py): riwayat panjang (mis. 24 jam lewat
+  PLOT_JENDELA_DETIK) diringkas menjadi ~4 titik per kolom piksel, jadi
+  biaya render bergantung pada lebar panel, bukan panjang riwayat
+
+Data tiap sensor disimpan di ring buffer NumPy yang dialokasikan sekali.
+Garis, marker dan teks status adalah artist 'animated' yang digambar ulang
+dengan blitting di atas background per panel yang di-cache (sumbu, grid,
+garis batas). Hanya panel yang sensornya menerima data baru (dirty) yang
+digambar ulang; frame tanpa data baru dilewati sepenuhnya.
+
+Navigasi halaman: tombol panah kanan/kiri (atau n/p), atau ganti otomatis
+setiap PLOT_GANTI_HALAMAN detik.
+
+Matplotlib di-import saat plot pertama kali disiapkan, bukan saat modul
+ini di-import, jadi membuat visualizer tidak membayar biaya import dan
+inisialisasi backend.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.lines import Line2D
-from collections import deque
-from datetime import datetime
-from typing import Optional, Deque
+import math
 import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.clock import get_clock
+from src.decimasi import DecimasiM4
 
 # Import config dengan fallback
 try:
     import config
     FEVER_THRESHOLD = config.BATAS_DEMAM
+    HYPO_THRESHOLD = config.BATAS_HIPO
     PLOT_UPDATE_INTERVAL = config.PLOT_UPDATE_INTERVAL
     PLOT_HISTORY_LENGTH = config.PLOT_HISTORY_LENGTH
     PLOT_WINDOW_SIZE = config.PLOT_WINDOW_SIZE
+    PLOT_JENDELA_DETIK = config.PLOT_JENDELA_DETIK
+    PLOT_SENSOR_PER_HALAMAN = config.PLOT_SENSOR_PER_HALAMAN
+    PLOT_GANTI_HALAMAN = config.PLOT_GANTI_HALAMAN
+    PLOT_DECIMASI = config.PLOT_DECIMASI
+    PLOT_DECIMASI_KOLOM = config.PLOT_DECIMASI_KOLOM
 except:
     FEVER_THRESHOLD = 38.0
+    HYPO_THRESHOLD = 35.0
     PLOT_UPDATE_INTERVAL = 100  # milliseconds
     PLOT_HISTORY_LENGTH = 50
     PLOT_WINDOW_SIZE = (12, 6)
+    PLOT_JENDELA_DETIK = 100
+    PLOT_SENSOR_PER_HALAMAN = 16
+    PLOT_GANTI_HALAMAN = 0
+    PLOT_DECIMASI = True
+    PLOT_DECIMASI_KOLOM = 0
+
+plt = None
+
+
+def _impor_matplotlib():
+    """Import pyplot on first use (raises ImportError if missing)."""
+    global plt
+    if plt is None:
+        import matplotlib.pyplot as pyplot
+        plt = pyplot
+
+
+class BufferSensor:
+    """
+    Ring buffer per sensor. Setiap nilai ditulis dua kali (indeks i dan
+    i + kapasitas), sehingga `data()` selalu berupa view berurutan waktu
+    tanpa salinan maupun np.roll.
+    """
+
+    __slots__ = ('kapasitas', 'waktu', 'suhu', 'demam', 'total')
+
+    def __init__(self, kapasitas: int):
+        self.kapasitas = max(1, kapasitas)
+        self.waktu = np.zeros(2 * self.kapasitas, dtype=np.float64)
+        self.suhu = np.zeros(2 * self.kapasitas, dtype=np.float64)
+        self.demam = np.zeros(2 * self.kapasitas, dtype=bool)
+        self.total = 0
+
+    def tambah(self, waktu: float, suhu: float, demam: bool):
+        i = self.total % self.kapasitas
+        j = i + self.kapasitas
+        self.waktu[i] = self.waktu[j] = waktu
+        self.suhu[i] = self.suhu[j] = suhu
+        self.demam[i] = self.demam[j] = demam
+        self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.kapasitas)
+
+    def data(self):
+        """(waktu, suhu, demam) urut dari yang tertua; view, bukan salinan."""
+        n = len(self)
+        awal = (self.total - n) % self.kapasitas
+        return (self.waktu[awal:awal + n], self.suhu[awal:awal + n],
+                self.demam[awal:awal + n])
+
+
+class Panel:
+    __slots__ = ('ax', 'line', 'scatter', 'status_text', 'background')
+
+    def __init__(self, ax, line, scatter, status_text):
+        self.ax = ax
+        self.line = line
+        self.scatter = scatter
+        self.status_text = status_text
+        self.background = None
+
+    def artists(self):
+        return (self.line, self.scatter, self.status_text)
+
+
+def _status(suhu: float):
+    if suhu < HYPO_THRESHOLD:
+        return "HYPOTHERMIA", "blue"
+    if suhu > FEVER_THRESHOLD:
+        return "FEVER", "red"
+    return "NORMAL", "green"
 
 
 class TemperatureVisualizer:
     """
-    Real-time temperature visualizer menggunakan Matplotlib.
+    Real-time multi-sensor temperature visualizer menggunakan Matplotlib.
     """
 
-    def __init__(self, max_points: int = PLOT_HISTORY_LENGTH):
+    def __init__(self, max_points: int = PLOT_HISTORY_LENGTH,
+                 per_halaman: int = PLOT_SENSOR_PER_HALAMAN,
+                 jendela: float = PLOT_JENDELA_DETIK,
+                 decimasi: bool = PLOT_DECIMASI,
+                 kolom: int = PLOT_DECIMASI_KOLOM):
         self.max_points = max_points
-        
-        # Data storage
-        self.times: Deque[float] = deque(maxlen=max_points)
-        self.temperatures: Deque[float] = deque(maxlen=max_points)
-        self.is_fever: Deque[bool] = deque(maxlen=max_points)
-        
-        # Alert markers
-        self.alert_times: Deque[float] = deque(maxlen=max_points)
-        self.alert_temps: Deque[float] = deque(maxlen=max_points)
-        
-        # Thread synchronization
+        self.per_halaman = max(1, per_halaman)
+        self.jendela = jendela
+
+        # Decimasi: satu kolom ~ satu piksel panel. Bawaan diperkirakan dari
+        # lebar jendela (dpi 100) dibagi jumlah kolom grid small multiples
+        self.decimasi = decimasi
+        if not kolom:
+            kolom = int(PLOT_WINDOW_SIZE[0] * 100 / math.ceil(math.sqrt(self.per_halaman)))
+        self.kolom = max(1, kolom)
+        self.lebar_kolom = jendela / self.kolom
+
+        # Data storage: satu ring buffer per sensor, urut kemunculan pertama.
+        # Dengan decimasi, ring buffer berisi titik kolom yang sudah ditutup
+        # (paling banyak 4 per kolom selebar jendela), bukan data mentah
+        self.buffers: Dict[str, BufferSensor] = {}
+        self.decimator: Dict[str, DecimasiM4] = {}
+        self.urutan_sensor: List[str] = []
+
+        # Thread synchronization + flag frame: sensor yang punya data baru,
+        # halaman perlu dibangun ulang, teks halaman perlu diperbarui
         self._lock = threading.Lock()
-        
+        self._dirty = set()
+        self._tata_ulang = True
+        self._teks_halaman = False
+
         # Plot components
         self.fig = None
-        self.ax = None
-        self.line = None
-        self.scatter = None
-        self.threshold_line = None
-        self.hypo_line = None
-        self.animation = None
-        
+        self.panels: Dict[str, Panel] = {}
+        self.page_text = None
+        self.timer = None
+        self.halaman = 0
+        self._ganti_terakhir = time.monotonic()
+
+        # Analitik streaming (opsional) dan sensor terakhir yang dikirim
+        self.analytics = None
+        self.last_sensor_id: Optional[str] = None
+
         # State
         self.is_running = False
-        self.start_time = datetime.now()
-        
+        self.start_time = get_clock().time()
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+
         print("[VISUALIZER] Initialized")
 
-    def add_data_point(self, temperature: float, is_fever: bool = False):
-        """Add new temperature data point (thread-safe)."""
+    def attach_analytics(self, analytics):
+        """Show rolling trend (from StreamingAnalytics) in each panel's status text."""
+        self.analytics = analytics
+
+    def add_data_point(self, temperature: float, is_fever: bool = False,
+                       sensor_id: Optional[str] = None, waktu_ns: Optional[int] = None):
+        """Add new temperature data point (thread-safe).
+
+        `waktu_ns` is the sensor's reading timestamp (epoch ns); the clock is
+        only read when it is not given.
+        """
+        waktu = waktu_ns / 1_000_000_000 if waktu_ns is not None else get_clock().time()
+        elapsed = waktu - self.start_time
+        sensor_id = sensor_id or 'Sensor'
         with self._lock:
-            elapsed = (datetime.now() - self.start_time).total_seconds()
-            self.times.append(elapsed)
-            self.temperatures.append(temperature)
-            self.is_fever.append(is_fever)
-            
-            if is_fever:
-                self.alert_times.append(elapsed)
-                self.alert_temps.append(temperature)
+            self.last_sensor_id = sensor_id
+            buffer = self.buffers.get(sensor_id)
+            if buffer is None:
+                if self.decimasi:
+                    buffer = self.buffers[sensor_id] = BufferSensor(4 * self.kolom + 4)
+                    self.decimator[sensor_id] = DecimasiM4(self.lebar_kolom)
+                else:
+                    buffer = self.buffers[sensor_id] = BufferSensor(self.max_points)
+                self.urutan_sensor.append(sensor_id)
+                # Sensor baru pada halaman yang tampil butuh panel baru
+                if (len(self.urutan_sensor) - 1) // self.per_halaman == self.halaman:
+                    self._tata_ulang = True
+                self._teks_halaman = True
+            if self.decimasi:
+                for titik in self.decimator[sensor_id].tambah(elapsed, temperature, is_fever):
+                    buffer.tambah(*titik)
+            else:
+                buffer.tambah(elapsed, temperature, is_fever)
+            self._dirty.add(sensor_id)
+
+    def _seri(self, sensor_id):
+        """(waktu, suhu, demam) yang digambar untuk satu sensor (dengan self._lock)."""
+        waktu, suhu, demam = self.buffers[sensor_id].data()
+        decimator = self.decimator.get(sensor_id)
+        if decimator is None:
+            return waktu, suhu.copy(), demam
+        # Kolom terbuka belum masuk ring buffer: tambahkan di ujung
+        terbuka = decimator.terbuka()
+        return (np.concatenate((waktu, [t[0] for t in terbuka])),
+                np.concatenate((suhu, [t[1] for t in terbuka])),
+                np.concatenate((demam, np.array([t[2] for t in terbuka], dtype=bool))))
+
+    @property
+    def jumlah_halaman(self) -> int:
+        return max(1, math.ceil(len(self.urutan_sensor) / self.per_halaman))
 
     def setup_plot(self):
-        """Setup matplotlib figure dan axes."""
-        self.fig, self.ax = plt.subplots(figsize=PLOT_WINDOW_SIZE)
-        self.ax.set_xlabel('Time (seconds)', fontsize=12)
-        self.ax.set_ylabel('Temperature (°C)', fontsize=12)
-        self.ax.set_title('Real-Time Patient Temperature Monitoring',
-                         fontsize=14, fontweight='bold')
-        self.ax.grid(True, alpha=0.3)
-        self.ax.set_ylim(31, 42)
-
-        # Garis suhu utama
-        self.line, = self.ax.plot([], [], 'b-', linewidth=2, label='Temperature')
-
-        # Marker alert
-        self.scatter = self.ax.scatter([], [], c='red', s=100, 
-                                       marker='X', zorder=5, label='Fever Alert')
-
-        # Garis batas demam
-        self.threshold_line = self.ax.axhline(y=FEVER_THRESHOLD, 
-                                              color='red', linestyle='--', linewidth=2, alpha=0.7,
-                                              label=f'Fever Threshold ({FEVER_THRESHOLD}°C)')
-
-        # Garis batas hipotermia
-        self.hypo_line = self.ax.axhline(y=35.0,
-                                         color='blue', linestyle='--', linewidth=2, alpha=0.7,
-                                         label='Hypothermia Threshold (35.0°C)')
-
-        self.ax.legend(loc='upper left', fontsize=10)
-        self.fig.tight_layout()
+        """Setup matplotlib figure; panel dibuat per halaman oleh _susun_halaman()."""
+        _impor_matplotlib()
+        self.fig = plt.figure(figsize=PLOT_WINDOW_SIZE)
+        canvas = self.fig.canvas
+        canvas.mpl_connect('draw_event', self._on_draw)
+        canvas.mpl_connect('key_press_event', self._on_key)
+        canvas.mpl_connect('close_event', self._on_close)
+        with self._lock:
+            self._susun_halaman()
         print("[VISUALIZER] Plot setup complete")
 
-    def _update_plot(self, frame):
-        """Update function untuk FuncAnimation."""
-        with self._lock:
-            if len(self.times) > 0:
-                times_list = list(self.times)
-                temps_list = list(self.temperatures)
+    def _susun_halaman(self):
+        """Bangun ulang panel halaman aktif (dipanggil dengan self._lock terpegang)."""
+        self._tata_ulang = False
+        self.halaman = min(self.halaman, self.jumlah_halaman - 1)
+        awal = self.halaman * self.per_halaman
+        sensor = self.urutan_sensor[awal:awal + self.per_halaman] or [None]
 
-                self.line.set_data(times_list, temps_list)
+        self.fig.clf()
+        self.panels = {}
+        kolom = math.ceil(math.sqrt(len(sensor)))
+        baris = math.ceil(len(sensor) / kolom)
+        axes = self.fig.subplots(baris, kolom, sharex=True, sharey=True, squeeze=False).ravel()
+        tunggal = len(sensor) == 1
+        ukuran = 12 if tunggal else 8
 
-                current_temp = temps_list[-1]
+        for ax, sensor_id in zip(axes, sensor):
+            ax.set_xlim(-self.jendela, 0)
+            ax.set_ylim(31, 42)
+            ax.grid(True, alpha=0.3)
+            ax.set_title(sensor_id or 'Menunggu data...', fontsize=ukuran + 2 if tunggal else ukuran)
+            ax.tick_params(labelsize=ukuran)
+            ax.axhline(y=FEVER_THRESHOLD, color='red', linestyle='--', linewidth=1.5, alpha=0.7,
+                       label=f'Fever Threshold ({FEVER_THRESHOLD}°C)')
+            ax.axhline(y=HYPO_THRESHOLD, color='blue', linestyle='--', linewidth=1.5, alpha=0.7,
+                       label=f'Hypothermia Threshold ({HYPO_THRESHOLD}°C)')
 
-                # Tentukan status suhu
-                if current_temp < 36.0:
-                    status = "❄️ HYPOTHERMIA"
-                    color = "blue"
-                elif current_temp > 38.0:
-                    status = "🔴 FEVER"
-                    color = "red"
-                else:
-                    status = "🟢 NORMAL"
-                    color = "green"
+            line, = ax.plot([], [], 'g-', linewidth=2 if tunggal else 1.2,
+                            label='Temperature', animated=True)
+            scatter = ax.scatter([], [], c='red', s=100 if tunggal else 25, marker='X',
+                                 zorder=5, label='Fever Alert', animated=True)
+            status_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, va='top',
+                                  fontsize=ukuran + 1, fontweight='bold', animated=True)
+            if tunggal:
+                ax.set_xlabel('Time (seconds, relative to latest reading)', fontsize=12)
+                ax.set_ylabel('Temperature (°C)', fontsize=12)
+                ax.legend(loc='upper right', fontsize=10)
+            if sensor_id is not None:
+                self.panels[sensor_id] = Panel(ax, line, scatter, status_text)
+        for ax in axes[len(sensor):]:
+            ax.set_visible(False)
+
+        self.fig.suptitle('Real-Time Patient Temperature Monitoring', fontsize=14, fontweight='bold')
+        self.page_text = self.fig.text(0.99, 0.01, self._label_halaman(),
+                                       ha='right', va='bottom', fontsize=9)
+        self.fig.tight_layout(rect=(0, 0.03, 1, 1))
 
-                # Update warna garis
-                self.line.set_color(color)
+        # Background panel di-cache ulang oleh _on_draw setelah draw penuh
+        self._teks_halaman = False
+        self._dirty = set(self.panels)
+        self.fig.canvas.draw_idle()
 
-                # Update judul grafik
-                self.ax.set_title(
-                    f'Real-Time Patient Temperature Monitoring | '
-                    f'Current: {current_temp:.1f}°C {status}',
-                    fontsize=14, fontweight='bold',
-                    color=color
-                )
+    def _label_halaman(self) -> str:
+        return f'Halaman {self.halaman + 1}/{self.jumlah_halaman} ({len(self.urutan_sensor)} sensor)'
 
-                # Update marker alert
-                if len(self.alert_times) > 0:
-                    self.scatter.set_offsets(
-                        list(zip(list(self.alert_times), list(self.alert_temps)))
-                    )
+    def _on_draw(self, event):
+        """Setelah draw penuh (awal, resize, ganti halaman): simpan background panel lalu gambar artist."""
+        canvas = self.fig.canvas
+        blit = getattr(canvas, 'supports_blit', False)
+        for panel in self.panels.values():
+            panel.background = canvas.copy_from_bbox(panel.ax.bbox) if blit else None
+            for artist in panel.artists():
+                panel.ax.draw_artist(artist)
 
-                # Auto-scale x-axis
-                if len(times_list) > 0:
-                    self.ax.set_xlim(max(0, times_list[-1] - 30),
-                                     times_list[-1] + 5)
+    def _on_key(self, event):
+        if event.key in ('right', 'n'):
+            self.ganti_halaman(+1)
+        elif event.key in ('left', 'p'):
+            self.ganti_halaman(-1)
 
-        return self.line, self.scatter
+    def _on_close(self, event):
+        self.is_running = False
+        if self.timer is not None:
+            self.timer.stop()
+
+    def ganti_halaman(self, arah: int = 1):
+        with self._lock:
+            self.halaman = (self.halaman + arah) % self.jumlah_halaman
+            self._tata_ulang = True
+        self._ganti_terakhir = time.monotonic()
+
+    def _update_plot(self):
+        """Callback timer: perbarui artist lalu blit, atau lewati bila tidak ada data baru."""
+        if (PLOT_GANTI_HALAMAN and self.jumlah_halaman > 1
+                and time.monotonic() - self._ganti_terakhir >= PLOT_GANTI_HALAMAN):
+            self.ganti_halaman(+1)
+
+        with self._lock:
+            if self._tata_ulang:
+                self._susun_halaman()
+                return
+            if self._teks_halaman:
+                # Jumlah sensor/halaman berubah: teks statis, perlu draw penuh
+                self._teks_halaman = False
+                self.page_text.set_text(self._label_halaman())
+                self.fig.canvas.draw_idle()
+            dirty = [(s, self.panels[s]) for s in self._dirty if s in self.panels]
+            self._dirty.clear()
+            if not dirty:
+                self.frames_skipped += 1
+                return
+
+            for sensor_id, panel in dirty:
+                waktu, suhu, demam = self._seri(sensor_id)
+                x = waktu - waktu[-1]
+                panel.line.set_data(x, suhu)
+                panel.scatter.set_offsets(np.column_stack((x[demam], suhu[demam])))
+
+                current_temp = suhu[-1]
+                status, color = _status(current_temp)
+                panel.line.set_color(color)
+
+                # Tren dari analitik streaming (jika terpasang)
+                trend = ''
+                stat = self.analytics.get(sensor_id) if self.analytics else None
+                if stat is not None:
+                    trend = f'\nAvg: {stat.rata_rata:.1f}°C, Trend: {stat.laju_per_jam:+.1f}°C/h'
+                panel.status_text.set_text(f'{current_temp:.1f}°C {status}{trend}')
+                panel.status_text.set_color(color)
+
+        self._blit([panel for _, panel in dirty])
+        self.frames_drawn += 1
+
+    def _blit(self, panels):
+        canvas = self.fig.canvas
+        if any(panel.background is None for panel in panels):
+            # Backend tanpa blit (atau background belum siap): draw biasa
+            canvas.draw_idle()
+            return
+        for panel in panels:
+            canvas.restore_region(panel.background)
+            for artist in panel.artists():
+                panel.ax.draw_artist(artist)
+            canvas.blit(panel.ax.bbox)
+        canvas.flush_events()
 
     def start(self):
         """Start visualization (blocking)."""
@@ -165,13 +393,9 @@ class TemperatureVisualizer:
         self.is_running = True
 
         self.setup_plot()
-        self.animation = animation.FuncAnimation(
-            self.fig,
-            self._update_plot,
-            interval=PLOT_UPDATE_INTERVAL,
-            blit=True,
-            cache_frame_data=False
-        )
+        self.timer = self.fig.canvas.new_timer(interval=PLOT_UPDATE_INTERVAL)
+        self.timer.add_callback(self._update_plot)
+        self.timer.start()
 
         print("[VISUALIZER] Animation started")
         plt.show()
@@ -187,9 +411,10 @@ class TemperatureVisualizer:
     def stop(self):
         """Stop visualization."""
         self.is_running = False
-        if self.animation:
-            self.animation.event_source.stop()
-        plt.close(self.fig)
+        if self.timer is not None:
+            self.timer.stop()
+        if plt is not None and self.fig is not None:
+            plt.close(self.fig)
         print("[VISUALIZER] Stopped")
 
 
@@ -197,23 +422,27 @@ class TemperatureVisualizer:
 # TESTING (bisa dijalankan langsung untuk uji mandiri)
 # =====================================================================
 if __name__ == "__main__":
-    import time, random
+    import random
+    import sys
     print("="*70)
     print(" VISUALIZER MODULE - STANDALONE TEST ".center(70, "="))
     print("="*70)
+    jumlah = int(sys.argv[1]) if len(sys.argv) > 1 else 1
     viz = TemperatureVisualizer(max_points=50)
     viz.start_in_thread()
     time.sleep(2)
 
     try:
         for i in range(100):
-            temp = random.uniform(33.5, 40.5)
-            is_fever = temp > 37.5
-            viz.add_data_point(temp, is_fever)
+            for k in range(jumlah):
+                temp = random.uniform(33.5, 40.5)
+                is_fever = temp > 37.5
+                viz.add_data_point(temp, is_fever, f'Kamar-{101 + k}')
             time.sleep(0.5)
     except KeyboardInterrupt:
         print("\n[TEST] Interrupted by user")
     viz.stop()
+    print(f"[TEST] {viz.frames_drawn} frame digambar, {viz.frames_skipped} dilewati")
     print("\n" + "="*70)
     print(" TEST COMPLETED ".center(70, "="))
     print("="*70)
@@ -0,0 +1,42 @@
+# tests/test_analitik_log.py
+"""Kolom analitik log: statistik saat pembacaan, bukan saat batch ditulis."""
+
+import contextlib
+import csv
+import io
+
+import config
+from src.analytics import StreamingAnalytics
+from src.bus import DataBus
+from src.cpu import CPU
+from src.logger import Logger
+from src.reading import Reading, indeks_sensor
+
+DETIK = 1_000_000_000
+AWAL = 1_735_689_600
+
+
+def test_batch_menulis_statistik_per_pembacaan(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'LOG_ANALYTICS', True)
+    path = str(tmp_path / 'log.csv')
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = Logger(path, mode='batch', batchSize=512, maxLatency=60.0, durability='none')
+        cpu = CPU()
+        bus = DataBus(cpu_target=cpu)
+        cpu.attach_bus(bus)
+        cpu.attach_logger(logger)
+        analytics = StreamingAnalytics(jendela=30)
+        for komponen in (bus, cpu, logger):
+            komponen.attach_analytics(analytics)
+        logger.setup()
+
+        idx = indeks_sensor('Kamar-101')
+        for i, suhu in enumerate((36.0, 36.2, 36.4, 36.6)):
+            bus.handler_sensor_data(Reading((AWAL + i * 2) * DETIK, 'Kamar-101', suhu, i, idx))
+        # Seluruh pembacaan sudah masuk analitik sebelum satu batch ditulis
+        cpu._proses_batch(bus.get_many(512, timeout=0))
+        logger.close()
+
+    with open(path, newline='') as f:
+        rata_rata = [row['rata_rata'] for row in csv.DictReader(f)]
+    assert rata_rata == ['36.00', '36.10', '36.20', '36.30']
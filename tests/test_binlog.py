@@ -0,0 +1,115 @@
+# tests/test_binlog.py
+"""Log biner: group-commit dan presisi waktu nanodetik."""
+
+import contextlib
+import csv
+import io
+import random
+import time
+
+from src.binlog import BinLogReader, BinaryLogger, ekspor_csv
+from src.klasifikasi import status
+from src.logger import Logger
+from tests.test_logger import FileGagal
+
+DETIK = 1_000_000_000
+AWAL = 1_735_689_600
+
+
+def test_mode_sinkron_tetap_group_commit(tmp_path):
+    path = str(tmp_path / 'log.bin')
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = BinaryLogger(path, mode='sinkron', batchSize=64, maxLatency=60.0,
+                              durability='none', indeksBucket=0)
+        logger.setup()
+        for i in range(100):
+            logger.writeData('Kamar-101', 36.5, 'NORMAL', (AWAL + i) * DETIK)
+        logger.close()
+
+    assert logger.mode == 'batch'
+    assert logger.batchesWritten == 2
+    with BinLogReader(path) as pembaca:
+        assert len(list(pembaca.baris())) == 100
+
+
+def test_waktu_disimpan_penuh_dan_resolusi_saat_ekspor(tmp_path):
+    path = str(tmp_path / 'log.bin')
+    waktu = [AWAL * DETIK + 123_456_789, AWAL * DETIK + 123_456_789,
+             AWAL * DETIK + 987_654_321, (AWAL - 5) * DETIK + 1, (AWAL + 86_400) * DETIK + 7]
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = BinaryLogger(path, mode='batch', batchSize=64, maxLatency=60.0,
+                              durability='none', indeksBucket=0)
+        logger.setup()
+        logger.writeRows([('Kamar-101', 36.5, 'NORMAL', ns) for ns in waktu])
+        logger.close()
+
+    with BinLogReader(path) as pembaca:
+        assert [ns for ns, _, _, _ in pembaca.baris()] == waktu
+
+    path_csv = str(tmp_path / 'log.csv')
+    ekspor_csv(path, path_csv, resolusi='ms')
+    with open(path_csv, newline='') as f:
+        teks = [row['waktu'] for row in csv.DictReader(f)]
+    assert teks[0].endswith('.123') and teks[2].endswith('.987')
+
+
+def test_ukuran_lewat_writedata_dengan_baris_segera(tmp_path):
+    # Pola CPU polling bawaan: satu writeData per baris, ALERT/HIPOTERMIA
+    # tidak lagi menyegel satu blok per baris
+    acak = random.Random(1)
+    baris = []
+    for i in range(20_000):
+        ronde, sensor = divmod(i, 100)
+        suhu = round(acak.uniform(34.5, 39.5), 1)
+        waktu_ns = (AWAL + ronde * 2) * DETIK + sensor * 20_000_000 + acak.randrange(1_000_000)
+        baris.append((f'Kamar-{101 + sensor}', suhu, status(suhu), waktu_ns))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger_csv = Logger(str(tmp_path / 'log.csv'), mode='sinkron', durability='none',
+                            indeksBucket=0)
+        logger_biner = BinaryLogger(str(tmp_path / 'log.bin'), mode='sinkron',
+                                    durability='none', indeksBucket=0)
+        for logger in (logger_csv, logger_biner):
+            logger.setup()
+            for row in baris:
+                logger.writeData(*row)
+            logger.close()
+
+    assert logger_biner.batchesWritten < 200
+    assert logger_csv.bytesWritten >= 5 * logger_biner.bytesWritten
+
+
+def test_baris_segera_di_commit_dalam_batas_latensi(tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = BinaryLogger(str(tmp_path / 'log.bin'), batchSize=256, maxLatency=60.0,
+                              durability='none', indeksBucket=0, latensiSegera=0.05)
+        logger.setup()
+        logger.writeData('Kamar-101', 38.5, 'ALERT', AWAL * DETIK)
+        logger.writeData('Kamar-102', 38.6, 'ALERT', AWAL * DETIK + 1)
+        assert logger.batchesWritten == 0
+        batas = time.monotonic() + 2.0
+        while logger.batchesWritten == 0 and time.monotonic() < batas:
+            time.sleep(0.01)
+        baris_tertulis = logger.rowsWritten
+        logger.close()
+
+    assert baris_tertulis == 2
+
+
+def test_batch_dibuang_tetap_menyimpan_kamus_id(tmp_path):
+    path = str(tmp_path / 'log.bin')
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = BinaryLogger(path, batchSize=1, durability='none', indeksBucket=0)
+        logger.maksTertahan = 1
+        logger.setup()
+        asli = logger.fileHandle
+        logger.fileHandle = FileGagal(asli)
+        logger.writeData('Kamar-101', 36.5, 'NORMAL', AWAL * DETIK)
+        logger.fileHandle = asli
+        logger.writeData('Kamar-102', 36.6, 'NORMAL', AWAL * DETIK + 1)
+        logger.close()
+
+    assert logger.rowsDropped == 1
+    with BinLogReader(path) as pembaca:
+        assert [id_sensor for _, id_sensor, _, _ in pembaca.baris()] == ['Kamar-102']
+        assert pembaca.sensor == ['Kamar-101', 'Kamar-102']
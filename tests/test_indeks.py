@@ -0,0 +1,78 @@
+# tests/test_indeks.py
+"""Indeks sidecar: batch terlambat tetap ditemukan lewat bucket aslinya."""
+
+import contextlib
+import gzip
+import io
+
+from src.clock import parse_waktu
+from src.indeks import IndeksLog, PenulisIndeks
+from src.logger import Logger
+from src.query import cari
+
+DETIK = 1_000_000_000
+AWAL = 1_735_689_600  # 2025-01-01 00:00:00 UTC, kelipatan bucket 10 detik
+
+
+def test_batch_terlambat_diindeks_di_bucket_aslinya(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    penulis = PenulisIndeks(path, 10)
+    for i in range(10):
+        penulis.catat_batch(AWAL + i * 10, AWAL + i * 10, {'A': 0}, i * 100, i * 100 + 100)
+    # Bucket AWAL+10 sudah ditulis ke file; batch ini datang terlambat
+    penulis.catat_batch(AWAL + 12, AWAL + 12, {'B': 0}, 1000, 1050)
+
+    # Indeks yang masih ditulis (belum diurutkan ulang) tetap terbaca benar
+    with IndeksLog(path) as indeks:
+        assert indeks.rentang('B', AWAL + 10, AWAL + 19) == [(1000, 1050, 0)]
+
+    penulis.tutup()
+    assert penulis.jumlah_telat == 1
+    with IndeksLog(path) as indeks:
+        assert indeks.rentang('B', AWAL + 10, AWAL + 19) == [(1000, 1050, 0)]
+        assert indeks.rentang('B', AWAL + 30, AWAL + 99) == []
+        assert indeks.rentang('A', AWAL + 20, AWAL + 29) == [(200, 300, 0)]
+
+
+def test_cari_menemukan_baris_terlambat_lewat_indeks(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = Logger(path, mode='sinkron', durability='none', indeksBucket=10)
+        logger.setup()
+        for i in range(10):
+            logger.writeData('Kamar-101', 36.5, 'NORMAL', (AWAL + i * 10) * DETIK)
+        logger.writeData('Kamar-102', 38.5, 'ALERT', (AWAL + 10) * DETIK)
+        logger.close()
+
+    semua = [row for row in cari(path, 'Kamar-102')]
+    terindeks = list(cari(path, 'Kamar-102', AWAL + 5, AWAL + 15))
+    assert len(semua) == 1
+    assert terindeks == semua
+
+
+def test_cari_lewat_indeks_di_segmen_terkompresi(tmp_path, monkeypatch):
+    path = str(tmp_path / 'log.csv')
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = Logger(path, mode='sinkron', durability='none', indeksBucket=10,
+                        rotasiUkuran=4000, kompresiSegmen='gzip')
+        logger.setup()
+        for i in range(300):
+            logger.writeData(f'Kamar-{101 + i % 3}', 36.5, 'NORMAL', (AWAL + i) * DETIK)
+        logger.close()
+    assert list(tmp_path.glob('log.*.csv.gz'))
+
+    semua = [row for row in cari(path, 'Kamar-102') if AWAL + 100 <= parse_waktu(row[0]) <= AWAL + 160]
+
+    # Hanya rentang dari indeks yang dibaca dari aliran gzip, bukan seluruh segmen
+    dibaca = []
+    baca_asli = gzip.GzipFile.read
+
+    def baca(self, *args):
+        data = baca_asli(self, *args)
+        dibaca.append(len(data))
+        return data
+
+    monkeypatch.setattr(gzip.GzipFile, 'read', baca)
+    terindeks = list(cari(path, 'Kamar-102', AWAL + 100, AWAL + 160))
+    assert terindeks == semua and len(semua) == 21
+    assert sum(dibaca) < 4000
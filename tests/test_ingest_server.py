@@ -0,0 +1,47 @@
+# tests/test_ingest_server.py
+"""Server ingest: bus yang tertahan tidak menghentikan event loop."""
+
+import json
+import socket
+import threading
+
+from src.ingest_server import IngestServer
+
+
+def port_bebas():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def perintah(port, teks):
+    with socket.create_connection(('127.0.0.1', port), timeout=2.0) as s:
+        s.sendall(teks.encode('utf-8') + b'\n')
+        return s.makefile('rb').readline().decode('utf-8')
+
+
+def test_bus_tertahan_tidak_memblok_event_loop():
+    port = port_bebas()
+    server = IngestServer('127.0.0.1', port, port, peta_sensor={})
+    server.maks_tertunda = 4
+    lepas = threading.Event()
+    diterima = []
+
+    def callback(data):
+        # Seperti put() BUS_POLICY 'block' pada antrean bus yang penuh
+        lepas.wait(5.0)
+        diterima.append(data)
+
+    server.mulai_monitoring(callback)
+    try:
+        with socket.create_connection(('127.0.0.1', port)) as s:
+            s.sendall(b''.join(f'bed-{i},36.5\n'.encode('utf-8') for i in range(50)))
+            # Koneksi lain tetap dilayani selama callback bus menunggu
+            stat = json.loads(perintah(port, 'STATS'))
+            assert stat['koneksi'] >= 1
+            lepas.set()
+    finally:
+        server.stop_monitoring()
+
+    assert len(diterima) == 50
+    assert server.stat.diterima == 50
@@ -0,0 +1,75 @@
+# tests/test_logger.py
+"""Logger batch: commit yang gagal tidak menghilangkan batch atau memutar timer."""
+
+import contextlib
+import csv
+import io
+import time
+
+from src.logger import Logger
+
+DETIK = 1_000_000_000
+AWAL = 1_735_689_600
+
+
+class FileGagal:
+    """Bungkus file log: write gagal selama `gagal` bernilai True."""
+
+    def __init__(self, asli):
+        self.asli = asli
+        self.gagal = True
+        self.percobaan = 0
+
+    def write(self, data):
+        self.percobaan += 1
+        if self.gagal:
+            raise OSError(28, 'No space left on device')
+        return self.asli.write(data)
+
+    def __getattr__(self, nama):
+        return getattr(self.asli, nama)
+
+
+def test_commit_gagal_ditahan_lalu_dicoba_lagi(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = Logger(path, mode='batch', batchSize=256, maxLatency=0.05,
+                        durability='flush', indeksBucket=0)
+        logger.setup()
+        file = logger.fileHandle = FileGagal(logger.fileHandle)
+
+        logger.writeData('Kamar-101', 36.5, 'NORMAL', AWAL * DETIK)
+        time.sleep(0.3)
+        # Timer mencoba lagi sekali per maxLatency, tidak berputar
+        assert 1 <= file.percobaan <= 10
+        assert logger.commitGagal == file.percobaan
+
+        # Kunci tidak tertahan: penulis lain tetap bisa masuk
+        mulai = time.monotonic()
+        logger.writeData('Kamar-102', 36.6, 'NORMAL', AWAL * DETIK + 1)
+        assert time.monotonic() - mulai < 0.05
+
+        file.gagal = False
+        logger.close()
+
+    with open(path, newline='') as f:
+        baris = [row['id'] for row in csv.DictReader(f)]
+    assert baris == ['Kamar-101', 'Kamar-102']
+    assert logger.rowsWritten == 2 and logger.rowsDropped == 0
+
+
+def test_baris_tertahan_dibuang_bila_melewati_batas(tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = Logger(str(tmp_path / 'log.csv'), mode='sinkron', durability='none',
+                        indeksBucket=0)
+        logger.maksTertahan = 3
+        logger.setup()
+        logger.fileHandle = FileGagal(logger.fileHandle)
+        for i in range(5):
+            logger.writeData('Kamar-101', 36.5, 'NORMAL', (AWAL + i) * DETIK)
+        logger.fileHandle.gagal = False
+        logger.writeData('Kamar-101', 36.5, 'NORMAL', (AWAL + 5) * DETIK)
+        logger.close()
+
+    assert logger.rowsDropped == 3
+    assert logger.rowsWritten == 3
@@ -0,0 +1,77 @@
+# tests/test_main_smoke.py
+"""
+Smoke run main.py di proses terpisah (config di-override sebelum import,
+sama seperti benchmark/bench_startup.py), headless dengan jam virtual.
+"""
+
+import csv
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SKRIP_MAIN = """
+import config
+config.HEADLESS = True
+config.CLOCK_MODE = 'virtual'
+config.CLOCK_MULAI = '2025-01-01 00:00:00'
+config.DATA_SOURCE = 'random'
+config.JUMLAH_MAKSIMAL_RANDOM = {jumlah}
+config.JUMLAH_SENSOR = {sensor}
+config.SENSOR_MODE = {mode!r}
+config.OUTPUT_FILE = {csv!r}
+config.LOG_BINER_FILE = {biner!r}
+{ekstra}
+import main
+main.main()
+"""
+
+
+def jalankan_main(tmp_path, mode, jumlah=5, sensor=2, ekstra=''):
+    path_csv = str(tmp_path / 'log.csv')
+    skrip = SKRIP_MAIN.format(jumlah=jumlah, sensor=sensor, mode=mode, csv=path_csv,
+                              biner=str(tmp_path / 'log.bin'), ekstra=ekstra)
+    hasil = subprocess.run([sys.executable, '-c', skrip], cwd=ROOT, check=True, timeout=60,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    with open(path_csv, newline='') as f:
+        return list(csv.DictReader(f)), hasil.stderr
+
+
+def per_sensor(baris):
+    hasil = {}
+    for row in baris:
+        hasil.setdefault(row['id'], []).append(datetime.fromisoformat(row['waktu']))
+    return hasil
+
+
+def test_mode_scheduler_berjalan_dan_berhenti(tmp_path):
+    baris, _ = jalankan_main(tmp_path, 'scheduler')
+
+    assert len(baris) == 10
+    waktu = per_sensor(baris)
+    assert len(waktu) == 2
+    for daftar in waktu.values():
+        # Jam virtual: tepat JEDA (2 detik) antar-pembacaan
+        assert [(b - a).total_seconds() for a, b in zip(daftar, daftar[1:])] == [2.0] * 4
+
+
+def test_jam_virtual_thread_per_sensor_deterministik(tmp_path):
+    # Thread sensor memajukan jam bersama; timestamp tetap milik tenggat sensor sendiri
+    baris, _ = jalankan_main(tmp_path, 'thread', jumlah=5, sensor=3)
+
+    assert len(baris) == 15
+    harapan = [datetime(2025, 1, 1, 0, 0, detik) for detik in (0, 2, 4, 6, 8)]
+    waktu = per_sensor(baris)
+    assert len(waktu) == 3
+    for daftar in waktu.values():
+        assert daftar == harapan
+
+
+def test_mode_proses_melepas_shared_memory(tmp_path):
+    baris, stderr = jalankan_main(tmp_path, 'thread', jumlah=20, sensor=4,
+                                  ekstra="config.INGEST_MODE = 'proses'\nconfig.INGEST_PROSES = 2")
+
+    assert len(baris) == 80
+    assert 'leaked shared_memory' not in stderr
@@ -0,0 +1,47 @@
+# tests/test_metrics.py
+"""Metrics pipeline: cap waktu tidak menambah ukuran Reading biasa."""
+
+import contextlib
+import io
+import sys
+
+from src.bus import DataBus
+from src.cpu import CPU
+from src.logger import Logger
+from src.metrics import Metrics
+from src.reading import Reading, ReadingPipeline, indeks_sensor
+
+DETIK = 1_000_000_000
+AWAL = 1_735_689_600
+
+
+def test_reading_tanpa_slot_metrics():
+    reading = Reading(AWAL * DETIK, 'Kamar-101', 36.5, 1, indeks_sensor('Kamar-101'))
+    pipeline = ReadingPipeline.dari(reading)
+    assert not hasattr(reading, 't_emit')
+    assert sys.getsizeof(reading) < sys.getsizeof(pipeline)
+    assert ReadingPipeline.dari(pipeline) is pipeline
+
+
+def test_metrics_mencatat_setiap_pembacaan(tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = Logger(str(tmp_path / 'log.csv'), mode='batch', batchSize=512,
+                        maxLatency=60.0, durability='none')
+        logger.setup()
+        cpu = CPU()
+        bus = DataBus(cpu_target=cpu)
+        cpu.attach_bus(bus)
+        cpu.attach_logger(logger)
+        metrics = Metrics(interval=0, path_file=None, port=0)
+        bus.attach_metrics(metrics)
+        cpu.attach_metrics(metrics)
+
+        idx = indeks_sensor('Kamar-101')
+        for i in range(100):
+            bus.handler_sensor_data(Reading((AWAL + i) * DETIK, 'Kamar-101', 36.5, i, idx))
+        cpu._proses_batch(bus.get_many(512, timeout=0))
+        logger.close()
+
+    assert metrics.tahap['bus'].jumlah == 100
+    assert metrics.tahap['antre'].jumlah == 100
+    assert metrics.tahap['total'].jumlah == 100
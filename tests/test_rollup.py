@@ -0,0 +1,86 @@
+# tests/test_rollup.py
+"""Rollup: pembacaan terlambat dan pemilihan tingkat menurut retensi."""
+
+import contextlib
+import io
+import threading
+import time
+
+from src.logger import Logger
+from src.query import agregat, tier_untuk_interval
+from src.rollup import RollupStore, RollupTier, baca
+
+DETIK = 1_000_000_000
+AWAL = 1_577_836_800  # 2020-01-01 00:00:00 UTC
+TINGKAT = [('1m', 60, 2 * 24 * 3600), ('1h', 3600, 0)]
+
+
+def test_pembacaan_terlambat_masuk_bucket_waktunya(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    with contextlib.redirect_stdout(io.StringIO()):
+        rollup = RollupStore(path, [('1m', 60, 0)])
+        rollup.update_rows([('A', 36.0, 'NORMAL', AWAL * DETIK),
+                            ('A', 37.0, 'NORMAL', (AWAL + 70) * DETIK),
+                            ('A', 39.0, 'ALERT', (AWAL + 10) * DETIK)])
+        rollup.tutup()
+
+    assert rollup.tier[0].jumlah_telat == 1
+    hasil = {awal - AWAL: stat for (_, awal), stat in baca(path, '1m').items()}
+    assert sorted(hasil) == [0, 60]
+    assert (hasil[0].jumlah, hasil[0].maksimum, hasil[0].alert) == (2, 39.0, 1)
+    assert (hasil[60].jumlah, hasil[60].maksimum) == (1, 37.0)
+
+
+def test_kompaksi_berjalan_di_latar_tanpa_kehilangan_baris_baru(tmp_path, monkeypatch):
+    path = str(tmp_path / 'log.csv')
+    lanjut = threading.Event()
+    mulai = threading.Event()
+    saring_asli = RollupTier._saring
+
+    def saring_lambat(self, *args):
+        hasil = saring_asli(self, *args)
+        mulai.set()
+        lanjut.wait(5)
+        return hasil
+
+    monkeypatch.setattr(RollupTier, '_saring', saring_lambat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        rollup = RollupStore(path, [('1m', 60, 600)])
+        # Bucket menit ke-12 melewati retensi * 1.1 dan memicu kompaksi
+        rollup.update_rows([('A', 36.0, 'NORMAL', (AWAL + i * 60) * DETIK) for i in range(14)])
+        assert mulai.wait(5)
+        # Penyaringan tertahan; jalur tulis tetap jalan dan hanya menambah baris
+        t0 = time.monotonic()
+        rollup.update_rows([('A', 37.0, 'NORMAL', (AWAL + i * 60) * DETIK) for i in range(14, 20)])
+        assert time.monotonic() - t0 < 1
+        lanjut.set()
+        rollup.tutup()
+
+    menit = sorted((awal - AWAL) // 60 for (_, awal) in baca(path, '1m'))
+    # Baris < batas (menit ke-12 - 10 menit) dibuang; baris yang ditambahkan selama kompaksi tetap ada
+    assert menit == list(range(2, 20))
+
+
+def test_tier_mengikuti_retensi():
+    sekarang = time.time()
+    assert tier_untuk_interval(60, sekarang - 3600, TINGKAT) == '1m'
+    # 1m sudah lewat retensi; 1h tidak membagi habis 60 detik -> log mentah
+    assert tier_untuk_interval(60, sekarang - 30 * 24 * 3600, TINGKAT) is None
+    assert tier_untuk_interval(3600, sekarang - 30 * 24 * 3600, TINGKAT) == '1h'
+    assert tier_untuk_interval(3600, None, TINGKAT) == '1h'
+    assert tier_untuk_interval(60, None, TINGKAT) is None
+
+
+def test_agregat_rollup_kembali_ke_log_mentah(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger = Logger(path, mode='sinkron', durability='none')
+        logger.setup()
+        for i in range(10):
+            logger.writeData('Kamar-101', 36.0 + i / 10, 'NORMAL', (AWAL + i * 30) * DETIK)
+        logger.close()
+
+    # Data 2020 di luar retensi tingkat 1m bawaan: hasil harus dari log mentah
+    mentah = agregat(path, dari=AWAL, interval=60)
+    assert sum(stat.jumlah for stat in mentah.values()) == 10
+    assert agregat(path, dari=AWAL, interval=60, pakai_rollup=True).keys() == mentah.keys()